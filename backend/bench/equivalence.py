@@ -0,0 +1,462 @@
+"""
+Differential equivalence harness: runs the reference pipeline (python-pptx and thefuzz
+through `MultiContentChecker`) and alternative engines side by side over generated and
+real decks with randomized inputs, diffs their `list[FileResults]` exactly, and reports
+the speedup of each engine over the reference alongside any mismatches.
+
+An engine is a function taking a Case and returning the results of its decks. Besides the
+built-in engines, any engine can be compared with `--engine module:function`.
+
+The memoized parsers of the service inputs (the order of service, the sermon discussion
+questions and the required items) are cleared before every engine run, so that no engine
+benefits from the parses cached by another. The template pool of the "template" engine
+is kept across cases, like the pool of a server process.
+
+Usage:
+    python -m backend.bench.equivalence --cases 200 --seed 1
+    python -m backend.bench.equivalence --decks input/ --engine my.module:check
+"""
+
+import argparse
+import importlib
+import io
+import json
+import pickle
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from backend.cli import ServiceConfig, find_presentations, load_service_config
+from backend.processing.result import FileResults, Result
+from backend.processing.sample import SAMPLE_QUESTION_LINES, build_sample_presentation
+from backend.processing.template import TemplatePool
+
+SONGS = (
+    "Behold Our God",
+    "Only a Holy God",
+    "In Christ Alone",
+    "Before the Throne of God Above",
+    "Come, Behold the Wondrous Mystery",
+)
+PASSAGES = ("Daniel 5", "Daniel 6:1-28", "Psalm 23", "John 3:16-21", "Romans 8")
+QUESTIONS = (
+    *SAMPLE_QUESTION_LINES,
+    "What does this passage teach us about God’s sovereignty?",
+    "How can we pray for one another this week?",
+    "Where do you see God's grace in the passage?",
+)
+DATES = ("22 May 2022", "29 May 2022", "5 Jun 2022")
+# Mismatching results listed per engine in the report
+MAX_REPORTED_MISMATCHES = 20
+# Shared by the cases of the "template" engine, like the pool of a server process
+TEMPLATE_POOL = TemplatePool()
+
+
+class Case(NamedTuple):
+    name: str
+    decks: dict[str, bytes]
+    config: ServiceConfig
+
+
+class Mismatch(NamedTuple):
+    case: str
+    filename: str
+    # Position of the first differing result, or -1 if the files differ
+    index: int
+    expected: Optional[Result]
+    actual: Optional[Result]
+
+
+Engine = Callable[[Case], list[FileResults]]
+
+
+def mutate(text: str, rng: random.Random) -> str:
+    """
+    Returns a line with one of the variations found in real decks: a typo, a quote or dash
+    variant, or extra whitespace.
+    """
+    variation = rng.randrange(6)
+    if variation == 0 and len(text) > 3:
+        i = rng.randrange(len(text))
+        return text[:i] + text[i + 1 :]
+    if variation == 1:
+        return text.replace("’", rng.choice(["‘", "'"]))
+    if variation == 2:
+        return text.replace(" – ", rng.choice([" - ", " — ", " "]))
+    if variation == 3:
+        return text.replace(" ", "  ", 1)
+    if variation == 4:
+        return text.upper()
+    return text + rng.choice([".", " ", "!"])
+
+
+def make_config(
+    songs: tuple[str, str], passage: str, questions: list[str], date: str
+) -> ServiceConfig:
+    order_of_service = [
+        "Opening Words\t1\t",
+        f"Opening Song\t4\t{songs[0]}",
+        "Family Confession\t2\t#11 Confession of Sin (Slide 17 & 18)",
+        "Family Prayer\t4\tRefer to Prayer Points Tab in this document",
+        "Family Business\t5\tRefer to Family Business Tab",
+        f"Bible Reading \t4\t{passage}",
+        "Sermon\t30\tPreacher: Denesh",
+        f"Closing Song\t4\t{songs[1]}",
+        "Closing Words\t1\t",
+        "Discuss in groups\t5\t",
+        "Dismissal\t\t",
+    ]
+    return {
+        "selected_date": date,
+        "req_order_of_service": "\n".join(order_of_service),
+        "sermon_discussion_qns": "\n".join(
+            f"{i}. {question}" for i, question in enumerate(questions, 1)
+        ),
+    }
+
+
+def make_deck(
+    songs: tuple[str, str],
+    passage: str,
+    questions: list[str],
+    date: str,
+    rng: random.Random,
+) -> bytes:
+    """
+    Returns a deck for a service, with random deviations from it.
+    """
+    if rng.random() < 0.05:
+        # Not a service deck
+        return build_sample_presentation(
+            order_of_service=(), question_lines=(), extra_slides=[["Notices"]]
+        )
+    order_of_service = [
+        f"Opening Song – {songs[0]}",
+        "Family Confession",
+        "Family Prayer",
+        "Family Business",
+        f"Hearing God’s Word Read – {passage}",
+        "Hearing God’s Word Proclaimed",
+        f"Closing Song – {songs[1]}",
+        "Sermon Discussion",
+    ]
+    for _ in range(rng.choice([0, 0, 1, 2, 3])):
+        i = rng.randrange(len(order_of_service))
+        order_of_service[i] = mutate(order_of_service[i], rng)
+    if rng.random() < 0.15:
+        i = rng.randrange(len(order_of_service) - 1)
+        order_of_service[i], order_of_service[i + 1] = (
+            order_of_service[i + 1],
+            order_of_service[i],
+        )
+    if rng.random() < 0.1:
+        del order_of_service[rng.randrange(len(order_of_service))]
+
+    question_lines = list(questions)
+    if question_lines and rng.random() < 0.3:
+        i = rng.randrange(len(question_lines))
+        question_lines[i] = mutate(question_lines[i], rng)
+    if question_lines and rng.random() < 0.1:
+        del question_lines[rng.randrange(len(question_lines))]
+    if rng.random() < 0.1:
+        question_lines.append(rng.choice(QUESTIONS))
+
+    deck_date = date if rng.random() < 0.8 else rng.choice(DATES)
+    deck_date = rng.choice([deck_date, deck_date.replace(" ", "-")])
+    return build_sample_presentation(
+        selected_date=deck_date,
+        order_of_service=order_of_service,
+        question_lines=question_lines,
+        lyric_slides=rng.randint(0, 3),
+    )
+
+
+def make_service(rng: random.Random) -> tuple[tuple[str, str], str, list[str], str]:
+    songs = tuple(rng.sample(SONGS, 2))
+    questions = rng.sample(QUESTIONS, rng.randint(1, 3))
+    return songs, rng.choice(PASSAGES), questions, rng.choice(DATES)  # type: ignore
+
+
+def make_cases(count: int, seed: int) -> list[Case]:
+    """
+    Returns cases of one to three generated decks of the same service, with inputs that
+    mostly but not always match the decks.
+    """
+    rng = random.Random(seed)
+    cases = []
+    for i in range(count):
+        songs, passage, questions, date = make_service(rng)
+        decks = {
+            f"case-{i}-deck-{j}.pptx": make_deck(songs, passage, questions, date, rng)
+            for j in range(rng.choice([1, 1, 2, 3]))
+        }
+        if rng.random() < 0.3:
+            # Inputs of another service
+            songs, passage, questions, date = make_service(rng)
+        cases.append(
+            Case(f"generated-{i}", decks, make_config(songs, passage, questions, date))
+        )
+    return cases
+
+
+def make_real_cases(
+    paths: list[Path], config: Optional[ServiceConfig], seed: int
+) -> list[Case]:
+    """
+    Returns a case per real deck, checked with the given inputs or random ones.
+    """
+    rng = random.Random(seed)
+    return [
+        Case(
+            f"real-{path.name}",
+            {path.name: path.read_bytes()},
+            config or make_config(*make_service(rng)),
+        )
+        for path in paths
+    ]
+
+
+def check_presentations(case: Case) -> list[FileResults]:
+    """
+    Reference engine: parses every deck with python-pptx and checks them together.
+    """
+    from pptx import Presentation as PresentationConstructor
+
+    from backend.processing.checker.content import MultiContentChecker
+
+    presentations = {
+        filename: PresentationConstructor(io.BytesIO(content))
+        for filename, content in case.decks.items()
+    }
+    return MultiContentChecker(presentations=presentations, **case.config).run()
+
+
+def check_pickled_text_models(case: Case) -> list[FileResults]:
+    """
+    Checks the decks from pickled text models, as passed between worker processes.
+    """
+    from pptx import Presentation as PresentationConstructor
+
+    from backend.processing.checker.content import MultiContentChecker
+    from backend.processing.text_model import extract_text_model
+
+    text_models = {
+        filename: pickle.loads(
+            pickle.dumps(
+                extract_text_model(PresentationConstructor(io.BytesIO(content)))
+            )
+        )
+        for filename, content in case.decks.items()
+    }
+    return MultiContentChecker(
+        presentations={}, text_models=text_models, **case.config
+    ).run()
+
+
+def check_stored_text_models(case: Case) -> list[FileResults]:
+    """
+    Checks the decks from text models that went through a text model store.
+    """
+    from pptx import Presentation as PresentationConstructor
+
+    from backend.processing.checker.content import MultiContentChecker
+    from backend.processing.store import TextModelStore
+    from backend.processing.text_model import extract_text_model
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = TextModelStore(Path(directory))
+        hashes = {
+            filename: store.put(
+                content,
+                filename,
+                extract_text_model(PresentationConstructor(io.BytesIO(content))),
+            )
+            for filename, content in case.decks.items()
+        }
+        text_models = {
+            filename: store.get(content_hash).text_model  # type: ignore
+            for filename, content_hash in hashes.items()
+        }
+    return MultiContentChecker(
+        presentations={}, text_models=text_models, **case.config
+    ).run()
+
+
+def check_template_text_models(case: Case) -> list[FileResults]:
+    """
+    Checks the decks from text models extracted through a template pool, which is shared
+    by all cases like it is by all uploads of a process.
+    """
+    from backend.processing.checker.content import MultiContentChecker
+    from backend.processing.template import extract_package_text_model
+
+    text_models = {
+        filename: extract_package_text_model(content, TEMPLATE_POOL)
+        for filename, content in case.decks.items()
+    }
+    return MultiContentChecker(
+        presentations={}, text_models=text_models, **case.config
+    ).run()
+
+
+ENGINES: dict[str, Engine] = {
+    "reference": check_presentations,
+    "pickled": check_pickled_text_models,
+    "store": check_stored_text_models,
+    "template": check_template_text_models,
+}
+
+
+def load_engine(spec: str) -> Engine:
+    """
+    Returns a built-in engine by name, or an engine given as "module:function".
+    """
+    if spec in ENGINES:
+        return ENGINES[spec]
+    module_name, _, function_name = spec.partition(":")
+    if not function_name:
+        raise ValueError(f"Unknown engine {spec!r}, expected one of {list(ENGINES)}")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def clear_caches() -> None:
+    """
+    Clears the memoized parsers of the service inputs of the content checks.
+    """
+    from backend.processing.checker import content
+
+    content.parse_req_order_of_service.cache_clear()
+    content.parse_sermon_discussion_qns.cache_clear()
+    content.get_required_items.cache_clear()
+
+
+def diff_file_results(
+    case: str, expected: list[FileResults], actual: list[FileResults]
+) -> list[Mismatch]:
+    """
+    Returns the first difference of every file between two outputs. Files must be in the
+    same order, and their results must be equal in order and content.
+    """
+    mismatches = []
+    for i in range(max(len(expected), len(actual))):
+        if i >= len(expected) or i >= len(actual):
+            extra = (expected if i < len(expected) else actual)[i]
+            mismatches.append(Mismatch(case, extra["filename"], -1, None, None))
+            continue
+        filename = expected[i]["filename"]
+        if actual[i]["filename"] != filename:
+            mismatches.append(Mismatch(case, filename, -1, None, None))
+            continue
+        expected_results, actual_results = expected[i]["results"], actual[i]["results"]
+        for j in range(max(len(expected_results), len(actual_results))):
+            expected_result = expected_results[j] if j < len(expected_results) else None
+            actual_result = actual_results[j] if j < len(actual_results) else None
+            if expected_result != actual_result:
+                mismatches.append(
+                    Mismatch(case, filename, j, expected_result, actual_result)
+                )
+                break
+    return mismatches
+
+
+def run_engine(engine: Engine, case: Case) -> tuple[list[FileResults], float]:
+    clear_caches()
+    start = time.perf_counter()
+    results = engine(case)
+    return results, time.perf_counter() - start
+
+
+def compare(cases: list[Case], engines: dict[str, Engine]) -> dict:
+    """
+    Runs the reference engine and every other engine on each case.
+
+    Returns:
+        dict: Time, speedup and mismatches of each engine
+    """
+    seconds = dict.fromkeys(["reference", *engines], 0.0)
+    mismatches: dict[str, list[Mismatch]] = {name: [] for name in engines}
+    for case in cases:
+        expected, elapsed = run_engine(ENGINES["reference"], case)
+        seconds["reference"] += elapsed
+        for name, engine in engines.items():
+            actual, elapsed = run_engine(engine, case)
+            seconds[name] += elapsed
+            mismatches[name].extend(diff_file_results(case.name, expected, actual))
+    return {
+        "cases": len(cases),
+        "decks": sum(len(case.decks) for case in cases),
+        "reference_seconds": round(seconds["reference"], 4),
+        "engines": {
+            name: {
+                "seconds": round(seconds[name], 4),
+                "speedup": round(seconds["reference"] / seconds[name], 3)
+                if seconds[name]
+                else None,
+                "mismatched_files": len(mismatches[name]),
+                "mismatches": [mismatch._asdict() for mismatch in mismatches[name]][
+                    :MAX_REPORTED_MISMATCHES
+                ],
+            }
+            for name in engines
+        },
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=100, help="Generated cases")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--decks", nargs="*", default=[], help="Real decks: directories, globs or files"
+    )
+    parser.add_argument(
+        "--config", type=Path, help="Service config JSON for the real decks"
+    )
+    parser.add_argument(
+        "--engine",
+        action="append",
+        help="Engine to compare: a built-in name or module:function "
+        f"(default: all built-in engines, {', '.join(ENGINES)})",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the full report")
+    args = parser.parse_args()
+
+    config = load_service_config(args.config) if args.config else None
+    cases = make_cases(args.cases, args.seed) + make_real_cases(
+        find_presentations(args.decks), config, args.seed
+    )
+    engine_specs = args.engine or [name for name in ENGINES if name != "reference"]
+    engines = {spec: load_engine(spec) for spec in engine_specs}
+    report = compare(cases, engines)
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=repr, ensure_ascii=False))
+    else:
+        print(
+            f"{report['cases']} cases, {report['decks']} decks, "
+            f"reference: {report['reference_seconds']}s"
+        )
+        for name, engine_report in report["engines"].items():
+            print(
+                f"{name}: {engine_report['seconds']}s, "
+                f"speedup {engine_report['speedup']}x, "
+                f"{engine_report['mismatched_files']} mismatched files"
+            )
+            for mismatch in engine_report["mismatches"]:
+                print(
+                    f"  {mismatch['case']} {mismatch['filename']} #{mismatch['index']}"
+                )
+                print(f"    expected: {mismatch['expected']}")
+                print(f"    actual:   {mismatch['actual']}")
+    is_equivalent = all(
+        engine_report["mismatched_files"] == 0
+        for engine_report in report["engines"].values()
+    )
+    return 0 if is_equivalent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
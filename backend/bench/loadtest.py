@@ -0,0 +1,313 @@
+"""
+Load-tests the upload endpoint of a locally started server with synthetic decks, and
+reports latency percentiles, throughput and the memory of the server over time.
+
+The requests carry the same form fields as `getFormData` in `frontend/components/Form.tsx`.
+Each request sends a different service plan by default, so that the result cache is
+bypassed; `--distinct-requests` makes requests repeat to measure cached responses.
+
+Usage:
+    python -m backend.bench.loadtest --concurrency 8 --duration 30 --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import NamedTuple, Optional
+
+import httpx
+
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_QUESTION_LINES,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+
+UPLOAD_PATH = "/api/upload/"
+READY_PATH = "/api/metrics/upload-queue"
+DATES = [SAMPLE_DATE, "29 May 2022", "5 Jun 2022"]
+
+
+class Sample(NamedTuple):
+    started: float
+    latency: float
+    status: int
+
+
+class Deck(NamedTuple):
+    filename: str
+    content: bytes
+
+
+def make_decks(count: int, seed: int) -> list[Deck]:
+    """
+    Returns synthetic decks of varying length, some with a wrong date or question.
+
+    Args:
+        count (int): Number of decks
+        seed (int): Seed of the variations
+
+    Returns:
+        list[Deck]: Decks to upload
+    """
+    rng = random.Random(seed)
+    decks = []
+    for i in range(count):
+        question_lines = list(SAMPLE_QUESTION_LINES)
+        if rng.random() < 0.3:
+            question_lines[-1] = question_lines[-1].replace("God", "Gd")
+        content = build_sample_presentation(
+            selected_date=rng.choice(DATES),
+            question_lines=question_lines,
+            lyric_slides=rng.randint(0, 20),
+        )
+        decks.append(Deck(f"deck-{i}.pptx", content))
+    return decks
+
+
+def make_form(
+    request_number: int, decks: list[Deck], files_per_request: int, distinct: int
+) -> tuple[dict[str, str], list[tuple[str, tuple[str, bytes]]]]:
+    """
+    Returns the form fields and files of a request, like `getFormData`.
+    """
+    variant = request_number % distinct if distinct else request_number
+    data = {
+        "selected_date": SAMPLE_DATE,
+        "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+        # Numbered like the questions, so that the checks are unaffected by the variant
+        "sermon_discussion_qns": f"{SAMPLE_SERMON_DISCUSSION_QNS}\n{variant + 3}.",
+    }
+    files = [
+        ("files", (deck.filename, deck.content))
+        for deck in (
+            decks[(variant + i) % len(decks)] for i in range(files_per_request)
+        )
+    ]
+    return data, files
+
+
+def get_process_tree(pid: int) -> list[int]:
+    """
+    Returns the process and all its descendants, e.g. the uvicorn worker processes.
+    """
+    pids, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        try:
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except FileNotFoundError:
+            continue
+    return pids
+
+
+def get_rss_bytes(pid: int) -> int:
+    """
+    Returns the resident set size of a process and its descendants, read from /proc.
+    """
+    total = 0
+    for current in get_process_tree(pid):
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+        except FileNotFoundError:
+            continue
+    return total
+
+
+def start_server(port: int, workers: int, keep_rate_limits: bool) -> subprocess.Popen:
+    env = dict(os.environ)
+    if not keep_rate_limits:
+        # The load comes from a single client, which would otherwise be rate limited
+        env.update(
+            UPLOADS_PER_MINUTE="1000000",
+            UPLOAD_BURST="1000000",
+            MAX_QUEUED_UPLOADS="1000000",
+            MAX_QUEUED_UPLOADS_PER_CLIENT="1000000",
+        )
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while True:
+            try:
+                if (await client.get(READY_PATH)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Server at {base_url} did not start in {timeout}s")
+            await asyncio.sleep(0.1)
+
+
+async def sample_rss(
+    pid: Optional[int], interval: float, stop: asyncio.Event
+) -> list[tuple[float, int]]:
+    samples: list[tuple[float, int]] = []
+    if pid is None:
+        return samples
+    start = time.perf_counter()
+    while not stop.is_set():
+        samples.append((time.perf_counter() - start, get_rss_bytes(pid)))
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+    return samples
+
+
+async def run_load(args: argparse.Namespace, decks: list[Deck]) -> list[Sample]:
+    samples: list[Sample] = []
+    request_numbers = iter(range(sys.maxsize))
+    start = time.perf_counter()
+    deadline = start + args.duration
+
+    async def user(client: httpx.AsyncClient) -> None:
+        while time.perf_counter() < deadline:
+            request_number = next(request_numbers)
+            if args.requests and request_number >= args.requests:
+                return
+            data, files = make_form(
+                request_number, decks, args.files, args.distinct_requests
+            )
+            request_start = time.perf_counter()
+            try:
+                response = await client.post(UPLOAD_PATH, data=data, files=files)
+                status = response.status_code
+            except httpx.TransportError:
+                status = 0
+            samples.append(
+                Sample(
+                    request_start - start, time.perf_counter() - request_start, status
+                )
+            )
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=args.timeout
+    ) as client:
+        await asyncio.gather(*(user(client) for _ in range(args.concurrency)))
+    return samples
+
+
+def summarize(
+    samples: list[Sample], rss: list[tuple[float, int]], elapsed: float
+) -> dict:
+    latencies = [sample.latency * 1000 for sample in samples if sample.status == 200]
+    percentiles = (
+        statistics.quantiles(latencies, n=100, method="inclusive")
+        if len(latencies) > 1
+        else latencies * 99
+    )
+    return {
+        "requests": len(samples),
+        "statuses": dict(Counter(sample.status for sample in samples)),
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentiles[49], 1) if percentiles else None,
+            "p95": round(percentiles[94], 1) if percentiles else None,
+            "p99": round(percentiles[98], 1) if percentiles else None,
+            "max": round(max(latencies), 1) if latencies else None,
+        },
+        "rss_mb": {
+            "peak": round(max((size for _, size in rss), default=0) / 2**20, 1),
+            "over_time": [(round(t, 1), round(size / 2**20, 1)) for t, size in rss],
+        },
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    decks = make_decks(args.decks, args.seed)
+    server = None
+    if args.url is None:
+        args.url = f"http://127.0.0.1:{args.port}"
+        server = start_server(args.port, args.workers, args.keep_rate_limits)
+    try:
+        await wait_until_ready(args.url, timeout=60)
+        stop = asyncio.Event()
+        rss_task = asyncio.create_task(
+            sample_rss(server.pid if server else None, args.sample_interval, stop)
+        )
+        start = time.perf_counter()
+        samples = await run_load(args, decks)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        return summarize(samples, await rss_task, elapsed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--files", type=int, default=1, help="Decks per request")
+    parser.add_argument("--decks", type=int, default=8, help="Distinct synthetic decks")
+    parser.add_argument(
+        "--distinct-requests",
+        type=int,
+        default=0,
+        help="Number of distinct requests to cycle through (default: all distinct)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="Load-test a running server instead")
+    parser.add_argument("--timeout", type=float, default=120, help="Request timeout")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds")
+    parser.add_argument("--keep-rate-limits", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the full report")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    latency = report["latency_ms"]
+    print(f"requests: {report['requests']} {report['statuses']}")
+    print(f"throughput: {report['throughput_rps']} requests/s")
+    print(
+        f"latency: p50 {latency['p50']} ms, p95 {latency['p95']} ms, "
+        f"p99 {latency['p99']} ms, max {latency['max']} ms"
+    )
+    print(f"peak RSS: {report['rss_mb']['peak']} MB")
+    for t, size in report["rss_mb"]["over_time"]:
+        print(f"  {t:6.1f} s  {size:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
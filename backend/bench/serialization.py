@@ -0,0 +1,100 @@
+"""
+Measures serialization time and memory of check results for the generic FastAPI path
+against the dedicated encoder in `backend.processing.encoder`.
+
+Usage:
+    python -m backend.bench.serialization --files 3 --findings 2000
+"""
+
+import argparse
+import gc
+import json
+import timeit
+import tracemalloc
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from backend.processing.encoder import encode_file_results
+from backend.processing.result import FileResults, Status
+
+TITLES = [
+    "Check section headers are in the correct order",
+    "Check section headers are in the correct order: Is there a typo?",
+    "Check all dates that appear in the slides are the same as the date of Sunday service.",
+    "Check sermon discussion questions are as provided.",
+]
+
+
+def make_file_results(files: int, findings: int) -> list[FileResults]:
+    """
+    Returns synthetic results shaped like the output of MultiContentChecker.
+
+    Args:
+        files (int): Number of files
+        findings (int): Number of findings per file
+
+    Returns:
+        list[FileResults]: Synthetic results
+    """
+    statuses = [Status.ERROR, Status.WARNING, Status.PASS]
+    return [
+        {
+            "filename": f"{i:02d} service slides.pptx",
+            "results": [
+                {
+                    "title": TITLES[j % len(TITLES)],
+                    "status": statuses[j % len(statuses)],
+                    "comments": f"On Slide {j}, Expected: 'Opening Song – Behold Our God'. "
+                    f"Provided: 'Opening Song – Behold Our Gods'. Similarity score = {j % 100} of 100",
+                }
+                for j in range(findings)
+            ],
+        }
+        for i in range(files)
+    ]
+
+
+def fastapi_path(file_results) -> bytes:
+    return JSONResponse(jsonable_encoder(file_results)).body
+
+
+def measure_peak_memory(func: Callable[[], object]) -> tuple[int, int]:
+    """
+    Returns the retained and peak memory (in bytes) allocated by calling `func`.
+    """
+    gc.collect()
+    tracemalloc.start()
+    value = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return retained, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=3)
+    parser.add_argument("--findings", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    file_results = make_file_results(args.files, args.findings)
+    assert json.loads(fastapi_path(file_results)) == json.loads(
+        encode_file_results(file_results)
+    )
+
+    candidates = {
+        "fastapi (dict)": lambda: fastapi_path(file_results),
+        "encoder": lambda: encode_file_results(file_results),
+    }
+    print(f"{args.files} files x {args.findings} findings, best of {args.repeat}")
+    for name, func in candidates.items():
+        seconds = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        _, peak = measure_peak_memory(func)
+        print(f"  {name:<18} {seconds * 1000:8.2f} ms  peak {peak / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
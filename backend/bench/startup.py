@@ -0,0 +1,121 @@
+"""
+Profiles server start-up: the import-time breakdown of `backend.main`, the cost of the
+deferred checker imports and of the warm-up, and the latency of the first request.
+
+Usage:
+    python -m backend.bench.startup --top 15
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+
+IMPORT_TIME_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+FIRST_REQUEST_SCRIPT = """
+import json, sys, threading, time
+from fastapi.testclient import TestClient
+start = time.perf_counter()
+from backend.main import app
+imported = time.perf_counter()
+with open(sys.argv[1], "rb") as f:
+    content = f.read()
+data = json.loads(sys.argv[2])
+with TestClient(app) as client:
+    for thread in threading.enumerate():
+        if thread.name == "warm-up":
+            thread.join()
+    for i in range(2):
+        request_start = time.perf_counter()
+        client.post("/api/upload/", data=data, files=[("files", (f"{i}.pptx", content))])
+        print(f"request {i + 1}: {(time.perf_counter() - request_start) * 1000:.1f} ms")
+print(f"import backend.main: {(imported - start) * 1000:.1f} ms")
+"""
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile_imports(module: str) -> list[ImportTime]:
+    """
+    Returns the import times of all modules imported by `module`, using `-X importtime`.
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        list[ImportTime]: Import times in the order reported by the interpreter
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            times.append(
+                ImportTime(name, int(self_us), int(cumulative_us), len(indent) // 2)
+            )
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--module", default="backend.main")
+    args = parser.parse_args()
+
+    for module in (args.module, "backend.warmup; backend.warmup.warm_up()"):
+        times = profile_imports(module)
+        total = sum(item.self_us for item in times)
+        print(f"import {module}: {total / 1000:.1f} ms total (sum of self times)")
+        top_level = [item for item in times if item.depth <= 1]
+        for item in sorted(top_level, key=lambda x: x.cumulative_us, reverse=True)[
+            : args.top
+        ]:
+            print(f"  {item.cumulative_us / 1000:8.1f} ms  {item.module}")
+
+    print(
+        f"first requests (fresh interpreter, PREWARM_MODE={os.getenv('PREWARM_MODE')}):"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "sample.pptx"
+        path.write_bytes(build_sample_presentation())
+        data = {
+            "selected_date": SAMPLE_DATE,
+            "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+            "sermon_discussion_qns": SAMPLE_SERMON_DISCUSSION_QNS,
+        }
+        completed = subprocess.run(
+            [sys.executable, "-c", FIRST_REQUEST_SCRIPT, str(path), json.dumps(data)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    for line in completed.stdout.splitlines():
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Generic, Iterable, Optional, TypeVar
+
+from backend.metadata import version
+
+V = TypeVar("V")
+
+
+def compute_etag(fields: Iterable[str], files: Iterable[tuple[str, bytes]]) -> str:
+    """
+    Returns a strong ETag derived from the content of all inputs of an upload request.
+    Identical inputs always yield the same ETag for the same version of the checker.
+
+    Args:
+        fields (Iterable[str]): Values of the form fields, in a fixed order
+        files (Iterable[tuple[str, bytes]]): File names and contents
+
+    Returns:
+        str: Quoted ETag value
+    """
+    digest = hashlib.sha256(version.encode("utf-8"))
+    for field in fields:
+        update_length_prefixed(digest, field.encode("utf-8"))
+    for filename, content in files:
+        update_length_prefixed(digest, filename.encode("utf-8"))
+        update_length_prefixed(digest, content)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def update_length_prefixed(digest: "hashlib._Hash", data: bytes) -> None:
+    # Length prefixes prevent different inputs from concatenating to the same stream
+    digest.update(len(data).to_bytes(8, "little"))
+    digest.update(data)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Returns True if the If-None-Match header matches the ETag, using weak comparison.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [item.strip().removeprefix("W/") for item in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+class ResultCache(Generic[V]):
+    """
+    Thread-safe LRU cache of check results keyed by ETag, e.g. serialized results or
+    their findings indexes.
+    """
+
+    def __init__(self, max_size: int = 64) -> None:
+        self.max_size = max_size
+        self._items: OrderedDict[str, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[V]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: V) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
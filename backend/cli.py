@@ -0,0 +1,400 @@
+"""
+Command-line interface for checking service decks without going through HTTP.
+
+Usage:
+    python -m backend.cli check --config service.json archive/2022 "archive/**/*.pptx"
+    python -m backend.cli archive --store store/ ingest archive/2022
+    python -m backend.cli archive --store store/ check --config service.json
+    python -m backend.cli archive --store store/ rebuild
+
+The service config file is a JSON object with the same fields as the upload form:
+    {
+        "selected_date": "22 May 2022",
+        "req_order_of_service": "Opening Words\\t1\\t\\n...",
+        "sermon_discussion_qns": "1. ...\\n2. ..."
+    }
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TextIO, TypedDict
+
+from backend.processing.encoder import encode_one_file_results
+from backend.processing.result import FileResults, Status
+from backend.processing.store import (
+    TextModelStore,
+    compute_file_hash,
+    get_default_store_directory,
+    rebuild_store,
+)
+from backend.processing.text_model import TextModel
+
+
+class ServiceConfig(TypedDict):
+    selected_date: str
+    req_order_of_service: str
+    sermon_discussion_qns: str
+
+
+def load_service_config(path: Path) -> ServiceConfig:
+    """
+    Reads the service config file.
+
+    Args:
+        path (Path): Path to the JSON config file
+
+    Returns:
+        ServiceConfig: Inputs to the checks, as they would be submitted in the upload form
+    """
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    missing = [key for key in ServiceConfig.__annotations__ if key not in config]
+    if missing:
+        raise ValueError(f"{path}: missing {', '.join(missing)}")
+    return {key: config[key] for key in ServiceConfig.__annotations__}  # type: ignore
+
+
+def find_presentations(patterns: Iterable[str]) -> list[Path]:
+    """
+    Returns the .pptx files matching the given directories, glob patterns or file paths.
+    PowerPoint lock files (starting with ~$) are skipped.
+
+    Args:
+        patterns (Iterable[str]): Directories, glob patterns or file paths
+
+    Returns:
+        list[Path]: Sorted list of unique paths
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = Path(pattern).rglob("*.pptx")
+        else:
+            matches = (Path(item) for item in glob.glob(pattern, recursive=True))
+        paths.update(
+            path
+            for path in matches
+            if path.is_file()
+            and path.suffix.lower() == ".pptx"
+            and not path.name.startswith("~$")
+        )
+    return sorted(paths)
+
+
+def error_file_results(path: Path, title: str, comments: str) -> FileResults:
+    """
+    Returns the results of a file that could not be checked, as a single error result.
+    """
+    return {
+        "filename": str(path),
+        "results": [{"title": title, "status": Status.ERROR, "comments": comments}],
+    }
+
+
+def check_presentation(path: Path, config: ServiceConfig) -> FileResults:
+    """
+    Runs all content checks on a single file. Runs in a worker process.
+
+    Args:
+        path (Path): Path to the .pptx file
+        config (ServiceConfig): Inputs to the checks
+
+    Returns:
+        FileResults: Results of the file, or an error result if it cannot be opened
+    """
+    from pptx import Presentation as PresentationConstructor
+
+    from backend.processing.checker.content import MultiContentChecker
+
+    try:
+        with open(path, "rb") as f:
+            presentation = PresentationConstructor(f)
+    except Exception as error:
+        return error_file_results(
+            path,
+            "Check file is a readable presentation.",
+            f"Could not open {path}: {error!r}",
+        )
+    mcc = MultiContentChecker(
+        presentations={str(path): presentation},
+        req_order_of_service=config["req_order_of_service"],
+        selected_date=config["selected_date"],
+        sermon_discussion_qns=config["sermon_discussion_qns"],
+    )
+    return mcc.run()[0]
+
+
+def failed_check_file_results(path: Path, error: Exception) -> FileResults:
+    """
+    Returns the results of a file whose checks raised, e.g. a malformed deck that
+    python-pptx opens but cannot read.
+    """
+    return error_file_results(
+        path,
+        "Check file is a readable presentation.",
+        f"Could not check {path}: {error!r}",
+    )
+
+
+def check_presentations(
+    paths: list[Path], config: ServiceConfig, workers: int
+) -> Iterator[FileResults]:
+    """
+    Checks the files in parallel worker processes, yielding results as they complete.
+    A file whose checks raise, or whose worker process dies, gets an error result, so
+    that the other files are still checked.
+
+    Args:
+        paths (list[Path]): Paths to the .pptx files
+        config (ServiceConfig): Inputs to the checks
+        workers (int): Number of worker processes. 1 checks in the current process.
+
+    Yields:
+        Iterator[FileResults]: Results of each file, in order of completion
+    """
+    if workers <= 1:
+        for path in paths:
+            try:
+                file_results = check_presentation(path, config)
+            except Exception as error:
+                file_results = failed_check_file_results(path, error)
+            yield file_results
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(check_presentation, path, config): path for path in paths
+        }
+        for future in as_completed(futures):
+            try:
+                file_results = future.result()
+            except Exception as error:
+                file_results = failed_check_file_results(futures[future], error)
+            yield file_results
+
+
+def extract_presentation(path: Path) -> TextModel:
+    """
+    Returns the text model of a single file. Runs in a worker process, and the text model
+    is pickled back to the parent, which takes about 0.04 ms for a 70-slide deck.
+    """
+    from pptx import Presentation as PresentationConstructor
+
+    from backend.processing.text_model import extract_text_model
+
+    return extract_text_model(PresentationConstructor(path))
+
+
+def check_stored_decks(
+    store: TextModelStore, config: ServiceConfig
+) -> Iterator[FileResults]:
+    """
+    Checks the stored text models of all decks in the store, without opening any .pptx file.
+    """
+    from backend.processing.checker.content import MultiContentChecker
+
+    for deck in store:
+        mcc = MultiContentChecker(
+            presentations={},
+            text_models={deck.filename: deck.text_model},
+            req_order_of_service=config["req_order_of_service"],
+            selected_date=config["selected_date"],
+            sermon_discussion_qns=config["sermon_discussion_qns"],
+        )
+        yield from mcc.run()
+
+
+class Summary:
+    """
+    Aggregates the results of all checked files.
+    """
+
+    def __init__(self) -> None:
+        self.files = 0
+        self.statuses: Counter[str] = Counter()
+        self.files_with_errors: list[str] = []
+        self.start = time.perf_counter()
+
+    def add(self, file_results: FileResults) -> None:
+        self.files += 1
+        statuses = [result["status"] for result in file_results["results"]]
+        self.statuses.update(status.name for status in statuses)
+        if Status.ERROR in statuses:
+            self.files_with_errors.append(file_results["filename"])
+
+    def to_dict(self) -> dict:
+        return {
+            "files": self.files,
+            "statuses": dict(self.statuses),
+            "files_with_errors": sorted(self.files_with_errors),
+            "elapsed_seconds": round(time.perf_counter() - self.start, 3),
+        }
+
+
+def write_results(results: Iterable[FileResults], output: TextIO) -> Summary:
+    """
+    Streams results as JSON lines, one file per line, and returns the summary.
+    """
+    summary = Summary()
+    for file_results in results:
+        output.write(encode_one_file_results(file_results))
+        output.write("\n")
+        output.flush()
+        summary.add(file_results)
+    return summary
+
+
+def run_check(args: argparse.Namespace) -> int:
+    config = load_service_config(args.config)
+    paths = find_presentations(args.paths)
+    if not paths:
+        print("No .pptx files found.", file=sys.stderr)
+        return 1
+    results = check_presentations(paths, config, workers=args.workers)
+    return output_results(results, args)
+
+
+def output_results(results: Iterable[FileResults], args: argparse.Namespace) -> int:
+    """
+    Writes the results to the output file and the summary to stderr and the summary file.
+
+    Returns:
+        int: Exit code, 2 if any file has errors
+    """
+    if args.output == "-":
+        summary = write_results(results, sys.stdout)
+    else:
+        with open(args.output, "w", encoding="utf-8") as output:
+            summary = write_results(results, output)
+
+    summary_json = json.dumps(summary.to_dict(), indent=2)
+    if args.summary:
+        Path(args.summary).write_text(summary_json + "\n", encoding="utf-8")
+    print(summary_json, file=sys.stderr)
+    return 2 if summary.files_with_errors else 0
+
+
+def get_store(args: argparse.Namespace, check_schema: bool = True) -> TextModelStore:
+    if args.store is None:
+        raise SystemExit("Provide --store or set TEXT_MODEL_STORE_DIR.")
+    return TextModelStore(args.store, check_schema=check_schema)
+
+
+def run_archive_ingest(args: argparse.Namespace) -> int:
+    store = get_store(args)
+    # Only the paths of new decks are kept. Workers open the decks by path, and each deck
+    # is read again only when it is stored, so at most one deck is held in memory.
+    pending: dict[str, Path] = {}
+    for path in find_presentations(args.paths):
+        content_hash = compute_file_hash(path)
+        if content_hash not in pending and content_hash not in store:
+            pending[content_hash] = path
+
+    ingested = 0
+    with ProcessPoolExecutor(max_workers=max(args.workers, 1)) as executor:
+        futures = {
+            executor.submit(extract_presentation, path): path
+            for path in pending.values()
+        }
+        for future in as_completed(futures):
+            path = futures.pop(future)
+            try:
+                text_model = future.result()
+            except Exception as error:
+                print(f"Skipped {path}: {error!r}", file=sys.stderr)
+                continue
+            store.put(path.read_bytes(), str(path), text_model)
+            ingested += 1
+    print(
+        f"Ingested {ingested} new decks; {len(store)} decks in store.", file=sys.stderr
+    )
+    return 0
+
+
+def run_archive_check(args: argparse.Namespace) -> int:
+    config = load_service_config(args.config)
+    return output_results(check_stored_decks(get_store(args), config), args)
+
+
+def run_archive_rebuild(args: argparse.Namespace) -> int:
+    rebuilt, missing = rebuild_store(get_store(args, check_schema=False).directory)
+    print(f"Rebuilt {rebuilt} decks.", file=sys.stderr)
+    for filename in missing:
+        print(
+            f"Missing deck file for {filename}; dropped from the store.",
+            file=sys.stderr,
+        )
+    return 0
+
+
+def add_output_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "-c", "--config", type=Path, required=True, help="Service config JSON file"
+    )
+    parser.add_argument(
+        "-o", "--output", default="-", help="JSON lines output file (default: stdout)"
+    )
+    parser.add_argument("-s", "--summary", help="Write the summary JSON to this file")
+
+
+def add_workers_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.cli", description="TCC Slides Checker"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    check = subparsers.add_parser("check", help="Check folders or globs of decks.")
+    check.add_argument("paths", nargs="+", help="Directories, globs or .pptx files")
+    add_output_arguments(check)
+    add_workers_argument(check)
+    check.set_defaults(func=run_check)
+
+    archive = subparsers.add_parser(
+        "archive", help="Manage and check the store of extracted text models."
+    )
+    archive.add_argument(
+        "--store",
+        type=Path,
+        default=get_default_store_directory(),
+        help="Store directory (default: TEXT_MODEL_STORE_DIR)",
+    )
+    archive_commands = archive.add_subparsers(dest="archive_command", required=True)
+    ingest = archive_commands.add_parser("ingest", help="Add decks to the store.")
+    ingest.add_argument("paths", nargs="+", help="Directories, globs or .pptx files")
+    add_workers_argument(ingest)
+    ingest.set_defaults(func=run_archive_ingest)
+    archive_check = archive_commands.add_parser(
+        "check", help="Check all stored decks without opening any .pptx file."
+    )
+    add_output_arguments(archive_check)
+    archive_check.set_defaults(func=run_archive_check)
+    rebuild = archive_commands.add_parser(
+        "rebuild", help="Re-extract all stored decks after a schema change."
+    )
+    rebuild.set_defaults(func=run_archive_rebuild)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
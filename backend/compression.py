@@ -0,0 +1,188 @@
+import zlib
+from typing import Iterable, Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - brotli is declared, gzip is the fallback
+    brotli = None
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    def flush(self) -> bytes:
+        ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int = 6) -> None:
+        self._compressobj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        # Sync flush so that each streamed chunk can be decoded by the client as it arrives
+        return self._compressobj.compress(data) + self._compressobj.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def flush(self) -> bytes:
+        return self._compressobj.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int = 5) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encodings() -> tuple[str, ...]:
+    """
+    Returns the content encodings supported by this server, in order of preference.
+    """
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+COMPRESSIBLE_MEDIA_TYPES = (
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def is_compressible(media_type: str) -> bool:
+    """
+    Returns True if responses of this media type benefit from compression. Images, fonts
+    and archives are already compressed.
+    """
+    media_type = media_type.split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_MEDIA_TYPES
+
+
+def select_encoding(
+    accept_encoding: str, supported: Optional[Iterable[str]] = None
+) -> Optional[str]:
+    """
+    Returns the preferred content encoding that is accepted by the client.
+
+    Args:
+        accept_encoding (str): Value of the Accept-Encoding request header
+        supported (Optional[Iterable[str]], optional): Encodings to choose from, in order
+            of preference. Defaults to all encodings available on this server.
+
+    Returns:
+        Optional[str]: "br", "gzip" or None if no supported encoding is accepted
+    """
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(coding.strip().lower())
+    for encoding in supported if supported is not None else available_encodings():
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def get_compressor(encoding: str) -> Compressor:
+    if encoding == "br":
+        return BrotliCompressor()
+    return GzipCompressor()
+
+
+class CompressionMiddleware:
+    """
+    Compresses HTTP responses with brotli (when installed) or gzip, according to the
+    Accept-Encoding header of the request.
+
+    Responses smaller than `minimum_size`, responses that already carry a Content-Encoding
+    (e.g. precompressed assets) and responses of media types that are already compressed
+    are passed through unchanged.
+    Streaming responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(self.app, encoding, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int) -> None:
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[Compressor] = None
+        self.is_decided = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Delay sending the start message until the first body chunk is seen
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.is_decided:
+            self.is_decided = True
+            assert self.start_message is not None
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            is_small = len(body) < self.minimum_size and not more_body
+            is_compressed = "content-encoding" in headers or not is_compressible(
+                headers.get("content-type", "")
+            )
+            if not is_compressed and not is_small:
+                self.compressor = get_compressor(self.encoding)
+                headers["Content-Encoding"] = self.encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers and not headers["etag"].startswith("W/"):
+                    # The compressed representation differs byte-wise from the original
+                    headers["ETag"] = f"W/{headers['etag']}"
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = self.compressor.compress(body) + self.compressor.flush()
+                    headers["Content-Length"] = str(len(body))
+                    self.compressor = None
+                    message = {**message, "body": body}
+            await self.send(self.start_message)
+            if not more_body or self.compressor is None:
+                await self.send(message)
+                return
+
+        if self.compressor is not None:
+            body = self.compressor.compress(body) if body else b""
+            if not more_body:
+                body += self.compressor.flush()
+            message = {**message, "body": body}
+        await self.send(message)
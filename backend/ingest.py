@@ -0,0 +1,82 @@
+"""
+Ingestion of uploaded files: every file of an upload is read concurrently in chunks and
+hashed while it is read, and each file is handed on as soon as it has been read, so that
+reading one file overlaps with parsing the others.
+"""
+
+import asyncio
+import hashlib
+from typing import Callable, NamedTuple, Optional
+
+from fastapi import UploadFile
+
+from backend.limits import CHUNK_SIZE, format_bytes
+
+
+class ReceivedFile(NamedTuple):
+    """
+    An uploaded file, with either its content and the SHA-256 hex digest of it, or the
+    reason why it was rejected while reading.
+    """
+
+    filename: str
+    content: Optional[bytes]
+    content_hash: Optional[str]
+    rejection: Optional[str]
+
+
+async def read_upload(file: UploadFile, max_bytes: int) -> ReceivedFile:
+    """
+    Reads and hashes an uploaded file in chunks, stopping as soon as it exceeds
+    `max_bytes`. The file is closed afterwards.
+
+    Args:
+        file (UploadFile): Uploaded file
+        max_bytes (int): Maximum number of bytes allowed
+
+    Returns:
+        ReceivedFile: Received file, which is rejected if it is larger than `max_bytes`
+    """
+    digest = hashlib.sha256()
+    chunks, size = [], 0
+    try:
+        while chunk := await file.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                reason = f"is larger than the limit of {format_bytes(max_bytes)}"
+                return ReceivedFile(file.filename, None, None, reason)
+            digest.update(chunk)
+            chunks.append(chunk)
+    finally:
+        await file.close()
+    return ReceivedFile(file.filename, b"".join(chunks), digest.hexdigest(), None)
+
+
+async def receive_uploads(
+    files: list[UploadFile],
+    max_bytes: int,
+    on_received: Optional[Callable[[ReceivedFile], None]] = None,
+) -> list[ReceivedFile]:
+    """
+    Reads all uploaded files concurrently.
+
+    Args:
+        files (list[UploadFile]): Uploaded files
+        max_bytes (int): Maximum number of bytes allowed per file
+        on_received (Optional[Callable[[ReceivedFile], None]], optional): Called with
+            each file as soon as it has been read, in the order in which reads finish.
+
+    Returns:
+        list[ReceivedFile]: Received files, in upload order
+    """
+    reads = [asyncio.ensure_future(read_upload(file, max_bytes)) for file in files]
+    try:
+        for read in asyncio.as_completed(reads):
+            received = await read
+            if on_received is not None:
+                on_received(received)
+    finally:
+        # Reads are left unfinished only if the upload was abandoned
+        for read in reads:
+            read.cancel()
+    return [read.result() for read in reads]
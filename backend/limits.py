@@ -0,0 +1,99 @@
+from typing import BinaryIO
+
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class LimitExceeded(Exception):
+    pass
+
+
+def read_with_limit(file: BinaryIO, max_bytes: int) -> bytes:
+    """
+    Reads a file in chunks, stopping as soon as it exceeds `max_bytes`.
+
+    Args:
+        file (BinaryIO): File to read
+        max_bytes (int): Maximum number of bytes allowed
+
+    Raises:
+        LimitExceeded: If the file is larger than `max_bytes`
+
+    Returns:
+        bytes: Contents of the file
+    """
+    chunks, size = [], 0
+    while chunk := file.read(CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise LimitExceeded(
+                f"is larger than the limit of {format_bytes(max_bytes)}"
+            )
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def format_bytes(size: int) -> str:
+    return f"{size / (1024 * 1024):.0f} MB"
+
+
+class RequestSizeLimitMiddleware:
+    """
+    Rejects requests to the given paths whose body is larger than `max_bytes` with a 413.
+    The declared Content-Length is checked before anything is read, and the body is
+    counted while it streams in, so oversized uploads are cut off early.
+    """
+
+    def __init__(self, app: ASGIApp, paths: tuple[str, ...], max_bytes: int) -> None:
+        self.app = app
+        self.paths = paths
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        response = PlainTextResponse(
+            f"Request body is larger than the limit of {format_bytes(self.max_bytes)}.",
+            status_code=413,
+        )
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and int(content_length) > self.max_bytes:
+            await response(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def receive_with_limit() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise LimitExceeded
+            return message
+
+        async def send_unless_exceeded(message: Message) -> None:
+            nonlocal response_started
+            if exceeded:
+                # Apps may handle the error themselves, e.g. FastAPI replies 400 when
+                # a form cannot be parsed, so their response is replaced by the 413
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_with_limit, send_unless_exceeded)
+        except Exception:
+            if not exceeded or response_started:
+                raise
+        if exceeded and not response_started:
+            await response(scope, receive, send)
@@ -1,23 +1,128 @@
+import asyncio
 import io
 import os
+import threading
 from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
 
-from fastapi import FastAPI, File, Form, UploadFile
+import anyio.to_thread
+from fastapi import (
+    FastAPI,
+    File,
+    Form,
+    Header,
+    Query,
+    Request,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
-from pptx import Presentation
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from starlette.concurrency import run_in_threadpool
 
+from backend.cache import ResultCache, compute_etag, etag_matches
+from backend.compression import CompressionMiddleware
+from backend.ingest import ReceivedFile, receive_uploads
+from backend.limits import RequestSizeLimitMiddleware
 from backend.metadata import metadata
-from backend.processing.checker.content import MultiContentChecker
-from backend.processing.result import FileResults
+from backend.processing.archive import (
+    InvalidArchive,
+    iter_archive_members,
+    open_archive,
+)
+from backend.processing.encoder import encode_file_results, encode_one_file_results
+from backend.processing.findings import FindingsIndex
+from backend.processing.preflight import (
+    InvalidPresentation,
+    check_presentation_limits,
+    inspect_presentation,
+    rejected_file_results,
+)
+from backend.processing.progress import (
+    COMPLETE,
+    PARSED,
+    RECEIVED,
+    ProgressReporter,
+)
+from backend.processing.result import FileResults, Status
+from backend.processing.rules import get_rules
+from backend.processing.store import TextModelStore, get_default_store_directory
+from backend.processing.template import TemplatePool, extract_package_text_model
+from backend.processing.text_model import TextModel
+from backend.profiling import MemoryProfiler
+from backend.progress import ProgressBroker
+from backend.ratelimit import FairScheduler, RateLimitMiddleware
+from backend.static import StaticAssets
+from backend.warmup import warm_up
 
 DEVELOPMENT_MODE = os.getenv("DEVELOPMENT_MODE")
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "64"))
+PREWARM_MODE = os.getenv("PREWARM_MODE")
+MAX_FILE_BYTES = int(os.getenv("MAX_FILE_BYTES", str(100 * 1024 * 1024)))
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", str(200 * 1024 * 1024)))
+MAX_UNCOMPRESSED_BYTES = int(
+    os.getenv("MAX_UNCOMPRESSED_BYTES", str(300 * 1024 * 1024))
+)
+MAX_SLIDES = int(os.getenv("MAX_SLIDES", "250"))
+MAX_ARCHIVE_BYTES = int(os.getenv("MAX_ARCHIVE_BYTES", str(2 * 1024 * 1024 * 1024)))
+MAX_ARCHIVE_FILES = int(os.getenv("MAX_ARCHIVE_FILES", "500"))
+MEMORY_PROFILING_MODE = os.getenv("MEMORY_PROFILING_MODE")
+MAX_FINDINGS_PAGE_SIZE = int(os.getenv("MAX_FINDINGS_PAGE_SIZE", "500"))
+CHECK_TIME_BUDGET = float(os.getenv("CHECK_TIME_BUDGET", "20"))
+# Threads parsing uploaded files, shared by all uploads
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "2"))
+# Parts of the decks of recurring templates kept across uploads; 0 disables the pool
+TEMPLATE_POOL_SIZE = int(os.getenv("TEMPLATE_POOL_SIZE", "4096"))
+TEXT_MODEL_STORE_DIR = get_default_store_directory()
+UPLOADS_PER_MINUTE = float(os.getenv("UPLOADS_PER_MINUTE", "20"))
+UPLOAD_BURST = int(os.getenv("UPLOAD_BURST", "5"))
+MAX_CONCURRENT_UPLOADS = int(os.getenv("MAX_CONCURRENT_UPLOADS", "2"))
+MAX_QUEUED_UPLOADS = int(os.getenv("MAX_QUEUED_UPLOADS", "32"))
+MAX_QUEUED_UPLOADS_PER_CLIENT = int(os.getenv("MAX_QUEUED_UPLOADS_PER_CLIENT", "4"))
+# e.g. X-Forwarded-For, if the app runs behind a proxy that sets it
+RATE_LIMIT_CLIENT_HEADER = os.getenv("RATE_LIMIT_CLIENT_HEADER")
+# Number of proxies in front of the app that append to RATE_LIMIT_CLIENT_HEADER
+RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "1"))
 app = FastAPI(**metadata)
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE)
+app.add_middleware(
+    RequestSizeLimitMiddleware, paths=("/api/upload/",), max_bytes=MAX_REQUEST_BYTES
+)
+app.add_middleware(
+    RequestSizeLimitMiddleware, paths=("/api/archive/",), max_bytes=MAX_ARCHIVE_BYTES
+)
+upload_scheduler = FairScheduler(
+    rate=UPLOADS_PER_MINUTE / 60,
+    burst=UPLOAD_BURST,
+    max_concurrency=MAX_CONCURRENT_UPLOADS,
+    max_queue_depth=MAX_QUEUED_UPLOADS,
+    max_queue_depth_per_client=MAX_QUEUED_UPLOADS_PER_CLIENT,
+)
+app.add_middleware(
+    RateLimitMiddleware,
+    paths=("/api/upload/", "/api/archive/"),
+    scheduler=upload_scheduler,
+    client_header=RATE_LIMIT_CLIENT_HEADER,
+    trusted_proxies=RATE_LIMIT_TRUSTED_PROXIES,
+)
+result_cache: ResultCache[bytes] = ResultCache(max_size=RESULT_CACHE_SIZE)
+# Built from the cached results on the first request for their findings
+findings_indexes: ResultCache[FindingsIndex] = ResultCache(max_size=RESULT_CACHE_SIZE)
+progress_broker = ProgressBroker()
+memory_profiler = MemoryProfiler()
+parse_limiter = anyio.CapacityLimiter(PARSE_WORKERS)
+template_pool = TemplatePool(max_size=TEMPLATE_POOL_SIZE)
 
 EXPORTED_PATH = Path("./frontend/out/")
-app.mount("/_next", StaticFiles(directory=EXPORTED_PATH / "_next"))
-app.mount("/static", StaticFiles(directory=EXPORTED_PATH))
+static_assets = StaticAssets(EXPORTED_PATH, minimum_size=COMPRESSION_MINIMUM_SIZE)
+text_model_store: Optional[TextModelStore] = None
 
 
 def set_appropriate_middleware(mode: bool) -> None:
@@ -38,20 +143,225 @@ def set_appropriate_middleware(mode: bool) -> None:
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["ETag", "Retry-After"],
         )
 
 
 set_appropriate_middleware(mode=(DEVELOPMENT_MODE == "True"))
 
 
+@app.on_event("startup")
+def load_static_assets() -> None:
+    """
+    Loads the exported front-end build into memory, with its precompressed variants.
+    """
+    static_assets.load()
+
+
+@app.on_event("startup")
+def open_text_model_store() -> None:
+    """
+    Opens the text model store if TEXT_MODEL_STORE_DIR is set, so that the text models of
+    all checked decks are persisted for re-audits.
+    """
+    global text_model_store
+    if TEXT_MODEL_STORE_DIR is not None:
+        text_model_store = TextModelStore(TEXT_MODEL_STORE_DIR)
+
+
+@app.on_event("startup")
+def compile_rules() -> None:
+    """
+    Compiles the rules of the checks from RULES_PATH, or the bundled rules, so that
+    invalid rules fail the startup rather than the first upload.
+    """
+    get_rules()
+
+
+@app.on_event("startup")
+def start_memory_profiling() -> None:
+    """
+    If MEMORY_PROFILING_MODE is set to True, traces memory allocations and profiles every
+    upload; see `memory_profile`. Uploads are slower and run one at a time while profiled.
+    """
+    if MEMORY_PROFILING_MODE == "True":
+        memory_profiler.start()
+
+
+@app.on_event("startup")
+def warm_up_on_startup() -> None:
+    """
+    If PREWARM_MODE is set to True, loads the checker modules and checks a bundled sample
+    deck in a background thread, so that the server accepts connections immediately and
+    the first request does not pay for lxml and python-pptx initialization.
+    Otherwise, the checker modules are imported on the first request.
+    """
+    if PREWARM_MODE == "True":
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+
 @app.get("/")
-async def root_page() -> FileResponse:
+async def root_page(request: Request) -> Response:
     """
-    Serves the front-end static HTML file.
+    Serves the front-end static HTML file from memory.
     Returns:
-        FileResponse: The exported static `index.html` file.
+        Response: The exported static `index.html` file.
+    """
+    return await static_assets.response("index.html", request.headers)
+
+
+@app.get("/_next/{path:path}")
+async def next_assets(path: str, request: Request) -> Response:
+    """
+    Serves the exported Next.js assets from memory. Hashed assets are marked immutable.
+    """
+    return await static_assets.response(f"_next/{path}", request.headers)
+
+
+@app.get("/static/{path:path}")
+async def static_files(path: str, request: Request) -> Response:
+    """
+    Serves any other file of the exported front-end from memory.
+    """
+    return await static_assets.response(path, request.headers)
+
+
+@app.get("/api/metrics/upload-queue")
+async def upload_queue_metrics() -> dict:
+    """
+    Returns the state of the upload queue and the recent queue wait times.
+    """
+    return upload_scheduler.metrics()
+
+
+@app.get("/api/debug/memory")
+async def memory_profile() -> Response:
+    """
+    Returns the allocations of the last uploads by stage (parse, extract and check), and
+    those still held after each upload, if MEMORY_PROFILING_MODE is set to True.
+    """
+    if not memory_profiler.enabled:
+        return PlainTextResponse("Memory profiling is not enabled.", 404)
+    return JSONResponse(memory_profiler.report())
+
+
+def get_rejection_reason(content: bytes) -> Optional[str]:
+    """
+    Inspects a file without parsing it, and returns why it is rejected, if it is.
+    """
+    try:
+        info = inspect_presentation(io.BytesIO(content))
+    except InvalidPresentation:
+        return "is not a valid .pptx file"
+    return check_presentation_limits(info, MAX_SLIDES, MAX_UNCOMPRESSED_BYTES)
+
+
+class ParsedFile(NamedTuple):
+    """
+    Text model of a file that passed the preflight, or the reason why it was rejected.
+    """
+
+    text_model: Optional[TextModel]
+    rejection: Optional[str]
+
+
+def parse_content(content: bytes) -> ParsedFile:
+    """
+    Preflights a file, then extracts its text model through the template pool.
+    """
+    reason = get_rejection_reason(content)
+    if reason is not None:
+        return ParsedFile(None, reason)
+    try:
+        text_model = extract_package_text_model(content, template_pool)
+    except Exception:
+        # Parse errors are not raised, since the results of some parses are discarded
+        # unawaited; see `check_upload`
+        return ParsedFile(None, "is not a valid .pptx file")
+    return ParsedFile(text_model, None)
+
+
+def check_contents(
+    contents: dict[str, bytes],
+    selected_date: str,
+    req_order_of_service: str,
+    sermon_discussion_qns: str,
+    progress: Optional[ProgressReporter] = None,
+    text_models: Optional[dict[str, TextModel]] = None,
+) -> dict[str, FileResults]:
+    """
+    Parses and checks files, and stores their text models if the text model store is
+    open. Files whose text models are given are checked from them instead of being
+    parsed. Files are parsed by `parse_content`, as in unprofiled uploads, so that the
+    stages attributed by `memory_profiler` in profiled uploads are those of production.
+
+    Returns:
+        dict[str, FileResults]: Results of each file, by file name, including the
+            rejection of files that did not pass the preflight or could not be parsed
+    """
+    # Deferred so that it stays off the startup path; see `warm_up_on_startup`
+    from backend.processing.checker.content import MultiContentChecker
+
+    text_models = dict(text_models or {})
+    rejected: dict[str, FileResults] = {}
+    with memory_profiler.stage("parse"):
+        for filename, content in contents.items():
+            if filename in text_models:
+                continue
+            text_model, reason = parse_content(content)
+            if reason is not None:
+                rejected[filename] = rejected_file_results(filename, reason)
+                continue
+            text_models[filename] = text_model
+            if progress is not None:
+                progress.report(filename, PARSED, slides=len(text_model))
+
+    mcc = MultiContentChecker(
+        selected_date=selected_date,
+        req_order_of_service=req_order_of_service,
+        sermon_discussion_qns=sermon_discussion_qns,
+        presentations={},
+        time_budget=CHECK_TIME_BUDGET,
+        text_models=text_models,
+        progress=progress,
+    )
+    with memory_profiler.stage("check"):
+        checked = {item["filename"]: item for item in mcc.run()}
+    if text_model_store is not None:
+        for filename, checker in mcc.checkers.items():
+            text_model_store.put(contents[filename], filename, checker.text_model)
+    return {**rejected, **checked}
+
+
+@app.websocket("/api/progress/{job_id}")
+async def progress_channel(websocket: WebSocket, job_id: str) -> None:
     """
-    return FileResponse(EXPORTED_PATH / "index.html")
+    Sends the progress events of an upload as JSON messages, for uploads that send the
+    same `job_id`. The client connects before uploading, and the channel is closed after
+    the "complete" event. Uploads that nobody follows do not report progress at all.
+    """
+    await websocket.accept()
+    async with progress_broker.subscribe(job_id) as events:
+        # Clients do not send messages, so anything received ends the channel
+        disconnected = asyncio.ensure_future(websocket.receive())
+        try:
+            while True:
+                next_event = asyncio.ensure_future(events.get())
+                await asyncio.wait(
+                    {next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected.done():
+                    next_event.cancel()
+                    return
+                event = next_event.result()
+                await websocket.send_json(event)
+                if event["stage"] == COMPLETE:
+                    await websocket.close()
+                    return
+        except WebSocketDisconnect:
+            return
+        finally:
+            disconnected.cancel()
 
 
 @app.post("/api/upload/")
@@ -60,26 +370,322 @@ async def upload_handler(
     req_order_of_service: str = Form(...),
     sermon_discussion_qns: str = Form(...),
     files: list[UploadFile] = File(...),
-) -> list[FileResults]:
+    job_id: Optional[str] = Form(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+) -> Response:
     """
     Primary endpoint which handles the POST request.
 
+    The response carries an ETag derived from the content of all inputs. Requests whose
+    If-None-Match header matches it receive a 304 without the checks being run, and
+    identical resubmissions are served from the result cache.
+
+    Files larger than MAX_FILE_BYTES, or with more than MAX_SLIDES slides or parts that
+    expand beyond MAX_UNCOMPRESSED_BYTES, are rejected before parsing. The checks of all
+    files share a CPU time budget of CHECK_TIME_BUDGET seconds, and run in the threadpool
+    so that the server keeps responding in the meantime.
+
+    Requests are scheduled fairly across clients by RateLimitMiddleware, which replies 429
+    with a Retry-After header to clients over UPLOADS_PER_MINUTE or when the queue is full.
+
     Args:
         files (list[UploadFile], optional): User-uploaded input files. Defaults to File(...).
+        job_id (Optional[str], optional): ID under which progress is reported to
+            `progress_channel`.
+        if_none_match (Optional[str], optional): ETag of previously received results.
 
     Returns:
-        dict: JSON response containing the test results
+        Response: JSON response containing the test results, serialized directly to bytes
     """
-    presentations = dict()
-    for file in files:
-        with file.file as f:
-            bytes_io = io.BytesIO(f.read())
-            presentations[file.filename] = Presentation(pptx=bytes_io)
+    progress = progress_broker.reporter(job_id)
+    try:
+        return await check_upload(
+            selected_date,
+            req_order_of_service,
+            sermon_discussion_qns,
+            files,
+            if_none_match,
+            progress,
+        )
+    finally:
+        if progress is not None:
+            progress.report(None, COMPLETE)
 
-    mcc = MultiContentChecker(
-        selected_date=selected_date,
-        req_order_of_service=req_order_of_service,
-        sermon_discussion_qns=sermon_discussion_qns,
-        presentations=presentations,
+
+async def check_upload(
+    selected_date: str,
+    req_order_of_service: str,
+    sermon_discussion_qns: str,
+    files: list[UploadFile],
+    if_none_match: Optional[str],
+    progress: Optional[ProgressReporter],
+) -> Response:
+    """
+    Reads all files concurrently, and hands each file to PARSE_WORKERS threads to be
+    preflighted and parsed as soon as it has been read, while the others are still being
+    read. Files with identical contents are parsed once, and checked from the same text
+    model. When the response is served from the ETag or the result cache, or reading the
+    files fails, the parses are cancelled: parses that have not started are skipped, and
+    parses that are already running finish in their thread and are discarded.
+
+    Profiled uploads are parsed after all files have been read instead, so that the
+    stages of the upload are attributed by `memory_profiler`.
+    """
+    # Content hash -> parse of the file, shared by files with the same content
+    parses: dict[str, "asyncio.Future[ParsedFile]"] = {}
+    cancelled = threading.Event()
+
+    def parse_unless_cancelled(content: bytes) -> ParsedFile:
+        # A parse waiting for a worker thread may get one after it has been cancelled
+        if cancelled.is_set():
+            raise asyncio.CancelledError()
+        return parse_content(content)
+
+    def cancel_parsing() -> None:
+        cancelled.set()
+        for parse in parses.values():
+            parse.cancel()
+
+    def report_parsed(filename: str, parse: "asyncio.Future[ParsedFile]") -> None:
+        if parse.cancelled():
+            return
+        text_model = parse.result().text_model
+        if progress is not None and text_model is not None:
+            progress.report(filename, PARSED, slides=len(text_model))
+
+    def start_parsing(file: ReceivedFile) -> None:
+        if progress is not None:
+            progress.report(file.filename, RECEIVED)
+        if file.content_hash is None or memory_profiler.enabled:
+            return
+        if file.content_hash not in parses:
+            parses[file.content_hash] = asyncio.ensure_future(
+                anyio.to_thread.run_sync(
+                    parse_unless_cancelled, file.content, limiter=parse_limiter
+                )
+            )
+        parses[file.content_hash].add_done_callback(
+            lambda parse: report_parsed(file.filename, parse)
+        )
+
+    try:
+        received = await receive_uploads(files, MAX_FILE_BYTES, start_parsing)
+    except BaseException:
+        cancel_parsing()
+        raise
+    hashes: dict[str, str] = {}
+    contents: dict[str, bytes] = {}
+    rejected: dict[str, str] = {}
+    for file in received:
+        if file.rejection is not None:
+            rejected[file.filename] = file.rejection
+        else:
+            hashes[file.filename] = file.content_hash
+            contents[file.filename] = file.content
+
+    # The digests identify the contents, so they are hashed in place of the contents
+    etag = compute_etag(
+        fields=(selected_date, req_order_of_service, sermon_discussion_qns, *rejected),
+        files=(
+            (filename, bytes.fromhex(digest)) for filename, digest in hashes.items()
+        ),
+    )
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        cancel_parsing()
+        return Response(status_code=304, headers=headers)
+    cached = result_cache.get(etag)
+    if cached is not None:
+        cancel_parsing()
+        return Response(content=cached, media_type="application/json", headers=headers)
+
+    text_models: dict[str, TextModel] = {}
+    # Profiled uploads are preflighted and parsed by `check_contents` instead
+    if not memory_profiler.enabled:
+        parsed = dict(zip(parses, await asyncio.gather(*parses.values())))
+        for filename, digest in hashes.items():
+            if parsed[digest].rejection is not None:
+                rejected[filename] = parsed[digest].rejection
+            else:
+                text_models[filename] = parsed[digest].text_model
+
+    accepted = {
+        filename: content
+        for filename, content in contents.items()
+        if filename not in rejected
+    }
+    checked = await run_in_threadpool(
+        memory_profiler.profile,
+        ", ".join(accepted),
+        check_contents,
+        accepted,
+        selected_date,
+        req_order_of_service,
+        sermon_discussion_qns,
+        progress,
+        text_models,
+    )
+    file_results: list[FileResults] = [
+        checked[filename]
+        if filename in checked
+        else rejected_file_results(filename, rejected[filename])
+        for filename in dict.fromkeys(file.filename for file in files)
+    ]
+    content = encode_file_results(file_results)
+
+    is_timed_out = any(
+        result["status"] == Status.TIMEOUT
+        for item in file_results
+        for result in item["results"]
+    )
+    if is_timed_out:
+        # Partial results depend on load, so they are neither cached nor revalidated
+        del headers["ETag"]
+    else:
+        result_cache.set(etag, content)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@app.post("/api/archive/")
+async def archive_upload_handler(
+    selected_date: str = Form(...),
+    req_order_of_service: str = Form(...),
+    sermon_discussion_qns: str = Form(...),
+    archive: UploadFile = File(...),
+) -> Response:
+    """
+    Bulk endpoint which checks every .pptx file in a zip archive, e.g. for term-end audits.
+
+    The archive is spooled to disk by the upload, and its members are then decompressed,
+    parsed and checked one at a time and discarded, so memory does not grow with the size
+    of the archive. The results are streamed as newline-delimited JSON, one line per file
+    in archive order, as soon as each file has been checked.
+
+    Archives larger than MAX_ARCHIVE_BYTES are rejected with a 413, and files beyond the
+    first MAX_ARCHIVE_FILES are listed as rejected without being read. Each file is
+    otherwise subject to the same limits and time budget as in `upload_handler`. Decks in
+    an archive usually belong to different services, so they are not checked for
+    consistency with each other, and the results are neither cached nor revalidated.
+
+    Args:
+        archive (UploadFile, optional): User-uploaded zip archive. Defaults to File(...).
+
+    Returns:
+        Response: Newline-delimited JSON stream of the results of each file, or a 400 if
+        the upload is not a zip archive
+    """
+    try:
+        opened = open_archive(archive.file)
+    except InvalidArchive:
+        return PlainTextResponse("The uploaded file is not a zip archive.", 400)
+
+    def check_members() -> Iterator[bytes]:
+        # A sync generator, so that Starlette runs each step in its threadpool
+        with opened:
+            for member in iter_archive_members(
+                opened, MAX_FILE_BYTES, MAX_ARCHIVE_FILES
+            ):
+                filename, content = member.filename, member.content
+                reason, text_model = member.rejection, None
+                if content is not None and reason is None:
+                    # Parse errors become results, as raising would end the stream
+                    text_model, reason = parse_content(content)
+                if reason is not None:
+                    file_results = rejected_file_results(filename, reason)
+                else:
+                    # Profiles of archive members cover the checks, as they are
+                    # already parsed
+                    [file_results] = memory_profiler.profile(
+                        filename,
+                        check_contents,
+                        {filename: content},
+                        selected_date,
+                        req_order_of_service,
+                        sermon_discussion_qns,
+                        None,
+                        {filename: text_model},
+                    ).values()
+                yield f"{encode_one_file_results(file_results)}\n".encode()
+
+    return StreamingResponse(check_members(), media_type="application/x-ndjson")
+
+
+def parse_slide_range(slides: str) -> range:
+    """
+    Returns the slide numbers of a range such as "10-20", or of a single slide number.
+
+    Raises:
+        ValueError: If the range is not formatted as such
+    """
+    first, _, last = slides.partition("-")
+    return range(int(first), int(last or first) + 1)
+
+
+@app.get("/api/results/{results_id}/findings")
+async def findings_handler(
+    results_id: str,
+    filename: list[str] = Query(default=[]),
+    status: list[str] = Query(default=[]),
+    check: list[str] = Query(default=[]),
+    slides: Optional[str] = None,
+    cursor: Optional[int] = None,
+    limit: int = Query(default=50, ge=1, le=MAX_FINDINGS_PAGE_SIZE),
+) -> Response:
+    """
+    Serves a page of the findings of cached results, so that clients can fetch only the
+    findings they show.
+
+    Args:
+        results_id (str): ETag of the upload response, without quotes
+        filename (list[str], optional): Files of the findings.
+        status (list[str], optional): Statuses of the findings, e.g. "error".
+        check (list[str], optional): Titles of the checks.
+        slides (Optional[str], optional): Slide number, or range of slide numbers
+            of the findings, e.g. "10-20".
+        cursor (Optional[int], optional): `next_cursor` of the previous page.
+        limit (int, optional): Maximum number of findings per page.
+
+    Returns:
+        Response: Findings of the page, the number of findings matching the filters, and
+            the cursor of the next page. Results that are no longer in the result cache,
+            or that were not cached because their checks timed out, are not found.
+    """
+    try:
+        statuses = [Status[name.upper()] for name in status] if status else None
+        slide_range = parse_slide_range(slides) if slides else None
+    except (KeyError, ValueError):
+        return PlainTextResponse("Invalid status or slide range.", 400)
+
+    etag = f'"{results_id}"'
+    index = findings_indexes.get(etag)
+    if index is None:
+        content = result_cache.get(etag)
+        if content is None:
+            return PlainTextResponse("These results are no longer available.", 404)
+        index = await run_in_threadpool(FindingsIndex.from_json, content)
+        findings_indexes.set(etag, index)
+
+    page = index.query(
+        filenames=filename or None,
+        statuses=statuses,
+        titles=check or None,
+        slides=slide_range,
+        cursor=cursor,
+        limit=limit,
+    )
+    return JSONResponse(
+        {
+            "findings": [
+                {
+                    "filename": finding.filename,
+                    "title": finding.title,
+                    "comments": finding.comments,
+                    "status": finding.status.value,
+                    "slides": finding.slides,
+                }
+                for finding in page.findings
+            ],
+            "total": page.total,
+            "next_cursor": page.next_cursor,
+        }
     )
-    return mcc.run()
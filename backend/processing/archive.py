@@ -0,0 +1,101 @@
+"""
+Reading of zip archives of decks for bulk uploads. Members are read one at a time, so only
+one deck is held in memory however large the archive is.
+"""
+
+import zipfile
+import zlib
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+from backend.limits import LimitExceeded, read_with_limit
+
+
+class InvalidArchive(Exception):
+    pass
+
+
+class ArchiveMember(NamedTuple):
+    filename: str
+    content: Optional[bytes]
+    # Reason why the member was not read, if it was rejected
+    rejection: Optional[str]
+
+
+def open_archive(file: BinaryIO) -> zipfile.ZipFile:
+    """
+    Opens a zip archive, reading only its central directory.
+
+    Args:
+        file (BinaryIO): Seekable zip file
+
+    Raises:
+        InvalidArchive: If the file is not a zip archive
+
+    Returns:
+        zipfile.ZipFile: Opened archive
+    """
+    try:
+        return zipfile.ZipFile(file)
+    except zipfile.BadZipFile as error:
+        raise InvalidArchive(str(error)) from error
+
+
+def is_presentation_member(member: zipfile.ZipInfo) -> bool:
+    """
+    Returns whether a member is a deck, skipping folders, PowerPoint lock files (~$) and
+    the metadata that macOS adds to archives.
+    """
+    name = member.filename.rsplit("/", 1)[-1]
+    return (
+        not member.is_dir()
+        and name.lower().endswith(".pptx")
+        and not name.startswith(("~$", "._"))
+        and not member.filename.startswith("__MACOSX/")
+    )
+
+
+def iter_archive_members(
+    archive: zipfile.ZipFile, max_file_bytes: int, max_files: int
+) -> Iterator[ArchiveMember]:
+    """
+    Yields the decks of an archive in archive order, reading each one only when it is
+    reached. Decks beyond `max_files` or larger than `max_file_bytes` are rejected without
+    being decompressed further than the limit.
+
+    Args:
+        archive (zipfile.ZipFile): Opened archive
+        max_file_bytes (int): Maximum uncompressed size of a deck
+        max_files (int): Maximum number of decks read from the archive
+
+    Yields:
+        Iterator[ArchiveMember]: Contents of each deck, or the reason it was rejected
+    """
+    members = [
+        member for member in archive.infolist() if is_presentation_member(member)
+    ]
+    for i, member in enumerate(members):
+        if i >= max_files:
+            rejection = f"is beyond the limit of {max_files} decks per archive"
+            yield ArchiveMember(member.filename, None, rejection)
+            continue
+        try:
+            with archive.open(member) as f:
+                content = read_with_limit(f, max_file_bytes)
+        except LimitExceeded as error:
+            yield ArchiveMember(member.filename, None, str(error))
+            continue
+        except (
+            zipfile.BadZipFile,
+            zlib.error,
+            EOFError,
+            OSError,
+            NotImplementedError,
+            RuntimeError,
+        ) as error:
+            # Corrupt (including truncated or invalid compressed data), encrypted or
+            # unsupported members
+            yield ArchiveMember(
+                member.filename, None, f"could not be extracted ({error})"
+            )
+            continue
+        yield ArchiveMember(member.filename, content, None)
@@ -0,0 +1,171 @@
+"""
+Checks that decks uploaded together (e.g. for the different services of the same Sunday)
+share the same date, order of service and sermon discussion questions.
+
+Each deck is reduced to one digest per aspect, computed from the text that the per-file
+checks have already extracted, so the comparison across decks is a hash comparison.
+"""
+
+import hashlib
+from collections import Counter
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+from backend.processing.normalize import NormalizedText
+from backend.processing.result import Result, Status
+
+if TYPE_CHECKING:
+    from backend.processing.checker.content import ContentChecker
+
+# Number of differing lines quoted in a comment
+MAX_QUOTED_LINES = 3
+
+
+class Aspect(NamedTuple):
+    name: str
+    extract: Callable[["ContentChecker"], list[NormalizedText]]
+
+
+class Fingerprint(NamedTuple):
+    digest: bytes
+    # Original line by normalized line, in order
+    lines: dict[str, str]
+
+
+def normalize(text: NormalizedText) -> str:
+    """
+    Normalizes the case of the normalized text, so that only differences in content make
+    decks inconsistent.
+    """
+    return text.normalized.casefold()
+
+
+def extract_dates(checker: "ContentChecker") -> list[NormalizedText]:
+    # Dates are compared as a set, as they may appear on any slide
+    dates = {normalize(text): text for _, text in checker.dates}
+    return [dates[date] for date in sorted(dates)]
+
+
+def extract_order_of_service(checker: "ContentChecker") -> list[NormalizedText]:
+    return [
+        line
+        for slide_lines in checker.slide_order_of_service.values()
+        for line in slide_lines
+    ]
+
+
+def extract_sermon_discussion_qns(checker: "ContentChecker") -> list[NormalizedText]:
+    return [line for _, line in checker.sermon_discussion_lines.lines if line.strip()]
+
+
+ASPECTS = [
+    Aspect("date", extract_dates),
+    Aspect("order of service", extract_order_of_service),
+    Aspect("sermon discussion questions", extract_sermon_discussion_qns),
+]
+
+
+def fingerprint(lines: list[NormalizedText]) -> Fingerprint:
+    """
+    Returns the digest of the normalized lines. Repeated lines are only counted once, as
+    every section header slide repeats the order of service.
+    """
+    normalized_lines: dict[str, str] = {}
+    for line in lines:
+        normalized_lines.setdefault(normalize(line), line)
+    digest = hashlib.blake2b(
+        "\n".join(normalized_lines).encode(), digest_size=16
+    ).digest()
+    return Fingerprint(digest, normalized_lines)
+
+
+def quote_lines(lines: list[str]) -> str:
+    quoted = ", ".join(f"'{line}'" for line in lines[:MAX_QUOTED_LINES])
+    if len(lines) > MAX_QUOTED_LINES:
+        quoted += f" and {len(lines) - MAX_QUOTED_LINES} more"
+    return quoted
+
+
+class ConsistencyChecker:
+    """
+    Compares the decks of one upload with each other. For each aspect, the content shared
+    by most decks is taken as the reference, and every deck that differs from it gets a
+    warning. If no content is shared by more decks than any other, every deck is reported.
+    """
+
+    def __init__(self, checkers: dict[str, "ContentChecker"]) -> None:
+        self.checkers = checkers
+
+    def run(self) -> dict[str, list[Result]]:
+        """
+        Runs the comparison of every aspect across all decks.
+
+        Returns:
+            dict[str, list[Result]]: Results of every deck by file name. Empty if fewer
+                than 2 decks are compared.
+        """
+        results: dict[str, list[Result]] = {
+            file_name: [] for file_name in self.checkers
+        }
+        if len(self.checkers) < 2:
+            return results
+        for aspect in ASPECTS:
+            for file_name, result in self.compare(aspect).items():
+                results[file_name].append(result)
+        return results
+
+    def compare(self, aspect: Aspect) -> dict[str, Result]:
+        """
+        Returns a warning for each deck whose content of the aspect deviates.
+
+        Args:
+            aspect (Aspect): Aspect to compare
+
+        Returns:
+            dict[str, Result]: Results of the deviating decks by file name
+        """
+        fingerprints = {
+            file_name: fingerprint(aspect.extract(checker))
+            for file_name, checker in self.checkers.items()
+        }
+        counts = Counter(fp.digest for fp in fingerprints.values())
+        if len(counts) == 1:
+            return {}
+
+        (majority, majority_count), (_, runner_up_count) = counts.most_common(2)
+        title = f"Check all decks uploaded together have the same {aspect.name}."
+        if majority_count == runner_up_count:
+            return {
+                file_name: {
+                    "title": title,
+                    "status": Status.WARNING,
+                    "comments": f"The decks do not agree on the {aspect.name}, and no version is shared by most of them. Compare with {self.others(file_name)}.",
+                }
+                for file_name in fingerprints
+            }
+
+        reference_files = [
+            file_name for file_name, fp in fingerprints.items() if fp.digest == majority
+        ]
+        reference = fingerprints[reference_files[0]].lines
+        results = {}
+        for file_name, fp in fingerprints.items():
+            if fp.digest == majority:
+                continue
+            differences = []
+            extra = [line for key, line in fp.lines.items() if key not in reference]
+            missing = [line for key, line in reference.items() if key not in fp.lines]
+            if extra:
+                differences.append(f"Only in this deck: {quote_lines(extra)}.")
+            if missing:
+                differences.append(f"Missing: {quote_lines(missing)}.")
+            if not differences:
+                differences.append("The same content appears in a different order.")
+            results[file_name] = {
+                "title": title,
+                "status": Status.WARNING,
+                "comments": f"Deviates in its {aspect.name} from {len(reference_files)} of {len(fingerprints)} decks ({', '.join(reference_files)}). {' '.join(differences)}",
+            }
+        return results
+
+    def others(self, file_name: str) -> str:
+        return ", ".join(other for other in self.checkers if other != file_name)
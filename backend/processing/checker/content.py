@@ -1,30 +1,59 @@
 import os
 import re
-from functools import cached_property
+import time
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, NamedTuple, Optional, Union
 
 if __name__ == "__main__":
     if Path(os.getcwd()).parent.name == "processing":
         os.chdir("../../..")
 
 from backend.processing.checker.base import BaseChecker, BaseMultiChecker
-from backend.processing.result import FileResults, Result, Status
+from backend.processing.checker.consistency import ConsistencyChecker
+from backend.processing.normalize import NormalizedText, normalize_text
+from backend.processing.progress import CHECKED, DONE, EXTRACTED, ProgressReporter
+from backend.processing.result import FileResults, Result, Status, format_slide_numbers
+from backend.processing.rules import CompiledRules, get_rules
+from backend.processing.text_model import (
+    ShapeText,
+    TextModel,
+    extract_text_model,
+    normalize_text_model,
+)
 from pptx import Presentation as PresentationConstructor
 from pptx.presentation import Presentation
 from pptx.slide import Slide
 from thefuzz import fuzz
 
-section_mapping = {
-    "Bible Reading": "Hearing God\u2019s Word Read",
-    "Sermon": "Hearing God\u2019s Word Proclaimed",
-    "Discuss in groups": "Sermon Discussion",
-}
-
 CleanOrderOfService = list[tuple[str, int, str]]
 FilteredCleanOrderOfService = list[tuple[str, str]]
-SlideOrderOfService = dict[int, list[str]]
-SlideSubset = dict[int, Slide]
+ParsedOrderOfService = tuple[tuple[str, str], ...]
+ParsedSermonDiscussionQns = tuple[str, ...]
+SlideOrderOfService = dict[int, list[NormalizedText]]
+# Subset of the text model
+SlideSubset = TextModel
+Check = Callable[[], Union[Result, list[Result]]]
+
+# Number of distinct service plans whose parsed inputs are kept per process
+PARSED_INPUT_CACHE_SIZE = 32
+# A deck is only checked if it looks like a service deck: the welcome and section header
+# slides display the order of service, and the welcome slide displays the date
+MIN_ORDER_OF_SERVICE_SLIDES = 2
+MIN_DATES = 1
+
+
+class DeckProfile(NamedTuple):
+    order_of_service_slides: int
+    dates: int
+
+
+class RequiredItem(NamedTuple):
+    title: str
+    # Item as it should appear on the slides, e.g. "Opening Song \u2013 Behold Our God"
+    required_item: str
+    normalized_title: str
+    normalized_required_item: str
 
 
 def raw_req_order_of_service_no_declaration() -> str:
@@ -63,6 +92,7 @@ def get_clean_req_order_of_service(
 
 def filter_clean_req_order_of_service(
     clean_req_order_of_service: CleanOrderOfService,
+    rules: Optional[CompiledRules] = None,
 ) -> FilteredCleanOrderOfService:
     """
     Returns the filtered clean required order of service with elements at position:
@@ -74,14 +104,17 @@ def filter_clean_req_order_of_service(
 
     Args:
         raw_req_order_of_service_no_declaration (str): Raw order of service
+        rules (Optional[CompiledRules], optional): Rules mapping the items to sections
+            and excluding items. Defaults to the rules of the process.
 
     Returns:
         list[tuple[str, str]]: Filtered clean required order of service
     """
+    rules = rules or get_rules()
     return [
-        (section_mapping.get(item[0], item[0]), item[2])
+        (rules.section_title(item[0]), item[2])
         for item in clean_req_order_of_service
-        if not re.match("(Opening Words|Dismissal|Closing Words)", item[0])
+        if not rules.is_excluded(item[0])
     ]
 
 
@@ -90,27 +123,98 @@ def get_clean_sermon_discussion_qns(sermon_discussion_qns: str) -> list[str]:
     return [text.strip() for text in split_text if text.strip()]
 
 
-def get_slides_by_pattern(all_slides: Iterable[Slide], pattern: str) -> SlideSubset:
+@lru_cache(maxsize=PARSED_INPUT_CACHE_SIZE)
+def parse_req_order_of_service(
+    req_order_of_service: str, rules: Optional[CompiledRules] = None
+) -> ParsedOrderOfService:
+    """
+    Returns the filtered clean required order of service as an immutable structure.
+    Memoized by input text and rules, so that it is shared across files and across
+    requests with the same service plan.
+
+    Args:
+        req_order_of_service (str): Raw required order of service
+        rules (Optional[CompiledRules], optional): Defaults to the rules of the process.
+
+    Returns:
+        ParsedOrderOfService: Filtered clean required order of service
+    """
+    if rules is None:
+        # Cached under the rules themselves, to share the result with explicit callers
+        return parse_req_order_of_service(req_order_of_service, get_rules())
+    return tuple(
+        filter_clean_req_order_of_service(
+            get_clean_req_order_of_service(req_order_of_service), rules
+        )
+    )
+
+
+@lru_cache(maxsize=PARSED_INPUT_CACHE_SIZE)
+def parse_sermon_discussion_qns(
+    sermon_discussion_qns: str,
+) -> ParsedSermonDiscussionQns:
+    """
+    Returns the clean sermon discussion questions as an immutable structure, with their
+    normalized forms. Memoized by input text like `parse_req_order_of_service`.
+
+    Args:
+        sermon_discussion_qns (str): Raw sermon discussion questions
+
+    Returns:
+        ParsedSermonDiscussionQns: Sermon discussion questions without numbering
+    """
+    return tuple(
+        NormalizedText(question)
+        for question in get_clean_sermon_discussion_qns(sermon_discussion_qns)
+    )
+
+
+@lru_cache(maxsize=PARSED_INPUT_CACHE_SIZE)
+def get_required_items(
+    parsed_req_order_of_service: ParsedOrderOfService,
+) -> tuple[RequiredItem, ...]:
+    """
+    Returns the required order of service items as they should appear on the slides,
+    with their normalized forms.
+
+    Args:
+        parsed_req_order_of_service (ParsedOrderOfService): Parsed order of service
+
+    Returns:
+        tuple[RequiredItem, ...]: Required items in order
+    """
+    required_items = []
+    for title, comments in parsed_req_order_of_service:
+        title = title.replace("\u2018", "\u2019")
+        required_item = f"{title} \u2013 {comments}"
+        required_items.append(
+            RequiredItem(
+                title,
+                required_item,
+                normalize_text(title),
+                normalize_text(required_item),
+            )
+        )
+    return tuple(required_items)
+
+
+def get_slides_by_pattern(text_model: TextModel, pattern: str) -> SlideSubset:
     """
     Returns a subset of all slides that contain the provided text argument on the slide.
 
     Args:
-        all_slides (Iterable[Slide]): An iterable containing all slides
+        text_model (TextModel): Texts of all slides
         pattern (str): String to match
 
     Returns:
         SlideSubset: Subset of slides with slide number (1-indexed) as keys
     """
     subset = dict()
-    for i, slide in enumerate(all_slides, 1):
-        shapes = [*slide.shapes, *slide.slide_layout.shapes]  # type: ignore
-        for shape in shapes:
-            if not shape.has_text_frame:
-                continue
-            if pattern in shape.text_frame.text or re.match(
-                pattern, shape.text_frame.text
-            ):
-                subset[i] = slide
+    for i, texts in text_model.items():
+        for text in texts:
+            if pattern in text or re.match(pattern, text):
+                subset[i] = texts
+                break
     return subset
 
 
@@ -119,19 +223,101 @@ def get_raw_text_extracts_from_slides(slides: SlideSubset) -> dict[int, list[str
     Returns the raw text from any shapes (including text boxes) in the provided slides.
 
     Args:
-        slides (list[Slide]): List of slides
+        slides (SlideSubset): Subset of slides
 
     Returns:
         dict[int, list[str]]: Raw string extracts according to slide number
     """
-    result = {}
-    for i, slide in slides.items():
-        for shape in [*slide.shapes, *slide.slide_layout.shapes]:  # type: ignore
-            if i in result:
-                result[i].append(shape.text_frame.text)
-            else:
-                result[i] = [shape.text_frame.text]
-    return result
+    return {i: list(texts) for i, texts in slides.items() if texts}
+
+
+def tokenize(text: str) -> set[str]:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+class LineIndex:
+    """
+    Index over lines of text supporting exact lookups through a hash set of the normalized
+    forms of the lines, and shortlisting of fuzzy match candidates through an inverted token index.
+    """
+
+    # Fraction of the words of the shorter text that must also appear in the longer one.
+    # A partial ratio above 90 implies that nearly all words are shared.
+    MIN_SHARED_TOKENS = 0.5
+
+    def __init__(self, lines: list[tuple[int, NormalizedText]]) -> None:
+        self.lines = lines
+        self.normalized_lines = {line.normalized for _, line in lines}
+        self.line_tokens = [tokenize(line) for _, line in lines]
+        self.postings: dict[str, list[int]] = {}
+        for index, tokens in enumerate(self.line_tokens):
+            for token in tokens:
+                self.postings.setdefault(token, []).append(index)
+
+    def __contains__(self, text: NormalizedText) -> bool:
+        return text.normalized in self.normalized_lines
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def candidates(self, text: str) -> list[tuple[int, str]]:
+        """
+        Returns the lines that share enough words with `text` to be a possible fuzzy match.
+
+        Args:
+            text (str): Text to match
+
+        Returns:
+            list[tuple[int, str]]: Candidate (slide number, line) pairs, in original order
+        """
+        tokens = tokenize(text)
+        shared_counts: dict[int, int] = {}
+        for token in tokens:
+            for index in self.postings.get(token, ()):
+                shared_counts[index] = shared_counts.get(index, 0) + 1
+        return [
+            self.lines[index]
+            for index in sorted(shared_counts)
+            if shared_counts[index]
+            >= self.MIN_SHARED_TOKENS * min(len(tokens), len(self.line_tokens[index]))
+        ]
+
+
+def not_a_service_deck_result(file_name: str, profile: DeckProfile) -> Result:
+    """
+    Returns the result reported instead of all checks when a file is not a service deck.
+
+    Args:
+        file_name (str): Name of the file
+        profile (DeckProfile): Counts found in the file
+
+    Returns:
+        Result: Result with an error status
+    """
+    return {
+        "title": "Check file is a service deck.",
+        "status": Status.ERROR,
+        "comments": f"{file_name} does not look like a service deck, so no other checks were run. Expected: >={MIN_ORDER_OF_SERVICE_SLIDES} slides containing 'order of service' and >={MIN_DATES} date(s). Provided: {profile.order_of_service_slides} slide(s) and {profile.dates} date(s) found.",
+    }
+
+
+def timeout_result(time_budget: Optional[float], skipped_checks: list[str]) -> Result:
+    """
+    Returns the result reported when the time budget runs out before all checks are run.
+
+    Args:
+        time_budget (Optional[float]): CPU time budget in seconds
+        skipped_checks (list[str]): Names of the checks that were not run
+
+    Returns:
+        Result: Result with a timeout status
+    """
+    budget = f" of {time_budget:g}s" if time_budget is not None else ""
+    return {
+        "title": "Check all checks completed within the time budget.",
+        "status": Status.TIMEOUT,
+        "comments": f"The CPU time budget{budget} was exceeded. Skipped: {', '.join(skipped_checks)}.",
+    }
 
 
 class ContentChecker(BaseChecker):
@@ -142,21 +328,69 @@ class ContentChecker(BaseChecker):
     def __init__(
         self,
         file_path: str,
-        presentation: Presentation,
+        presentation: Optional[Presentation],
         req_order_of_service: str,
         selected_date: str,
         sermon_discussion_qns: str,
+        parsed_req_order_of_service: Optional[ParsedOrderOfService] = None,
+        parsed_sermon_discussion_qns: Optional[ParsedSermonDiscussionQns] = None,
+        text_model: Optional[TextModel] = None,
+        rules: Optional[CompiledRules] = None,
     ) -> None:
+        """
+        Either a parsed presentation or an already extracted text model must be provided.
+        The rules default to the rules of the process.
+        """
         self.file_name = file_path
         self.presentation = presentation
+        if text_model is not None:
+            self.text_model = normalize_text_model(text_model)
         self.raw_req_order_of_service = req_order_of_service
         self.selected_date = selected_date
         self.sermon_discussion_qns = sermon_discussion_qns
+        self.parsed_req_order_of_service = parsed_req_order_of_service
+        self.parsed_sermon_discussion_qns = parsed_sermon_discussion_qns
+        self.rules = rules or get_rules()
 
     @cached_property
     def slides(self) -> list[Slide]:
         return [slide for slide in self.presentation.slides]  # type: ignore
 
+    @cached_property
+    def text_model(self) -> TextModel:
+        """
+        Returns the texts of all slides, extracted once from the presentation.
+
+        Returns:
+            TextModel: Texts of every slide with slide number (1-indexed) as keys
+        """
+        return extract_text_model(self.presentation)  # type: ignore
+
+    @cached_property
+    def profile(self) -> DeckProfile:
+        """
+        Counts the slides containing the order of service and the texts starting with a
+        date, in a single scan of the text model, with the same matching as
+        `section_headers` and `dates`.
+
+        Returns:
+            DeckProfile: Counts found in the presentation
+        """
+        order_of_service_slides, dates = 0, 0
+        is_date = self.rules.date.match
+        for texts in self.text_model.values():
+            if any("order of service" in text for text in texts):
+                order_of_service_slides += 1
+            dates += sum(1 for text in texts if is_date(text))
+        return DeckProfile(order_of_service_slides, dates)
+
+    @property
+    def is_service_deck(self) -> bool:
+        return (
+            self.profile.order_of_service_slides >= MIN_ORDER_OF_SERVICE_SLIDES
+            and self.profile.dates >= MIN_DATES
+        )
+
     @cached_property
     def section_headers(self) -> SlideSubset:
         """
@@ -168,7 +402,7 @@ class ContentChecker(BaseChecker):
             SlideSubset: Subset of slides with slide number (1-indexed) as keys
         """
         text = "order of service"
-        return get_slides_by_pattern(self.slides, text)
+        return get_slides_by_pattern(self.text_model, text)
 
     @cached_property
     def sermon_discussion_slides(self) -> SlideSubset:
@@ -179,7 +413,23 @@ class ContentChecker(BaseChecker):
             SlideSubset: Subset of slides with slide number (1-indexed) as keys
         """
         text = "Sermon discussion questions"
-        return get_slides_by_pattern(self.slides, text)
+        return get_slides_by_pattern(self.text_model, text)
+
+    @cached_property
+    def dates(self) -> list[tuple[int, str]]:
+        """
+        Returns the texts that start with a date in one of the formats of the rules.
+
+        Returns:
+            list[tuple[int, str]]: (slide number, text) pairs in slide order
+        """
+        is_date = self.rules.date.match
+        return [
+            (i, item)
+            for i, texts in self.text_model.items()
+            for item in texts
+            if is_date(item)
+        ]
 
     @cached_property
     def slide_order_of_service(self) -> SlideOrderOfService:
@@ -203,16 +453,15 @@ class ContentChecker(BaseChecker):
                         result[i] = [item]
             return result
 
-        def split_and_strip(text: str) -> list[str]:
+        def split_and_strip(text: ShapeText) -> list[NormalizedText]:
             """
             Splits up raw text on newline characters and strips on both sides of the
-            resulting string.
+            resulting string. Stripping does not change the normalized forms of the lines.
             """
-            split_text = re.split("\n+", text)
             return [
-                item.strip()
-                for item in split_text
-                if len(item) and "order of service" not in item
+                NormalizedText(line.strip(), line.normalized)
+                for line in text.lines
+                if len(line) and "order of service" not in line
             ]
 
         section_header_text = get_raw_text_extracts_from_slides(self.section_headers)
@@ -224,29 +473,73 @@ class ContentChecker(BaseChecker):
         }
 
     @cached_property
-    def filtered_req_order_of_service(self) -> FilteredCleanOrderOfService:
-        return filter_clean_req_order_of_service(
-            get_clean_req_order_of_service(self.raw_req_order_of_service)
-        )
+    def filtered_req_order_of_service(self) -> ParsedOrderOfService:
+        if self.parsed_req_order_of_service is not None:
+            return self.parsed_req_order_of_service
+        return parse_req_order_of_service(self.raw_req_order_of_service, self.rules)
+
+    @cached_property
+    def required_items(self) -> tuple[RequiredItem, ...]:
+        return get_required_items(self.filtered_req_order_of_service)
 
     @cached_property
-    def cleaned_sermon_discussion_qns(self) -> list[str]:
-        return get_clean_sermon_discussion_qns(self.sermon_discussion_qns)
+    def normalized_selected_date(self) -> str:
+        return normalize_text(self.selected_date)
 
-    def run(self) -> list[Result]:
+    @cached_property
+    def cleaned_sermon_discussion_qns(self) -> ParsedSermonDiscussionQns:
+        if self.parsed_sermon_discussion_qns is not None:
+            return self.parsed_sermon_discussion_qns
+        return parse_sermon_discussion_qns(self.sermon_discussion_qns)
+
+    @property
+    def checks(self) -> list[Check]:
+        return [
+            self.check_existence_of_section_headers,
+            self.check_section_headers_have_correct_order,
+            self.check_all_dates_are_as_provided,
+            self.check_existence_of_lone_sermon_discussion_slide,
+            self.check_sermon_discussion_qns_are_as_provided,
+        ]
+
+    def run(
+        self,
+        deadline: Optional[float] = None,
+        time_budget: Optional[float] = None,
+        progress: Optional[ProgressReporter] = None,
+    ) -> list[Result]:
         """
         Runs all the checks within the ContentChecker for a single Presentation instance.
+        Files that do not look like a service deck get a single result instead.
+
+        Args:
+            deadline (Optional[float], optional): Value of `time.thread_time()` after which
+                the remaining checks are skipped and a timeout result is returned instead.
+            time_budget (Optional[float], optional): Budget in seconds, for the timeout result.
+            progress (Optional[ProgressReporter], optional): Reporter of the extraction of
+                the text model and of each completed check.
 
         Returns:
             list[Result]: List of Result dictionaries
         """
-        results = [
-            self.check_existence_of_section_headers(),
-            *self.check_section_headers_have_correct_order(),
-            *self.check_all_dates_are_as_provided(),
-            self.check_existence_of_lone_sermon_discussion_slide(),
-            *self.check_sermon_discussion_qns_are_as_provided(),
-        ]
+        is_service_deck = self.is_service_deck
+        if progress is not None:
+            progress.report(self.file_name, EXTRACTED, slides=len(self.text_model))
+        if not is_service_deck:
+            return [not_a_service_deck_result(self.file_name, self.profile)]
+        results = []
+        checks = self.checks
+        for i, check in enumerate(checks):
+            if deadline is not None and time.thread_time() > deadline:
+                skipped_checks = [check.__name__ for check in checks[i:]]
+                results.append(timeout_result(time_budget, skipped_checks))
+                break
+            result = check()
+            results.extend(result if isinstance(result, list) else [result])
+            if progress is not None:
+                progress.report(
+                    self.file_name, CHECKED, check.__name__, len(self.text_model)
+                )
         return self.sorted(results)
 
     def sorted(self, results: list[Result]) -> list[Result]:
@@ -292,54 +585,82 @@ class ContentChecker(BaseChecker):
         # 1. Identify the section header slides
         # 2. Extract the text from the slide
         # 3. Check that the order of service from the text in the slides is correct
-        results: list[Result] = []
-        items_with_comments = (
-            "(Opening Song|Closing Song|Hearing God(\u2018|\u2019|')s Word Read)"
-        )
+        # The same order of service is repeated on every section header slide, so identical
+        # findings are keyed by (title, status, comments) and list all affected slides
+        findings: dict[tuple[str, Status, str], list[int]] = {}
+        partial_ratios: dict[tuple[str, str], int] = {}
+        is_commented_item = self.rules.commented_item.match
+
+        def get_partial_ratio(required_item: str, entry: str) -> int:
+            key = (required_item, entry)
+            if key not in partial_ratios:
+                partial_ratios[key] = fuzz.partial_ratio(required_item, entry)
+            return partial_ratios[key]
+
+        def add_finding(i: int, title: str, status: Status, comments: str) -> None:
+            slides = findings.setdefault((title, status, comments), [])
+            if i not in slides:
+                slides.append(i)
 
         for i, slide_text in self.slide_order_of_service.items():
             index = 0
             for entry in slide_text:
 
-                title, comments = self.filtered_req_order_of_service[index]
-                title = title.replace("\u2018", "\u2019")
-                required_item = f"{title} \u2013 {comments}"
-                is_commented_item = re.match(items_with_comments, entry)
-                partial_ratio = fuzz.partial_ratio(required_item, entry)
-
-                if is_commented_item is not None:
-                    is_commented_items_correct = required_item == entry
-                    if is_commented_items_correct:
+                # Entries and required items are compared in normalized form. The original
+                # entry is kept for the comments, and to detect U+2018.
+                normalized_entry = entry.normalized
+                item = self.required_items[index]
+
+                if is_commented_item(normalized_entry) is not None:
+                    # U+2018 is normalized away, so entries using it are still compared
+                    # by similarity and get a warning
+                    is_commented_item_correct = (
+                        normalized_entry == item.normalized_required_item
+                        and "\u2018" not in entry
+                    )
+                    if is_commented_item_correct:
                         index += 1
                         continue
-                    elif 90 < partial_ratio < 100:
-                        result = {
-                            "title": "Check section headers are in the correct order: Is there a typo?",
-                            "status": Status.WARNING,
-                            "comments": f"On Slide {i}, Expected: '{required_item}'. Provided: '{entry}'. Similarity score = {partial_ratio} of 100",
-                        }
+                    partial_ratio = get_partial_ratio(item.required_item, entry)
+                    comparison = f"Expected: '{item.required_item}'. Provided: '{entry}'. Similarity score = {partial_ratio} of 100"
+                    if 90 < partial_ratio < 100:
+                        add_finding(
+                            i,
+                            "Check section headers are in the correct order: Is there a typo?",
+                            Status.WARNING,
+                            comparison,
+                        )
                         index += 1
                     else:
-                        result = {
-                            "title": "Check section headers are in the correct order",
-                            "status": Status.ERROR,
-                            "comments": f"On Slide {i}, Expected: '{required_item}'. Provided: '{entry}'. Similarity score = {partial_ratio} of 100",
-                        }
-                    if result not in results:
-                        results.append(result)
+                        add_finding(
+                            i,
+                            "Check section headers are in the correct order",
+                            Status.ERROR,
+                            comparison,
+                        )
                 elif "\u2018" in entry:
-                    result = {
-                        "title": "Check section headers are in the correct order: Is there a typo?",
-                        "status": Status.WARNING,
-                        "comments": f"On Slide {i}, Expected: '{required_item}'. Provided: '{entry}'. The use of the unicode character U+2018 (\u2018) is triggering this warning; replace this character with U+2019 (\u2019) or a standard single quote (') to resolve this error. Similarity score = {partial_ratio} of 100",
-                    }
-                    results.append(result)
+                    partial_ratio = get_partial_ratio(item.required_item, entry)
+                    add_finding(
+                        i,
+                        "Check section headers are in the correct order: Is there a typo?",
+                        Status.WARNING,
+                        f"Expected: '{item.required_item}'. Provided: '{entry}'. The use of the unicode character U+2018 (\u2018) is triggering this warning; replace this character with U+2019 (\u2019) or a standard single quote (') to resolve this error. Similarity score = {partial_ratio} of 100",
+                    )
                     index += 1
-                elif entry.replace("\u2018", "\u2019") != title:
+                elif normalized_entry != item.normalized_title:
                     continue
                 else:
                     index += 1
 
+        results: list[Result] = [
+            {
+                "title": title,
+                "status": status,
+                "comments": f"On {format_slide_numbers(slides)}, {comments}",
+                "slides": slides,
+            }
+            for (title, status, comments), slides in findings.items()
+        ]
         if len(results) == 0:
             result: Result = {
                 "title": "Check all required order of service items are present and in the correct order",
@@ -391,23 +712,17 @@ class ContentChecker(BaseChecker):
         Returns:
             list[Result]: List of Result dictionaries
         """
-        date_pattern = "\\d+[\\s-][A-Za-z]+[\\s-]\\d+"
-        slides_with_dates = get_slides_by_pattern(self.slides, date_pattern)
         results = []
-        for i, item_list in get_raw_text_extracts_from_slides(
-            slides_with_dates
-        ).items():
-            for item in item_list:
+        for i, item in self.dates:
+            if item.normalized != self.normalized_selected_date:
                 partial_ratio = fuzz.partial_ratio(item, self.selected_date)
-                if re.match(date_pattern, item) and item.replace(
-                    "_", " "
-                ) != self.selected_date.replace("_", " "):
-                    result = {
-                        "title": "Check all dates that appear in the slides are the same as the date of Sunday service.",
-                        "status": Status.ERROR,
-                        "comments": f"On slide {i}, Expected: '{self.selected_date}'. Provided: '{item}'. Similarity score = {partial_ratio} of 100",
-                    }
-                    results.append(result)
+                result = {
+                    "title": "Check all dates that appear in the slides are the same as the date of Sunday service.",
+                    "status": Status.ERROR,
+                    "comments": f"On slide {i}, Expected: '{self.selected_date}'. Provided: '{item}'. Similarity score = {partial_ratio} of 100",
+                    "slides": [i],
+                }
+                results.append(result)
 
         if len(results) == 0:
             result = {
@@ -435,34 +750,59 @@ class ContentChecker(BaseChecker):
         }
         return result
 
+    @cached_property
+    def sermon_discussion_lines(self) -> "LineIndex":
+        """
+        Returns an index over the lines of text in all sermon discussion slides.
+
+        Returns:
+            LineIndex: Index of (slide number, line) pairs in slide order
+        """
+        raw_text_extracts = get_raw_text_extracts_from_slides(
+            self.sermon_discussion_slides
+        )
+        return LineIndex(
+            [
+                (i, line)
+                for i, item_list in raw_text_extracts.items()
+                for item in item_list
+                for line in item.lines
+            ]
+        )
+
     def check_sermon_discussion_qns_are_as_provided(self) -> list[Result]:
         """
-        Test that the required questions appear in the sermon discussion slide.
+        Test that the required questions appear in the sermon discussion slides.
         Ignores numbering (i.e. 1. and 2.) and checks sentences directly.
+        Questions may be spread across several sermon discussion slides.
+
+        Exact matches are looked up in a hash set of lines. Lines and questions are
+        compared in normalized form, so lines that only differ in whitespace (e.g. double
+        or trailing spaces), quote or dash variants are exact matches rather than typos.
+        Otherwise, only lines sharing enough words with the question are fuzzy matched,
+        in slide order.
 
         Returns:
             list[Result]: List of Result dictionaries
         """
         # 1. Get the sermon discussion slides
         # 2. Check questions are in these slides
-        raw_text_extracts = get_raw_text_extracts_from_slides(
-            self.sermon_discussion_slides
-        )
-        slide_number = list(raw_text_extracts.keys())[0]
-        raw_text = list(raw_text_extracts.values())[0]
-        split_text = [item for item_list in raw_text for item in item_list.split("\n")]
+        lines = self.sermon_discussion_lines
+        slides = list(self.sermon_discussion_slides)
+        slide_numbers = format_slide_numbers(slides)
 
         results = []
         for required_qn in self.cleaned_sermon_discussion_qns:
-            for entry in split_text:
+            if required_qn in lines:
+                continue
+            for slide_number, entry in lines.candidates(required_qn):
                 partial_ratio = fuzz.partial_ratio(required_qn, entry)
-                if required_qn in split_text:
-                    break
-                elif 90 < partial_ratio < 100:
+                if 90 < partial_ratio < 100:
                     result = {
                         "title": "Check sermon discussion questions are as provided: Is there a typo?",
                         "status": Status.WARNING,
                         "comments": f"On Slide {slide_number}, Expected: '{required_qn}'. Provided: '{entry}'. Similarity score = {partial_ratio} of 100",
+                        "slides": [slide_number],
                     }
                     results.append(result)
                     break
@@ -472,7 +812,10 @@ class ContentChecker(BaseChecker):
                 result: Result = {
                     "title": "Check sermon discussion questions are as provided.",
                     "status": Status.ERROR,
-                    "comments": f"On Slide {slide_number}, Expected: '{required_qn}'. Could not find this required question.",
+                    "comments": f"On {slide_numbers}, Expected: '{required_qn}'. Could not find this required question."
+                    if slide_numbers
+                    else f"Expected: '{required_qn}'. Could not find this required question, as there is no sermon discussion slide.",
+                    "slides": slides,
                 }
                 results.append(result)
 
@@ -497,14 +840,45 @@ class MultiContentChecker(BaseMultiChecker):
         req_order_of_service: str,
         selected_date: str,
         sermon_discussion_qns: str,
+        time_budget: Optional[float] = None,
+        text_models: Optional[dict[str, TextModel]] = None,
+        progress: Optional[ProgressReporter] = None,
+        rules: Optional[CompiledRules] = None,
     ) -> None:
+        """
+        Files are checked from their parsed presentations, or from their already extracted
+        text models (e.g. from the text model store) which are checked after presentations.
+        If a progress reporter is given, the stages of every file are reported to it.
+        The rules default to the rules of the process.
+        """
         self.presentations = presentations
+        self.text_models = text_models or {}
         self.req_order_of_service = req_order_of_service
         self.selected_date = selected_date
         self.sermon_discussion_qns = sermon_discussion_qns
+        self.time_budget = time_budget
+        self.progress = progress
+        self.rules = rules or get_rules()
 
     @cached_property
     def checkers(self) -> dict[str, ContentChecker]:
+        # The inputs and rules are shared read-only by the checkers of all files
+        parsed_req_order_of_service = parse_req_order_of_service(
+            self.req_order_of_service, self.rules
+        )
+        parsed_sermon_discussion_qns = parse_sermon_discussion_qns(
+            self.sermon_discussion_qns
+        )
+        sources: dict[str, tuple[Optional[Presentation], Optional[TextModel]]] = {
+            **{
+                file_name: (pptx, None)
+                for file_name, pptx in self.presentations.items()
+            },
+            **{
+                file_name: (None, model)
+                for file_name, model in self.text_models.items()
+            },
+        }
         return {
             file_name: ContentChecker(
                 file_path=file_name,
@@ -512,14 +886,50 @@ class MultiContentChecker(BaseMultiChecker):
                 req_order_of_service=self.req_order_of_service,
                 selected_date=self.selected_date,
                 sermon_discussion_qns=self.sermon_discussion_qns,
+                parsed_req_order_of_service=parsed_req_order_of_service,
+                parsed_sermon_discussion_qns=parsed_sermon_discussion_qns,
+                text_model=text_model,
+                rules=self.rules,
             )
-            for file_name, pptx in self.presentations.items()
+            for file_name, (pptx, text_model) in sources.items()
         }
 
     def run(self) -> list[FileResults]:
-        file_results = []
+        """
+        Runs the checks of every file. If a time budget is set, it is shared by all files,
+        and files that are reached after it runs out get a timeout result.
+
+        When several files are checked together, they are then compared with each other by
+        the ConsistencyChecker, leaving out files that are not service decks or whose checks
+        timed out.
+
+        Returns:
+            list[FileResults]: Results of every file
+        """
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.thread_time() + self.time_budget
+        file_results: list[FileResults] = []
         for file_name, checker in self.checkers.items():
-            file_results.append({"filename": file_name, "results": checker.run()})
+            results = checker.run(
+                deadline=deadline, time_budget=self.time_budget, progress=self.progress
+            )
+            file_results.append({"filename": file_name, "results": results})
+            if self.progress is not None:
+                self.progress.report(file_name, DONE, slides=len(checker.text_model))
+
+        completed = {
+            item["filename"]: self.checkers[item["filename"]]
+            for item in file_results
+            if self.checkers[item["filename"]].is_service_deck
+            and all(result["status"] != Status.TIMEOUT for result in item["results"])
+        }
+        consistency_results = ConsistencyChecker(completed).run()
+        for item in file_results:
+            extra_results = consistency_results.get(item["filename"])
+            if extra_results:
+                checker = self.checkers[item["filename"]]
+                item["results"] = checker.sorted(item["results"] + extra_results)
         return file_results
 
 
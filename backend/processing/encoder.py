@@ -0,0 +1,73 @@
+from functools import lru_cache
+from json.encoder import encode_basestring  # type: ignore
+from typing import Iterable
+
+from backend.processing.result import FileResults, Result
+
+
+@lru_cache(maxsize=256)
+def encode_title(title: str) -> str:
+    """
+    Returns the JSON encoded form of a check title. Check titles come from a small fixed
+    set, so their encoded form is cached instead of being escaped for every finding.
+
+    Args:
+        title (str): Title of the check
+
+    Returns:
+        str: JSON string literal of the title
+    """
+    return encode_basestring(title)
+
+
+def encode_result(result: Result) -> str:
+    """
+    Returns the JSON encoded form of a single result.
+
+    Args:
+        result (Result): Result dictionary
+
+    Returns:
+        str: JSON object with the title, comments and numeric status of the result, and
+            its slide numbers if it has any
+    """
+    encoded = (
+        f'{{"title":{encode_title(result["title"])},'
+        f'"comments":{encode_basestring(result["comments"])},'
+        f'"status":{result["status"].value}'
+    )
+    if "slides" in result:
+        encoded += f',"slides":[{",".join(map(str, result["slides"]))}]'
+    return f"{encoded}}}"
+
+
+def encode_one_file_results(file_results: FileResults) -> str:
+    """
+    Returns the JSON encoded form of the results of a single file.
+
+    Args:
+        file_results (FileResults): Results of the file
+
+    Returns:
+        str: JSON object with the filename and the list of results
+    """
+    filename = encode_basestring(file_results["filename"])
+    encoded_results = ",".join(
+        [encode_result(result) for result in file_results["results"]]
+    )
+    return f'{{"filename":{filename},"results":[{encoded_results}]}}'
+
+
+def encode_file_results(file_results: Iterable[FileResults]) -> bytes:
+    """
+    Serializes the results of all files directly into UTF-8 JSON bytes, bypassing the
+    generic FastAPI encoders.
+
+    Args:
+        file_results (Iterable[FileResults]): Results of all files
+
+    Returns:
+        bytes: JSON array of file results
+    """
+    encoded = ",".join([encode_one_file_results(item) for item in file_results])
+    return f"[{encoded}]".encode("utf-8")
@@ -0,0 +1,142 @@
+"""
+Index of the findings of checked files, by file, slide number, status and check, so
+that clients can page through the findings they show (e.g. only the errors on Slides
+10 to 20) instead of receiving all results of large decks at once.
+
+Findings keep the order of the results, i.e. by file in upload order and then by the
+order of the checks, which makes a position in that order a stable cursor.
+"""
+
+import json
+from array import array
+from bisect import bisect_right
+from typing import Callable, Hashable, Iterable, NamedTuple, Optional, Sequence
+
+from backend.processing.result import FileResults, Status
+
+
+class Finding(NamedTuple):
+    filename: str
+    title: str
+    comments: str
+    status: Status
+    slides: tuple[int, ...]
+
+
+class FindingsPage(NamedTuple):
+    findings: list[Finding]
+    # Number of findings matching the filters, across all pages
+    total: int
+    # Position after which the next page starts, or None after the last page
+    next_cursor: Optional[int]
+
+
+class FindingsIndex:
+    """
+    Findings of checked files with posting lists of their positions by file, status,
+    check and slide number. Posting lists are ascending arrays, so a query reads only the
+    positions of its most selective filter and checks the other filters per finding.
+    """
+
+    def __init__(self, file_results: Iterable[FileResults]) -> None:
+        findings: list[Finding] = []
+        for item in file_results:
+            for result in item["results"]:
+                findings.append(
+                    Finding(
+                        filename=item["filename"],
+                        title=result["title"],
+                        comments=result["comments"],
+                        status=Status(result["status"]),
+                        slides=tuple(result.get("slides", ())),
+                    )
+                )
+        self.findings: Sequence[Finding] = tuple(findings)
+        self.by_file = self.build_postings(lambda finding: [finding.filename])
+        self.by_status = self.build_postings(lambda finding: [finding.status])
+        self.by_check = self.build_postings(lambda finding: [finding.title])
+        self.by_slide = self.build_postings(lambda finding: finding.slides)
+
+    @classmethod
+    def from_json(cls, content: bytes) -> "FindingsIndex":
+        """
+        Builds the index of serialized results, as encoded by `encode_file_results`.
+        """
+        return cls(json.loads(content))
+
+    def build_postings(
+        self, keys_of: Callable[[Finding], Iterable[Hashable]]
+    ) -> dict[Hashable, array]:
+        postings: dict[Hashable, array] = {}
+        for position, finding in enumerate(self.findings):
+            for key in keys_of(finding):
+                postings.setdefault(key, array("l")).append(position)
+        return postings
+
+    def query(
+        self,
+        filenames: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[Status]] = None,
+        titles: Optional[Iterable[str]] = None,
+        slides: Optional[range] = None,
+        cursor: Optional[int] = None,
+        limit: int = 50,
+    ) -> FindingsPage:
+        """
+        Returns a page of the findings that match all given filters. A filter matches any
+        of its values, and findings without slide numbers never match a slide filter.
+
+        Args:
+            filenames (Optional[Iterable[str]], optional): Files of the findings.
+            statuses (Optional[Iterable[Status]], optional): Statuses of the findings.
+            titles (Optional[Iterable[str]], optional): Titles of the checks.
+            slides (Optional[range], optional): Slide numbers of the findings.
+            cursor (Optional[int], optional): `next_cursor` of the previous page.
+            limit (int, optional): Maximum number of findings per page. Defaults to 50.
+
+        Returns:
+            FindingsPage: Matching findings after the cursor, in the order of the results
+        """
+        slide_numbers = None
+        if slides is not None:
+            # Only slide numbers that have findings at all, however large the range is
+            slide_numbers = [number for number in self.by_slide if number in slides]
+        filters = [
+            (self.by_file, filenames),
+            (self.by_status, statuses),
+            (self.by_check, titles),
+            (self.by_slide, slide_numbers),
+        ]
+        # Positions matching each given filter, as the union of the postings of its values
+        candidates = [
+            merge_postings(postings.get(value, ()) for value in values)
+            for postings, values in filters
+            if values is not None
+        ]
+        if candidates:
+            candidates.sort(key=len)
+            selected, *others = candidates
+            other_sets = [set(positions) for positions in others]
+            matching = [
+                position
+                for position in selected
+                if all(position in positions for positions in other_sets)
+            ]
+        else:
+            matching = range(len(self.findings))
+
+        start = 0 if cursor is None else bisect_right(matching, cursor)
+        page = matching[start : start + limit]
+        has_more = start + limit < len(matching)
+        return FindingsPage(
+            findings=[self.findings[position] for position in page],
+            total=len(matching),
+            next_cursor=page[-1] if has_more else None,
+        )
+
+
+def merge_postings(postings: Iterable[Sequence[int]]) -> Sequence[int]:
+    lists = [positions for positions in postings if positions]
+    if len(lists) == 1:
+        return lists[0]
+    return sorted({position for positions in lists for position in positions})
@@ -0,0 +1,74 @@
+"""
+Normalization of slide text and form inputs, so that checks can compare strings directly
+instead of re-normalizing them in their loops. Checks keep the original text for their
+comments, and to detect the variants they warn about.
+
+Slide text is normalized once when it is extracted, and carried next to the original text
+as a NormalizedText.
+"""
+
+import re
+import unicodedata
+from typing import Optional
+
+CHARACTER_TRANSLATION = str.maketrans(
+    {
+        # Single quote variants, to the right single quotation mark used in the slides
+        "\u2018": "\u2019",
+        "\u201b": "\u2019",
+        "\u2032": "\u2019",
+        # Double quote variants
+        "\u201c": '"',
+        "\u201d": '"',
+        "\u201e": '"',
+        # Dash variants, to the en dash used between an item and its comment
+        "\u2012": "\u2013",
+        "\u2014": "\u2013",
+        "\u2015": "\u2013",
+        "\u2212": "\u2013",
+        # Underscores are used as spaces in dates, e.g. "22_May_2022"
+        "_": " ",
+    }
+)
+CHARACTER_VARIANT_PATTERN = re.compile(
+    f"[{re.escape(''.join(map(chr, CHARACTER_TRANSLATION)))}]"
+)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Returns a line of text in normalized form:
+    1. Unicode NFC
+    2. Quote and dash variants replaced, underscores replaced by spaces
+    3. Spaced hyphens (" - ") replaced by en dashes
+    4. Whitespace stripped and collapsed to single spaces
+
+    Args:
+        text (str): Line of text
+
+    Returns:
+        str: Normalized line of text
+    """
+    text = unicodedata.normalize("NFC", text)
+    # Translating is slow compared to searching, and most texts have no variants
+    if CHARACTER_VARIANT_PATTERN.search(text) is not None:
+        text = text.translate(CHARACTER_TRANSLATION)
+    return " ".join(text.split()).replace(" - ", " – ")
+
+
+class NormalizedText(str):
+    """
+    Original text, which it is equal to and used as, with its normalized form.
+    """
+
+    normalized: str
+
+    def __new__(cls, text: str, normalized: Optional[str] = None) -> "NormalizedText":
+        normalized_text = super().__new__(cls, text)
+        normalized_text.normalized = (
+            normalize_text(text) if normalized is None else normalized
+        )
+        return normalized_text
+
+    def __reduce__(self):
+        return NormalizedText, (str(self), self.normalized)
@@ -0,0 +1,102 @@
+"""
+Cheap inspection of .pptx files before they are parsed by python-pptx, which loads every
+part of the package into memory.
+"""
+
+import re
+import zipfile
+import zlib
+from typing import BinaryIO, NamedTuple, Optional
+
+from backend.processing.result import FileResults, Status
+
+PRESENTATION_PART = "ppt/presentation.xml"
+SLIDE_ID_PATTERN = re.compile(rb"<(?:\w+:)?sldId\b")
+
+
+class InvalidPresentation(Exception):
+    pass
+
+
+class PresentationInfo(NamedTuple):
+    slide_count: int
+    compressed_size: int
+    uncompressed_size: int
+
+
+def inspect_presentation(file: BinaryIO) -> PresentationInfo:
+    """
+    Returns the slide count and sizes of a .pptx file by reading only the zip directory
+    and `ppt/presentation.xml`.
+
+    Args:
+        file (BinaryIO): Seekable .pptx file
+
+    Raises:
+        InvalidPresentation: If the file is not a zip archive containing a readable
+            presentation
+
+    Returns:
+        PresentationInfo: Slide count and total compressed and uncompressed size of all parts
+    """
+    try:
+        with zipfile.ZipFile(file) as archive:
+            members = archive.infolist()
+            presentation_xml = archive.read(PRESENTATION_PART)
+    except (
+        zipfile.BadZipFile,
+        KeyError,
+        zlib.error,
+        EOFError,
+        RuntimeError,
+        NotImplementedError,
+    ) as error:
+        # Not a zip archive, no presentation part, or a corrupt, encrypted or
+        # unsupported presentation part
+        raise InvalidPresentation(str(error)) from error
+    finally:
+        file.seek(0)
+    return PresentationInfo(
+        slide_count=len(SLIDE_ID_PATTERN.findall(presentation_xml)),
+        compressed_size=sum(member.compress_size for member in members),
+        uncompressed_size=sum(member.file_size for member in members),
+    )
+
+
+def check_presentation_limits(
+    info: PresentationInfo, max_slides: int, max_uncompressed_bytes: int
+) -> Optional[str]:
+    """
+    Returns the reason why a presentation exceeds the limits, or None if it is within them.
+    """
+    if info.slide_count > max_slides:
+        return f"has {info.slide_count} slides, more than the limit of {max_slides}"
+    if info.uncompressed_size > max_uncompressed_bytes:
+        return (
+            f"expands to {info.uncompressed_size // (1024 * 1024)} MB, "
+            f"more than the limit of {max_uncompressed_bytes // (1024 * 1024)} MB"
+        )
+    return None
+
+
+def rejected_file_results(filename: str, reason: str) -> FileResults:
+    """
+    Returns the results of a file that was rejected before any checks were run.
+
+    Args:
+        filename (str): Name of the file
+        reason (str): Reason for rejecting the file
+
+    Returns:
+        FileResults: A single error result
+    """
+    return {
+        "filename": filename,
+        "results": [
+            {
+                "title": "Check file is within the upload limits.",
+                "status": Status.ERROR,
+                "comments": f"{filename} was not checked: it {reason}.",
+            }
+        ],
+    }
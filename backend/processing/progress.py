@@ -0,0 +1,57 @@
+"""
+Progress reporting of checks, e.g. to show users of large uploads how far their job is.
+
+Checkers take an optional ProgressReporter. Jobs that nobody follows run without one, so
+their only overhead is a check for None at each stage.
+"""
+
+import time
+from typing import Callable, Optional, TypedDict
+
+# Stages of a file, in order. "checked" is reported once per check.
+RECEIVED = "received"
+PARSED = "parsed"
+EXTRACTED = "extracted"
+CHECKED = "checked"
+DONE = "done"
+# Stage of the whole job, reported once after all files are done
+COMPLETE = "complete"
+
+
+class ProgressEvent(TypedDict):
+    # None for events of the whole job
+    filename: Optional[str]
+    stage: str
+    # Name of the check method, for "checked" events
+    check: Optional[str]
+    slides: Optional[int]
+    # Seconds since the job started
+    elapsed: float
+
+
+class ProgressReporter:
+    """
+    Timestamps progress events relative to the start of the job and passes them on to
+    `publish`, which may be called from any thread.
+    """
+
+    def __init__(self, publish: Callable[[ProgressEvent], None]) -> None:
+        self.publish = publish
+        self.started = time.perf_counter()
+
+    def report(
+        self,
+        filename: Optional[str],
+        stage: str,
+        check: Optional[str] = None,
+        slides: Optional[int] = None,
+    ) -> None:
+        self.publish(
+            {
+                "filename": filename,
+                "stage": stage,
+                "check": check,
+                "slides": slides,
+                "elapsed": round(time.perf_counter() - self.started, 3),
+            }
+        )
@@ -3,12 +3,15 @@ from typing import TypedDict
 
 
 class Status(Enum):
+    TIMEOUT = 3
     ERROR = 2
     WARNING = 1
     PASS = 0
 
     def __repr__(self):
-        if self == Status.ERROR:
+        if self == Status.TIMEOUT:
+            return "Timeout"
+        elif self == Status.ERROR:
             return "Error"
         elif self == Status.WARNING:
             return "Warning"
@@ -19,12 +22,31 @@ class Status(Enum):
         return self.value < other.value
 
 
-class Result(TypedDict):
+class ResultBase(TypedDict):
     title: str
     comments: str
     status: Status
 
 
+class Result(ResultBase, total=False):
+    # Slide numbers (1-indexed, ascending) that the result is about, for results about
+    # particular slides
+    slides: list[int]
+
+
 class FileResults(TypedDict):
     filename: str
     results: list[Result]
+
+
+def format_slide_numbers(slide_numbers: list[int]) -> str:
+    """
+    Returns slide numbers formatted for comments, e.g. "Slide 3" or "Slides 3, 5 and 7".
+    Returns an empty string if there are no slide numbers.
+    """
+    if not slide_numbers:
+        return ""
+    if len(slide_numbers) == 1:
+        return f"Slide {slide_numbers[0]}"
+    *rest, last = slide_numbers
+    return f"Slides {', '.join(str(number) for number in rest)} and {last}"
@@ -0,0 +1,150 @@
+"""
+Rules describing the service decks of a church, loaded from a JSON file so that other
+churches and services can adapt them without changing the checks:
+
+- sections: items of the order of service, as they appear on the section header slides,
+  with the aliases used for them in the service plan, whether their slide entry carries
+  comments (e.g. "Opening Song – Behold Our God"), and whether they are left out of the
+  section headers altogether
+- date_formats: regular expressions matching the dates on the slides
+
+The rules are compiled once per process into matchers which are shared read-only by all
+checkers, so adding rules does not add work per slide.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional, TypedDict
+
+from backend.processing.normalize import normalize_text
+
+DEFAULT_RULES_PATH = Path(__file__).with_name("rules.json")
+
+
+class InvalidRules(ValueError):
+    pass
+
+
+class SectionRule(TypedDict, total=False):
+    title: str
+    aliases: list[str]
+    has_comments: bool
+    excluded: bool
+
+
+class RulesConfig(TypedDict):
+    sections: list[SectionRule]
+    date_formats: list[str]
+
+
+class CompiledRules:
+    """
+    Matchers compiled from a RulesConfig, as read-only tables and patterns. Instances are
+    hashed by identity, so that the parsed inputs of the checks can be memoized per set
+    of rules.
+    """
+
+    __slots__ = ("section_titles", "excluded_prefixes", "commented_item", "date")
+
+    section_titles: Mapping[str, str]
+    excluded_prefixes: tuple[str, ...]
+    commented_item: re.Pattern
+    date: re.Pattern
+
+    def __init__(self, config: RulesConfig) -> None:
+        """
+        Raises:
+            InvalidRules: If the config is incomplete, or a date format is not a valid
+                regular expression
+        """
+        try:
+            sections = config["sections"]
+            date_formats = config["date_formats"]
+            titles = [section["title"] for section in sections]
+        except (KeyError, TypeError) as error:
+            raise InvalidRules(f"Missing rule: {error}") from error
+        if not date_formats:
+            raise InvalidRules("At least one date format is required")
+        if len(set(titles)) != len(titles):
+            raise InvalidRules("Section titles must be unique")
+
+        # Aliases in the service plan, looked up by normalized form
+        section_titles = {
+            normalize_text(alias): section["title"]
+            for section in sections
+            for alias in section.get("aliases", [])
+        }
+        excluded_prefixes = tuple(
+            section["title"] for section in sections if section.get("excluded")
+        )
+        # Slide entries are compared in normalized form, in which U+2018 has already
+        # been replaced, but ASCII apostrophes have not
+        commented_titles = [
+            re.escape(normalize_text(section["title"])).replace("\u2019", "[\u2019']")
+            for section in sections
+            if section.get("has_comments")
+        ]
+        try:
+            date = re.compile(
+                "|".join(f"(?:{date_format})" for date_format in date_formats)
+            )
+        except re.error as error:
+            raise InvalidRules(f"Invalid date format: {error}") from error
+
+        self.section_titles = MappingProxyType(section_titles)
+        self.excluded_prefixes = excluded_prefixes
+        # An empty alternation would match every entry
+        self.commented_item = re.compile(
+            "|".join(commented_titles) if commented_titles else "(?!)"
+        )
+        self.date = date
+
+    def section_title(self, item: str) -> str:
+        """
+        Returns the title on the slides of an item of the service plan, which is the item
+        itself unless it is an alias.
+        """
+        return self.section_titles.get(normalize_text(item), item)
+
+    def is_excluded(self, item: str) -> bool:
+        return item.startswith(self.excluded_prefixes)
+
+
+def load_rules(path: Path) -> CompiledRules:
+    """
+    Loads and compiles the rules of a JSON file.
+
+    Args:
+        path (Path): Path to the rules file
+
+    Raises:
+        InvalidRules: If the file does not contain valid rules
+
+    Returns:
+        CompiledRules: Compiled rules
+    """
+    try:
+        config = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as error:
+        raise InvalidRules(f"{path} is not valid JSON: {error}") from error
+    return CompiledRules(config)
+
+
+def get_default_rules_path() -> Path:
+    """
+    Returns the path set by RULES_PATH, or the bundled rules otherwise.
+    """
+    path: Optional[str] = os.getenv("RULES_PATH")
+    return Path(path) if path else DEFAULT_RULES_PATH
+
+
+@lru_cache(maxsize=1)
+def get_rules() -> CompiledRules:
+    """
+    Returns the rules of this process, compiled on the first call.
+    """
+    return load_rules(get_default_rules_path())
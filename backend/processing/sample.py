@@ -0,0 +1,101 @@
+"""
+Builds small synthetic service decks that follow the structure of the real service slides.
+Used to pre-warm the server, and by tests and benchmarks that need a presentation file.
+"""
+
+import io
+from typing import Optional, Sequence
+
+from pptx import Presentation as PresentationConstructor
+from pptx.util import Inches
+
+SAMPLE_DATE = "22 May 2022"
+
+SAMPLE_ORDER_OF_SERVICE = "\n".join(
+    [
+        "Opening Words\t1\t",
+        "Opening Song\t4\tBehold Our God",
+        "Family Confession\t2\t#11 Confession of Sin (Slide 17 & 18)",
+        "Family Prayer\t4\tRefer to Prayer Points Tab in this document (Usually updated by Thu)",
+        "Family Business\t5\tRefer to Family Business Tab",
+        "Bible Reading \t4\tDaniel 5",
+        "Sermon\t30\tPreacher: Denesh",
+        "Closing Song\t4\tOnly a Holy God",
+        "Closing Words\t1\t",
+        "Discuss in groups\t5\t",
+        "Dismissal\t\t",
+    ]
+)
+
+SAMPLE_SERMON_DISCUSSION_QNS = """1. How have you been confronted with your own arrogance before God today? How have you been challenged to repent?
+2. How has our passage been a comfort if we are seeking to live for God in this anti-God world?"""
+
+SAMPLE_SLIDE_ORDER_OF_SERVICE = (
+    "Opening Song – Behold Our God",
+    "Family Confession",
+    "Family Prayer",
+    "Family Business",
+    "Hearing God’s Word Read – Daniel 5",
+    "Hearing God’s Word Proclaimed",
+    "Closing Song – Only a Holy God",
+    "Sermon Discussion",
+)
+
+SAMPLE_QUESTION_LINES = (
+    "How have you been confronted with your own arrogance before God today? How have you been challenged to repent?",
+    "How has our passage been a comfort if we are seeking to live for God in this anti-God world?",
+)
+
+
+def build_sample_presentation(
+    selected_date: str = SAMPLE_DATE,
+    order_of_service: Sequence[str] = SAMPLE_SLIDE_ORDER_OF_SERVICE,
+    question_lines: Sequence[str] = SAMPLE_QUESTION_LINES,
+    lyric_slides: int = 0,
+    extra_slides: Optional[Sequence[Sequence[str]]] = None,
+) -> bytes:
+    """
+    Returns the bytes of a .pptx file laid out like a service deck: a welcome slide with
+    the date, one section header slide per order of service item, optional lyric slides
+    and a sermon discussion slide.
+
+    Args:
+        selected_date (str, optional): Date shown on the welcome slide
+        order_of_service (Sequence[str], optional): Order of service shown on every
+            section header slide
+        question_lines (Sequence[str], optional): Lines on the sermon discussion slide
+        lyric_slides (int, optional): Number of filler lyric slides per song
+        extra_slides (Optional[Sequence[Sequence[str]]], optional): Texts of additional
+            slides appended at the end, one text box per string
+
+    Returns:
+        bytes: Contents of the .pptx file
+    """
+    presentation = PresentationConstructor()
+    layout = presentation.slide_layouts[6]
+    # The blank layout carries date and slide number placeholders; real service decks do not
+    for placeholder in list(layout.placeholders):
+        placeholder._element.getparent().remove(placeholder._element)
+
+    def add_slide(texts: Sequence[str]) -> None:
+        slide = presentation.slides.add_slide(layout)
+        for i, text in enumerate(texts):
+            text_box = slide.shapes.add_textbox(
+                Inches(0.5 + 4.5 * i), Inches(1), Inches(4), Inches(4)
+            )
+            text_box.text_frame.text = text
+
+    order_of_service_text = "\n".join(["order of service", *order_of_service])
+    add_slide(["Welcome to The Crossing Church", selected_date])
+    for item in order_of_service:
+        add_slide([item, order_of_service_text])
+        if " Song" in item:
+            for verse in range(1, lyric_slides + 1):
+                add_slide([f"Verse {verse}\nLyrics of {item}, line {verse}"])
+    add_slide(["Sermon discussion questions", "\n".join(question_lines)])
+    for texts in extra_slides or []:
+        add_slide(texts)
+
+    output = io.BytesIO()
+    presentation.save(output)
+    return output.getvalue()
@@ -0,0 +1,252 @@
+"""
+Persistent store of the text models of checked decks, so that new or changed checks can
+be run over an archive of decks without re-opening any .pptx file.
+"""
+
+import hashlib
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+from backend.processing.text_model import ShapeText, TextModel
+
+# Bump when the extracted text model changes, then run `python -m backend.cli archive rebuild`
+SCHEMA_VERSION = 1
+DATABASE_NAME = "text_models.sqlite3"
+# Size of the chunks in which deck files are hashed
+HASH_CHUNK_SIZE = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    content_hash TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    slide_count INTEGER NOT NULL,
+    stored_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shapes (
+    content_hash TEXT NOT NULL REFERENCES decks (content_hash) ON DELETE CASCADE,
+    slide_number INTEGER NOT NULL,
+    shape_index INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (content_hash, slide_number, shape_index)
+) WITHOUT ROWID;
+"""
+
+
+class SchemaVersionMismatch(Exception):
+    pass
+
+
+class StoredDeck(NamedTuple):
+    content_hash: str
+    filename: str
+    text_model: TextModel
+
+
+def compute_content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def compute_file_hash(path: Path) -> str:
+    """
+    Returns the same hash as `compute_content_hash`, reading the file in chunks.
+    """
+    content_hash = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+
+def get_default_store_directory() -> Optional[Path]:
+    """
+    Returns the store directory configured by the TEXT_MODEL_STORE_DIR environment variable.
+    """
+    directory = os.getenv("TEXT_MODEL_STORE_DIR")
+    return Path(directory) if directory else None
+
+
+class TextModelStore:
+    """
+    SQLite-backed store of text models keyed by the SHA-256 hash of the deck's contents.
+    The original decks are kept next to the database, content-addressed, so that the text
+    models can be rebuilt after a schema change.
+
+    Each operation opens its own connection, so the store can be shared across threads.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        check_schema: bool = True,
+        database_name: str = DATABASE_NAME,
+    ) -> None:
+        self.directory = Path(directory)
+        self.path = self.directory / database_name
+        self.decks_directory = self.directory / "decks"
+        self.decks_directory.mkdir(parents=True, exist_ok=True)
+        with self.connect() as connection:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            has_decks = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'decks'"
+            ).fetchone()
+            if not has_decks:
+                connection.executescript(SCHEMA)
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            elif check_schema and version != SCHEMA_VERSION:
+                raise SchemaVersionMismatch(
+                    f"{self.path} has schema version {version}, expected {SCHEMA_VERSION}. "
+                    "Run `python -m backend.cli archive rebuild` to rebuild it."
+                )
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(self.path)) as connection:
+            connection.execute("PRAGMA foreign_keys = ON")
+            with connection:
+                yield connection
+
+    def deck_path(self, content_hash: str) -> Path:
+        return self.decks_directory / f"{content_hash}.pptx"
+
+    def put(self, content: bytes, filename: str, text_model: TextModel) -> str:
+        """
+        Stores a deck and its text model, replacing any previous text model of the same deck.
+
+        Args:
+            content (bytes): Contents of the deck
+            filename (str): Name of the deck
+            text_model (TextModel): Extracted text model
+
+        Returns:
+            str: SHA-256 hash of the contents of the deck
+        """
+        content_hash = compute_content_hash(content)
+        deck_path = self.deck_path(content_hash)
+        if not deck_path.exists():
+            temporary_path = deck_path.with_suffix(".tmp")
+            temporary_path.write_bytes(content)
+            temporary_path.replace(deck_path)
+        self.put_text_model(content_hash, filename, text_model)
+        return content_hash
+
+    def put_text_model(
+        self, content_hash: str, filename: str, text_model: TextModel
+    ) -> None:
+        with self.connect() as connection:
+            connection.execute(
+                "DELETE FROM decks WHERE content_hash = ?", (content_hash,)
+            )
+            connection.execute(
+                "INSERT INTO decks VALUES (?, ?, ?, ?)",
+                (
+                    content_hash,
+                    filename,
+                    len(text_model),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO shapes VALUES (?, ?, ?, ?)",
+                (
+                    (content_hash, slide_number, shape_index, text)
+                    for slide_number, texts in text_model.items()
+                    for shape_index, text in enumerate(texts)
+                ),
+            )
+
+    def get(self, content_hash: str) -> Optional[StoredDeck]:
+        with self.connect() as connection:
+            deck = connection.execute(
+                "SELECT content_hash, filename, slide_count FROM decks "
+                "WHERE content_hash = ?",
+                (content_hash,),
+            ).fetchone()
+            if deck is None:
+                return None
+            return self._load(connection, *deck)
+
+    def __contains__(self, content_hash: str) -> bool:
+        with self.connect() as connection:
+            return (
+                connection.execute(
+                    "SELECT 1 FROM decks WHERE content_hash = ?", (content_hash,)
+                ).fetchone()
+                is not None
+            )
+
+    def __len__(self) -> int:
+        with self.connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM decks").fetchone()[0]
+
+    def __iter__(self) -> Iterator[StoredDeck]:
+        """
+        Yields every stored deck, ordered by filename.
+        """
+        with self.connect() as connection:
+            decks = connection.execute(
+                "SELECT content_hash, filename, slide_count FROM decks "
+                "ORDER BY filename, content_hash"
+            ).fetchall()
+            for deck in decks:
+                yield self._load(connection, *deck)
+
+    def _load(
+        self,
+        connection: sqlite3.Connection,
+        content_hash: str,
+        filename: str,
+        slide_count: int,
+    ) -> StoredDeck:
+        text_model: TextModel = {i: [] for i in range(1, slide_count + 1)}
+        rows = connection.execute(
+            "SELECT slide_number, text FROM shapes WHERE content_hash = ? "
+            "ORDER BY slide_number, shape_index",
+            (content_hash,),
+        )
+        for slide_number, text in rows:
+            text_model[slide_number].append(ShapeText(text))
+        return StoredDeck(content_hash, filename, text_model)
+
+
+def rebuild_store(directory: Path) -> tuple[int, list[str]]:
+    """
+    Rebuilds the store with the current schema and text model extraction, by re-reading
+    every stored deck. The current database is only replaced once the rebuild completes.
+
+    Args:
+        directory (Path): Store directory
+
+    Returns:
+        tuple[int, list[str]]: Number of rebuilt decks, and decks whose files are missing
+    """
+    from pptx import Presentation as PresentationConstructor
+
+    from backend.processing.text_model import extract_text_model
+
+    old_store = TextModelStore(directory, check_schema=False)
+    with old_store.connect() as connection:
+        decks = connection.execute(
+            "SELECT content_hash, filename FROM decks ORDER BY filename"
+        ).fetchall()
+
+    rebuild_name = f"{DATABASE_NAME}.rebuild"
+    (old_store.directory / rebuild_name).unlink(missing_ok=True)
+    new_store = TextModelStore(directory, database_name=rebuild_name)
+
+    rebuilt, missing = 0, []
+    for content_hash, filename in decks:
+        deck_path = old_store.deck_path(content_hash)
+        if not deck_path.exists():
+            missing.append(filename)
+            continue
+        presentation = PresentationConstructor(deck_path)
+        new_store.put_text_model(
+            content_hash, filename, extract_text_model(presentation)
+        )
+        rebuilt += 1
+    new_store.path.replace(old_store.path)
+    return rebuilt, missing
@@ -0,0 +1,202 @@
+"""
+Template-aware extraction of text models. The decks of a service are built from the same
+template every week, so their layouts and boilerplate slides (e.g. the welcome and
+dismissal slides) are byte-identical from deck to deck.
+
+Text models are extracted directly from the parts of the package that they depend on:
+the slides, their relationships, and the layouts used by them. Each part is fingerprinted
+by the SHA-256 digest of its bytes, and what is extracted from it is kept in a long-lived
+TemplatePool, so that only the week-specific slides are parsed and extracted. The other
+parts of the package (masters, themes, media) are never parsed at all.
+
+Parts are parsed into the element classes of python-pptx and extracted through its shape
+classes, so that the text models are identical to those of `extract_text_model`.
+"""
+
+import hashlib
+import io
+import posixpath
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Callable, TypeVar
+from xml.etree import ElementTree
+
+from backend.processing.text_model import TextModel, extract_shape_texts
+
+PRESENTATION_PART = "ppt/presentation.xml"
+PRESENTATION_NAMESPACE = "http://schemas.openxmlformats.org/presentationml/2006/main"
+RELATIONSHIP_NAMESPACE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+PACKAGE_RELATIONSHIP_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+SLIDE_LAYOUT_RELATIONSHIP_SUFFIX = "/slideLayout"
+
+T = TypeVar("T")
+
+
+class TemplatePool:
+    """
+    Thread-safe LRU pool of what was extracted from the parts of previously checked
+    decks, by kind of part and fingerprint. The pool is shared by all decks of a process.
+    """
+
+    def __init__(self, max_size: int = 4096) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[tuple[str, bytes], object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_extract(
+        self, kind: str, content: bytes, extract: Callable[[bytes], T]
+    ) -> T:
+        """
+        Returns what was extracted from a part with the same content, or extracts it.
+
+        Args:
+            kind (str): Kind of part, which determines what is extracted from it
+            content (bytes): Content of the part
+            extract (Callable[[bytes], T]): Extracts an immutable value from the content
+
+        Returns:
+            T: Extracted value
+        """
+        key = (kind, hashlib.sha256(content).digest())
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                self._items.move_to_end(key)
+                return self._items[key]  # type: ignore
+            self.misses += 1
+        # Extracted outside of the lock, so that parts are extracted in parallel
+        value = extract(content)
+        if self.max_size > 0:
+            with self._lock:
+                self._items[key] = value
+                while len(self._items) > self.max_size:
+                    self._items.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
+def get_relationships_path(partname: str) -> str:
+    directory, name = posixpath.split(partname)
+    return posixpath.join(directory, "_rels", f"{name}.rels")
+
+
+def resolve_target(partname: str, target: str) -> str:
+    # Targets are relative to the directory of the part, or absolute within the package
+    if target.startswith("/"):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(partname), target))
+
+
+def parse_relationships(content: bytes) -> tuple[tuple[str, str, str], ...]:
+    """
+    Returns the ID, type and target of the internal relationships of a part.
+    """
+    return tuple(
+        (
+            relationship.get("Id", ""),
+            relationship.get("Type", ""),
+            relationship.get("Target", ""),
+        )
+        for relationship in ElementTree.fromstring(content).iter(
+            f"{{{PACKAGE_RELATIONSHIP_NAMESPACE}}}Relationship"
+        )
+        if relationship.get("TargetMode") != "External"
+    )
+
+
+def parse_slide_ids(content: bytes) -> tuple[str, ...]:
+    """
+    Returns the relationship IDs of the slides of a presentation part, in slide order.
+    """
+    return tuple(
+        slide_id.get(f"{{{RELATIONSHIP_NAMESPACE}}}id", "")
+        for slide_id in ElementTree.fromstring(content).iter(
+            f"{{{PRESENTATION_NAMESPACE}}}sldId"
+        )
+    )
+
+
+def extract_slide_part_texts(content: bytes) -> tuple[str, ...]:
+    from pptx.oxml import parse_xml
+    from pptx.shapes.shapetree import SlideShapes
+
+    shapes = SlideShapes(parse_xml(content).cSld.spTree, None)  # type: ignore
+    return tuple(extract_shape_texts(shapes))
+
+
+def extract_layout_part_texts(content: bytes) -> tuple[str, ...]:
+    from pptx.oxml import parse_xml
+    from pptx.shapes.shapetree import LayoutShapes
+
+    shapes = LayoutShapes(parse_xml(content).cSld.spTree, None)  # type: ignore
+    return tuple(extract_shape_texts(shapes))
+
+
+def extract_package_text_model(content: bytes, pool: TemplatePool) -> TextModel:
+    """
+    Returns the text model of a .pptx file, parsing only the parts that are not in the
+    pool. Layouts are read once per deck, however many slides use them.
+
+    Args:
+        content (bytes): Content of the .pptx file
+        pool (TemplatePool): Pool of the parts of previously checked decks
+
+    Raises:
+        KeyError: If a part referenced by the presentation is missing from the package
+
+    Returns:
+        TextModel: Texts of every slide with slide number (1-indexed) as keys
+    """
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+
+        def read_relationships(partname: str) -> tuple[tuple[str, str, str], ...]:
+            relationships_path = get_relationships_path(partname)
+            if relationships_path not in names:
+                return ()
+            return pool.get_or_extract(
+                "relationships", archive.read(relationships_path), parse_relationships
+            )
+
+        names = set(archive.namelist())
+        slide_ids = pool.get_or_extract(
+            "presentation", archive.read(PRESENTATION_PART), parse_slide_ids
+        )
+        targets = {
+            relationship_id: resolve_target(PRESENTATION_PART, target)
+            for relationship_id, _, target in read_relationships(PRESENTATION_PART)
+        }
+        layout_texts: dict[str, tuple[str, ...]] = {}
+        text_model = {}
+        for i, slide_id in enumerate(slide_ids, 1):
+            slide_partname = targets[slide_id]
+            layout_partname = next(
+                (
+                    resolve_target(slide_partname, target)
+                    for _, relationship_type, target in read_relationships(
+                        slide_partname
+                    )
+                    if relationship_type.endswith(SLIDE_LAYOUT_RELATIONSHIP_SUFFIX)
+                ),
+                None,
+            )
+            if layout_partname is None:
+                raise KeyError(f"{slide_partname} has no slide layout")
+            if layout_partname not in layout_texts:
+                layout_texts[layout_partname] = pool.get_or_extract(
+                    "layout", archive.read(layout_partname), extract_layout_part_texts
+                )
+            slide_texts = pool.get_or_extract(
+                "slide", archive.read(slide_partname), extract_slide_part_texts
+            )
+            text_model[i] = [*slide_texts, *layout_texts[layout_partname]]
+    return text_model
@@ -0,0 +1,116 @@
+"""
+The text model is the text extracted from a presentation, which is all that the content
+checks need. Extracting it once decouples the checks from python-pptx, so that they can
+run on text models that were stored or passed between processes.
+"""
+
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from backend.processing.normalize import NormalizedText, normalize_text
+
+if TYPE_CHECKING:
+    from pptx.presentation import Presentation
+    from pptx.shapes.base import BaseShape
+    from pptx.slide import Slide
+
+# Slide number (1-indexed) -> texts of the shapes of the slide, followed by the texts of
+# the shapes of its layout. Only shapes with a text frame are included. Extracted texts are
+# ShapeTexts, but plain strings are accepted wherever a text model is checked.
+TextModel = dict[int, list[str]]
+
+
+class ShapeText(NormalizedText):
+    """
+    Text of a shape with its normalized form, and the normalized forms of its lines
+    (split on newlines).
+    """
+
+    normalized_lines: tuple[str, ...]
+
+    def __new__(
+        cls,
+        text: str,
+        normalized: Optional[str] = None,
+        normalized_lines: Optional[tuple[str, ...]] = None,
+    ) -> "ShapeText":
+        shape_text = super().__new__(cls, text, normalized)
+        if normalized_lines is None:
+            if "\n" in text:
+                normalized_lines = tuple(map(normalize_text, text.split("\n")))
+            else:
+                normalized_lines = (shape_text.normalized,)
+        shape_text.normalized_lines = normalized_lines
+        return shape_text
+
+    def __reduce__(self):
+        return ShapeText, (str(self), self.normalized, self.normalized_lines)
+
+    @property
+    def lines(self) -> list[NormalizedText]:
+        """
+        Returns the lines of the text with their normalized forms, without normalizing
+        them again.
+        """
+        return [
+            NormalizedText(line, normalized)
+            for line, normalized in zip(self.split("\n"), self.normalized_lines)
+        ]
+
+
+def normalize_text_model(text_model: TextModel) -> TextModel:
+    """
+    Returns the text model with all texts as ShapeTexts. Text models that were extracted
+    are returned as is, so only texts from other sources (e.g. tests) are normalized.
+
+    Args:
+        text_model (TextModel): Text model to normalize
+
+    Returns:
+        TextModel: Text model of ShapeTexts
+    """
+    if all(
+        isinstance(text, ShapeText) for texts in text_model.values() for text in texts
+    ):
+        return text_model
+    return {
+        i: [text if isinstance(text, ShapeText) else ShapeText(text) for text in texts]
+        for i, texts in text_model.items()
+    }
+
+
+def extract_shape_texts(shapes: Iterable["BaseShape"]) -> list[ShapeText]:
+    """
+    Returns the texts of the shapes with a text frame, normalized once for all checks.
+    """
+    return [
+        ShapeText(shape.text_frame.text) for shape in shapes if shape.has_text_frame
+    ]
+
+
+def extract_slide_texts(slide: "Slide") -> list[ShapeText]:
+    """
+    Returns the texts of the shapes of a slide and of its layout.
+
+    Args:
+        slide (Slide): Slide to extract
+
+    Returns:
+        list[ShapeText]: Texts of the shapes with a text frame, slide shapes first
+    """
+    return extract_shape_texts([*slide.shapes, *slide.slide_layout.shapes])  # type: ignore
+
+
+def extract_text_model(presentation: "Presentation") -> TextModel:
+    """
+    Returns the text model of a presentation.
+
+    Args:
+        presentation (Presentation): Parsed presentation
+
+    Returns:
+        TextModel: Texts of every slide with slide number (1-indexed) as keys
+    """
+    return {
+        i: extract_slide_texts(slide)
+        for i, slide in enumerate(presentation.slides, 1)  # type: ignore
+    }
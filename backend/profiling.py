@@ -0,0 +1,187 @@
+"""
+Opt-in memory allocation profiling of uploads with tracemalloc.
+
+Each profiled upload is attributed to the stages of the checking pipeline (parse, which
+preflights the files and extracts their text models through the template pool, and
+check): a snapshot is taken before and after each stage, and the allocations that grew
+the most in between are recorded with the peak of traced memory during the stage.
+Once the upload is done and its objects have been collected, a last snapshot shows what
+the upload left behind, e.g. in caches.
+
+Traces are cleared when a profiled upload starts, so snapshots only hold the allocations
+made since then. This keeps them small enough to take per stage, as the modules loaded
+at startup would otherwise make up most of the traces.
+
+Tracing slows down allocations and snapshots are slow, so profiled uploads run one at a
+time and profiling should only be enabled to investigate memory growth.
+"""
+
+import gc
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, TypedDict, TypeVar
+
+T = TypeVar("T")
+
+# Number of frames kept per allocation, to attribute allocations in libraries to callers
+TRACEBACK_LIMIT = 8
+# Number of allocation sites reported per stage
+TOP_ALLOCATIONS = 10
+# Number of profiled uploads kept for the debug endpoint
+PROFILE_HISTORY = 20
+
+
+class Allocation(TypedDict):
+    # "file:line" of the allocation site, innermost first
+    traceback: list[str]
+    size_diff: int
+    count_diff: int
+
+
+class StageProfile(TypedDict):
+    size_diff: int
+    peak_bytes: int
+    seconds: float
+    top: list[Allocation]
+
+
+class UploadProfile(TypedDict):
+    label: str
+    stages: dict[str, StageProfile]
+    # Allocations still held after the upload, once its objects have been collected. Its
+    # peak and duration are those of the whole upload.
+    retained: StageProfile
+
+
+# Allocations of the profiler itself, e.g. of the snapshots, are left out
+PROFILER_FILES = (tracemalloc.__file__, __file__)
+
+
+def compare_snapshots(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top: int
+) -> tuple[int, list[Allocation]]:
+    """
+    Returns the net growth of traced memory between two snapshots, and the allocation
+    sites that grew the most.
+    """
+    # Filtered after grouping, as filtering the traces of a snapshot is much slower
+    differences = [
+        difference
+        for difference in after.compare_to(before, "traceback")
+        if difference.traceback[-1].filename not in PROFILER_FILES
+    ]
+    size_diff = sum(difference.size_diff for difference in differences)
+    allocations: list[Allocation] = [
+        {
+            "traceback": [
+                f"{frame.filename}:{frame.lineno}"
+                for frame in reversed(difference.traceback)
+            ],
+            "size_diff": difference.size_diff,
+            "count_diff": difference.count_diff,
+        }
+        for difference in differences[:top]
+        if difference.size_diff > 0
+    ]
+    return size_diff, allocations
+
+
+class MemoryProfiler:
+    """
+    Records the allocations of profiled uploads while enabled, and otherwise just runs
+    them.
+    """
+
+    def __init__(
+        self,
+        top: int = TOP_ALLOCATIONS,
+        history: int = PROFILE_HISTORY,
+        traceback_limit: int = TRACEBACK_LIMIT,
+    ) -> None:
+        self.top = top
+        self.traceback_limit = traceback_limit
+        self.profiles: deque[UploadProfile] = deque(maxlen=history)
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.current: Optional[UploadProfile] = None
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_limit)
+        self.enabled = True
+
+    def stop(self) -> None:
+        self.enabled = False
+        tracemalloc.stop()
+
+    def measure(self, before: tracemalloc.Snapshot, started: float) -> StageProfile:
+        seconds = round(time.perf_counter() - started, 4)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        size_diff, top = compare_snapshots(
+            before, tracemalloc.take_snapshot(), self.top
+        )
+        return {
+            "size_diff": size_diff,
+            "peak_bytes": peak_bytes,
+            "seconds": seconds,
+            "top": top,
+        }
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Attributes the allocations made within the context to a stage of the current
+        upload. Does nothing outside of a profiled upload.
+        """
+        if self.current is None:
+            yield
+            return
+        tracemalloc.reset_peak()
+        before, started = tracemalloc.take_snapshot(), time.perf_counter()
+        yield
+        self.current["stages"][name] = self.measure(before, started)
+
+    def profile(self, label: str, function: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Runs an upload, profiling it if profiling is enabled.
+
+        Args:
+            label (str): Description of the upload, e.g. its file names
+            function (Callable[..., T]): Function running the upload, with stages
+
+        Returns:
+            T: Value returned by `function`
+        """
+        if not self.enabled:
+            return function(*args, **kwargs)
+        with self.lock:
+            gc.collect()
+            tracemalloc.clear_traces()
+            before, started = tracemalloc.take_snapshot(), time.perf_counter()
+            self.current = {"label": label, "stages": {}, "retained": None}  # type: ignore
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                profile, self.current = self.current, None
+            # Objects of the upload in reference cycles, e.g. lxml proxies, are freed here
+            gc.collect()
+            retained = self.measure(before, started)
+            retained["peak_bytes"] = max(
+                [retained["peak_bytes"]]
+                + [stage["peak_bytes"] for stage in profile["stages"].values()]
+            )
+            profile["retained"] = retained
+            self.profiles.append(profile)
+        return result
+
+    def report(self) -> dict:
+        # Since the last profiled upload started
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "uploads": list(self.profiles),
+        }
@@ -0,0 +1,61 @@
+"""
+Fan-out of the progress events of upload jobs to the WebSocket clients following them.
+
+Clients pick a job ID, subscribe to it, and then send it with their upload. Events are
+published from the threads running the checks and handed to the event loop, which puts
+them in a bounded queue per subscriber, so a slow client only misses intermediate events.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from backend.processing.progress import ProgressEvent, ProgressReporter
+
+# Events kept per subscriber that has not received them yet
+MAX_QUEUED_EVENTS = 256
+
+
+class ProgressBroker:
+    def __init__(self, max_queued_events: int = MAX_QUEUED_EVENTS) -> None:
+        self.max_queued_events = max_queued_events
+        self.subscribers: dict[str, set[asyncio.Queue]] = {}
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribes to the events of a job for the duration of the context.
+
+        Yields:
+            asyncio.Queue: Queue of the ProgressEvents of the job
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queued_events)
+        self.subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self.subscribers[job_id]
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[job_id]
+
+    def reporter(self, job_id: Optional[str]) -> Optional[ProgressReporter]:
+        """
+        Returns a reporter publishing to the subscribers of a job, or None if the job has
+        none. Must be called from the event loop.
+        """
+        if job_id is None or job_id not in self.subscribers:
+            return None
+        loop = asyncio.get_running_loop()
+
+        def publish(event: ProgressEvent) -> None:
+            loop.call_soon_threadsafe(self.publish, job_id, event)
+
+        return ProgressReporter(publish)
+
+    def publish(self, job_id: str, event: ProgressEvent) -> None:
+        for queue in self.subscribers.get(job_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                pass
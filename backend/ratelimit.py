@@ -0,0 +1,282 @@
+"""
+In-process rate limiting and fair scheduling of requests per client.
+
+Each client has a token bucket limiting how often it may submit. Admitted requests then
+wait for one of a fixed number of slots. When a slot frees up, it goes to the next client
+in round-robin order rather than to the oldest request, so a client with many queued
+requests cannot delay the requests of others by more than one request per client.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Number of recent queue wait and service times kept for the metrics
+METRICS_WINDOW = 1000
+
+
+class RateLimited(Exception):
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Allows bursts of up to `capacity` requests, refilled at `rate` requests per second.
+    """
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now: float) -> Optional[float]:
+        """
+        Takes a token if one is available.
+
+        Returns:
+            Optional[float]: None if a token was taken, otherwise the seconds until one is
+        """
+        self.refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return None
+        return (1 - self.tokens) / self.rate
+
+    def is_full(self, now: float) -> bool:
+        self.refill(now)
+        return self.tokens >= self.capacity
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.floor(fraction * len(ordered)))]
+
+
+class FairScheduler:
+    """
+    Admits requests per client through token buckets, and runs at most `max_concurrency`
+    of them at a time, handing out free slots to the waiting clients in turn.
+
+    Buckets of clients that have been idle long enough to be full again are dropped, so
+    memory stays bounded by the number of recently active clients.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_concurrency: int,
+        max_queue_depth: int,
+        max_queue_depth_per_client: int,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self.max_queue_depth_per_client = max_queue_depth_per_client
+        self.buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        # Waiting requests by client, in the order in which clients are served
+        self.queues: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self.running = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_times: deque[float] = deque(maxlen=METRICS_WINDOW)
+        self.service_times: deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    def admit(self, client: str, now: float) -> None:
+        """
+        Takes a token from the bucket of the client and checks the queue depths.
+
+        Raises:
+            RateLimited: If the client is over its rate, or the queue is full
+        """
+        self.drop_idle_buckets(now)
+        bucket = self.buckets.pop(client, None) or TokenBucket(
+            self.rate, self.burst, now
+        )
+        self.buckets[client] = bucket
+        wait = bucket.take(now)
+        if wait is not None:
+            self.rejected += 1
+            raise RateLimited("Too many submissions from this client.", wait)
+
+        is_slot_free = self.running < self.max_concurrency
+        if not is_slot_free and (
+            self.queued >= self.max_queue_depth
+            or len(self.queues.get(client, ())) >= self.max_queue_depth_per_client
+        ):
+            bucket.tokens += 1
+            self.rejected += 1
+            raise RateLimited("Too many submissions are waiting.", self.expected_wait())
+
+    def drop_idle_buckets(self, now: float) -> None:
+        # Buckets are ordered by last use, so only the oldest ones need to be looked at
+        while self.buckets:
+            client, bucket = next(iter(self.buckets.items()))
+            if client in self.queues or not bucket.is_full(now):
+                break
+            del self.buckets[client]
+
+    def expected_wait(self) -> float:
+        """
+        Returns an estimate of the seconds until a newly queued request would be started.
+        """
+        service_time = (
+            sum(self.service_times) / len(self.service_times)
+            if self.service_times
+            else 1.0
+        )
+        return service_time * (self.queued + 1) / self.max_concurrency
+
+    @asynccontextmanager
+    async def slot(self, client: str) -> AsyncIterator[None]:
+        """
+        Admits the request of a client and waits for a free slot to run it in.
+
+        Raises:
+            RateLimited: If the request is not admitted
+        """
+        queued_at = time.monotonic()
+        self.admit(client, queued_at)
+        self.admitted += 1
+        if self.running < self.max_concurrency:
+            self.running += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self.queues.setdefault(client, deque()).append(waiter)
+            self.queued += 1
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over just as the request was cancelled
+                    self.release()
+                else:
+                    self.remove_waiter(client, waiter)
+                raise
+        started_at = time.monotonic()
+        self.wait_times.append(started_at - queued_at)
+        try:
+            yield
+        finally:
+            self.service_times.append(time.monotonic() - started_at)
+            self.release()
+
+    def remove_waiter(self, client: str, waiter: asyncio.Future) -> None:
+        queue = self.queues[client]
+        queue.remove(waiter)
+        self.queued -= 1
+        if not queue:
+            del self.queues[client]
+
+    def release(self) -> None:
+        """
+        Hands the slot of a finished request to the first waiting request of the next
+        client, and moves that client to the back of the line.
+        """
+        if not self.queues:
+            self.running -= 1
+            return
+        client, queue = self.queues.popitem(last=False)
+        waiter = queue.popleft()
+        self.queued -= 1
+        if queue:
+            self.queues[client] = queue
+        waiter.set_result(None)
+
+    def metrics(self) -> dict:
+        wait_times = list(self.wait_times)
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "queued_clients": len(self.queues),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "queue_wait_seconds": {
+                "p50": round(percentile(wait_times, 0.5), 4),
+                "p95": round(percentile(wait_times, 0.95), 4),
+                "max": round(max(wait_times, default=0.0), 4),
+            },
+            "mean_service_seconds": round(
+                sum(self.service_times) / len(self.service_times)
+                if self.service_times
+                else 0.0,
+                4,
+            ),
+        }
+
+
+def get_client(
+    scope: Scope, client_header: Optional[str], trusted_proxies: int = 1
+) -> str:
+    """
+    Returns the key of the client, from `client_header` if it is set (e.g.
+    X-Forwarded-For behind a proxy), otherwise from the connection.
+
+    Clients can send the header with any addresses, to which each proxy appends the
+    address it received the request from. So the client is the address appended by the
+    outermost of the `trusted_proxies` proxies in front of the app, counted from the
+    right, and the addresses before it are ignored.
+    """
+    if client_header:
+        value = Headers(scope=scope).get(client_header)
+        if value:
+            addresses = [address.strip() for address in value.split(",")]
+            return addresses[max(len(addresses) - trusted_proxies, 0)]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """
+    Schedules requests to the given paths through a FairScheduler, and rejects requests
+    that are not admitted with a 429 and a Retry-After header.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: tuple[str, ...],
+        scheduler: FairScheduler,
+        client_header: Optional[str] = None,
+        trusted_proxies: int = 1,
+    ) -> None:
+        self.app = app
+        self.paths = paths
+        self.scheduler = scheduler
+        self.client_header = client_header
+        self.trusted_proxies = trusted_proxies
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        client = get_client(scope, self.client_header, self.trusted_proxies)
+        try:
+            async with self.scheduler.slot(client):
+                await self.app(scope, receive, send)
+        except RateLimited as error:
+            response = PlainTextResponse(
+                f"{error} Try again later.",
+                status_code=429,
+                headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))},
+            )
+            await response(scope, receive, send)
@@ -0,0 +1,222 @@
+import gzip
+import hashlib
+import mimetypes
+import posixpath
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+from backend.cache import etag_matches
+from backend.compression import brotli, is_compressible, select_encoding
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+# Suffixes of the precompressed variants written next to the assets at export time
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+class StaticAsset(NamedTuple):
+    content: bytes
+    media_type: str
+    etag: str
+    cache_control: str
+    # Variants that are smaller than the content, in order of preference
+    encoded: dict[str, bytes]
+
+
+def compress_static_content(content: bytes) -> dict[str, bytes]:
+    """
+    Returns the content compressed with every available encoding at the highest level, in
+    order of preference. Variants are returned even if they are not smaller.
+    """
+    variants = {}
+    if brotli is not None:
+        variants["br"] = brotli.compress(content, quality=11)
+    variants["gzip"] = gzip.compress(content, compresslevel=9, mtime=0)
+    return variants
+
+
+def build_static_asset(
+    path: str, content: bytes, variants: Optional[dict[str, bytes]] = None
+) -> StaticAsset:
+    """
+    Returns a static asset with its precomputed ETag, cache headers and compressed variants.
+
+    Args:
+        path (str): Path of the asset relative to the exported directory
+        content (bytes): Contents of the asset
+        variants (Optional[dict[str, bytes]], optional): Compressed variants by encoding.
+            Defaults to none.
+
+    Returns:
+        StaticAsset: Asset ready to be served from memory
+    """
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    # Files under _next/static/ have content hashes in their names and never change
+    is_hashed = path.startswith("_next/static/")
+    variants = variants or {}
+    # Only keep variants that are actually smaller, in order of preference
+    encoded = {
+        encoding: variants[encoding]
+        for encoding in PRECOMPRESSED_SUFFIXES
+        if encoding in variants and len(variants[encoding]) < len(content)
+    }
+    return StaticAsset(
+        content=content,
+        media_type=media_type,
+        etag=f'"{hashlib.sha256(content).hexdigest()[:32]}"',
+        cache_control=(
+            IMMUTABLE_CACHE_CONTROL if is_hashed else REVALIDATE_CACHE_CONTROL
+        ),
+        encoded=encoded,
+    )
+
+
+def is_worth_compressing(path: str, size: int, minimum_size: int) -> bool:
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return size >= minimum_size and is_compressible(media_type)
+
+
+def precompress_directory(directory: Path, minimum_size: int = 1024) -> int:
+    """
+    Writes the compressed variants of the assets in an exported directory next to them,
+    e.g. `main.js.br` and `main.js.gz`, so that the server does not compress them.
+
+    Args:
+        directory (Path): Exported front-end directory
+        minimum_size (int, optional): Assets smaller than this are not compressed.
+            Defaults to 1024.
+
+    Returns:
+        int: Number of assets compressed
+    """
+    compressed = 0
+    for file_path in sorted(directory.rglob("*")):
+        if not file_path.is_file() or file_path.suffix in (
+            PRECOMPRESSED_SUFFIXES.values()
+        ):
+            continue
+        path = file_path.relative_to(directory).as_posix()
+        if is_worth_compressing(path, file_path.stat().st_size, minimum_size):
+            variants = compress_static_content(file_path.read_bytes())
+            for encoding, variant in variants.items():
+                suffix = PRECOMPRESSED_SUFFIXES[encoding]
+                file_path.with_name(file_path.name + suffix).write_bytes(variant)
+            compressed += 1
+    return compressed
+
+
+class StaticAssets:
+    """
+    Holds the exported front-end build in memory, so that assets are served without any
+    filesystem access per request.
+
+    Compressed variants are read from the files written by `precompress_directory` at
+    export time. Assets exported without them (e.g. in development) are compressed in a
+    worker thread on their first request instead of at startup, so that compressing does
+    not block the event loop.
+    """
+
+    def __init__(self, directory: Path, minimum_size: int = 1024) -> None:
+        self.directory = directory
+        self.minimum_size = minimum_size
+        self.assets: dict[str, StaticAsset] = {}
+        # Assets that are worth compressing but have no precompressed variants yet
+        self.uncompressed: set[str] = set()
+
+    def load(self) -> None:
+        """
+        Reads every file in the exported directory, with its precompressed variants. A
+        missing directory results in no assets being served.
+        """
+        assets, uncompressed = {}, set()
+        if self.directory.is_dir():
+            files = {
+                file_path.relative_to(self.directory).as_posix(): file_path
+                for file_path in sorted(self.directory.rglob("*"))
+                if file_path.is_file()
+            }
+            for path, file_path in files.items():
+                base, suffix = posixpath.splitext(path)
+                if suffix in PRECOMPRESSED_SUFFIXES.values() and base in files:
+                    continue
+                content = file_path.read_bytes()
+                variants = {}
+                if is_worth_compressing(path, len(content), self.minimum_size):
+                    variants = {
+                        encoding: files[path + suffix].read_bytes()
+                        for encoding, suffix in PRECOMPRESSED_SUFFIXES.items()
+                        if path + suffix in files
+                    }
+                    if not variants:
+                        uncompressed.add(path)
+                assets[path] = build_static_asset(path, content, variants)
+        self.assets, self.uncompressed = assets, uncompressed
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        return self.assets.get(path)
+
+    async def response(self, path: str, request_headers: Headers) -> Response:
+        """
+        Returns the response for an asset, honouring If-None-Match and Accept-Encoding.
+
+        Args:
+            path (str): Path of the asset relative to the exported directory
+            request_headers (Headers): Headers of the request
+
+        Returns:
+            Response: 200 with the asset, 304 if unchanged, or 404 if there is no such asset
+        """
+        asset = self.get(path)
+        if asset is None:
+            return Response(status_code=404)
+        if path in self.uncompressed:
+            # Discarded first, so that concurrent requests do not compress it again
+            self.uncompressed.discard(path)
+            variants = await anyio.to_thread.run_sync(
+                compress_static_content, asset.content
+            )
+            asset = build_static_asset(path, asset.content, variants)
+            self.assets[path] = asset
+
+        encoding = select_encoding(
+            request_headers.get("accept-encoding", ""), supported=asset.encoded
+        )
+        headers = {"Cache-Control": asset.cache_control}
+        if asset.encoded:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding is not None:
+            content = asset.encoded[encoding]
+            # Each representation has its own strong ETag
+            etag = f'{asset.etag[:-1]}-{encoding}"'
+            headers["Content-Encoding"] = encoding
+        else:
+            content, etag = asset.content, asset.etag
+        headers["ETag"] = etag
+
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=content, media_type=asset.media_type, headers=headers)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Precompress the exported front-end build."
+    )
+    parser.add_argument("directory", type=Path, help="Exported front-end directory")
+    parser.add_argument(
+        "--minimum-size",
+        type=int,
+        default=1024,
+        help="Assets smaller than this are not compressed",
+    )
+    args = parser.parse_args()
+    count = precompress_directory(args.directory, args.minimum_size)
+    print(f"Precompressed {count} assets in {args.directory}.")
@@ -0,0 +1,44 @@
+import io
+import time
+
+
+def import_checker_modules() -> None:
+    """
+    Imports the modules needed to parse and check presentations. These are deferred
+    from `backend.main` so that the server starts accepting connections sooner.
+    """
+    import pptx  # noqa: F401
+    import thefuzz.fuzz  # noqa: F401
+
+    import backend.processing.checker.content  # noqa: F401
+
+
+def warm_up() -> float:
+    """
+    Imports the checker modules and checks a bundled sample deck so that the first real
+    request does not pay for lxml and python-pptx initialization.
+
+    Returns:
+        float: Time taken in seconds
+    """
+    start = time.perf_counter()
+    import_checker_modules()
+
+    from pptx import Presentation as PresentationConstructor
+
+    from backend.processing.checker.content import MultiContentChecker
+    from backend.processing.sample import (
+        SAMPLE_DATE,
+        SAMPLE_ORDER_OF_SERVICE,
+        SAMPLE_SERMON_DISCUSSION_QNS,
+        build_sample_presentation,
+    )
+
+    presentation = PresentationConstructor(io.BytesIO(build_sample_presentation()))
+    MultiContentChecker(
+        presentations={"sample.pptx": presentation},
+        req_order_of_service=SAMPLE_ORDER_OF_SERVICE,
+        selected_date=SAMPLE_DATE,
+        sermon_discussion_qns=SAMPLE_SERMON_DISCUSSION_QNS,
+    ).run()
+    return time.perf_counter() - start
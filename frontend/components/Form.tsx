@@ -8,9 +8,15 @@ import {
   Input,
   message,
   Space,
+  Typography,
   Upload
   } from 'antd';
-import { FileResult, SetSettings, Settings } from '../types';
+import {
+  FileResult,
+  ProgressEvent,
+  SetSettings,
+  Settings
+  } from '../types';
 import { InboxOutlined, UploadOutlined } from '@ant-design/icons';
 import { RcFile } from 'antd/lib/upload';
 import { UploadFile } from 'antd/lib/upload/interface';
@@ -23,15 +29,33 @@ const { Dragger } = Upload;
 
 /* Constants */
 const DEVELOPMENT_MODE = process.env.NEXT_PUBLIC_DEVELOPMENT_MODE === "True";
+const PPTX_TYPE =
+  "application/vnd.openxmlformats-officedocument.presentationml.presentation";
+const ZIP_TYPES = "application/zip,application/x-zip-compressed,.zip";
+const PROGRESS_CONNECT_TIMEOUT = 1000;
+
+const isArchiveUpload = (settings: Settings): boolean => {
+  // A single zip of decks is checked file by file through the bulk endpoint
+  const files = settings.files.value;
+  return files.length === 1 && files[0].name.toLowerCase().endsWith(".zip");
+};
 
-const getFormData = (settings: Settings): FormData => {
+const getFormData = (settings: Settings, jobId?: string): FormData => {
   /**
    * Creates a new FormData object and adds the File objects and parameters into it
    */
   let formData = new FormData();
-  settings.files.value.forEach((file) =>
-    formData.append("files", file, file.name)
-  );
+  if (isArchiveUpload(settings)) {
+    const [archive] = settings.files.value;
+    formData.append("archive", archive, archive.name);
+  } else {
+    settings.files.value.forEach((file) =>
+      formData.append("files", file, file.name)
+    );
+    if (jobId) {
+      formData.append("job_id", jobId);
+    }
+  }
   formData.append(
     "selected_date",
     settings.selectedDate.value?.toString() as string
@@ -51,9 +75,11 @@ const getFormData = (settings: Settings): FormData => {
 const makePOSTRequest = async ({
   formData,
   backendPath,
+  etag,
 }: {
   formData: FormData;
   backendPath: string;
+  etag?: string;
 }) => {
   /**
    * Initiates the POST request to the appropriate backend
@@ -67,24 +93,99 @@ const makePOSTRequest = async ({
     path = `http://localhost:5000${backendPath}`;
   }
 
+  // Conditional request: the backend replies 304 if the inputs are unchanged
+  const headers: HeadersInit = etag ? { "If-None-Match": etag } : {};
+
   return fetch(path, {
     method: "POST",
     body: formData,
+    headers,
   });
 };
 
 const setIsLoading = (setSettings: SetSettings, bool: boolean) => {
   setSettings((previous) => {
-    return { ...previous, isLoading: bool };
+    return { ...previous, isLoading: bool, progress: undefined };
+  });
+};
+
+const subscribeToProgress = async (
+  jobId: string,
+  setSettings: SetSettings
+): Promise<WebSocket | undefined> => {
+  /**
+   * Opens the progress channel of an upload before it is sent, so that no events are
+   * missed. Progress is optional, so uploads go ahead if the channel cannot be opened.
+   */
+  const host = DEVELOPMENT_MODE ? "localhost:5000" : window.location.host;
+  const scheme = window.location.protocol === "https:" ? "wss" : "ws";
+  const socket = new WebSocket(`${scheme}://${host}/api/progress/${jobId}`);
+  socket.onmessage = (event) => {
+    const progress: ProgressEvent = JSON.parse(event.data);
+    setSettings((previous) => {
+      return previous.isLoading ? { ...previous, progress } : previous;
+    });
+  };
+  const isOpen = await new Promise<boolean>((resolve) => {
+    socket.onopen = () => resolve(true);
+    socket.onerror = () => resolve(false);
+    setTimeout(() => resolve(false), PROGRESS_CONNECT_TIMEOUT);
   });
+  if (!isOpen) {
+    socket.close();
+    return undefined;
+  }
+  return socket;
 };
 
-const setResponse = (setSettings: SetSettings, fileResults: FileResult[]) => {
+const formatProgress = (progress: ProgressEvent): string => {
+  const elapsed = `${progress.elapsed.toFixed(1)}s`;
+  const slides = progress.slides !== null ? ` (${progress.slides} slides)` : "";
+  const check = progress.check?.replace(/^check_/, "").replace(/_/g, " ");
+  switch (progress.stage) {
+    case "checked":
+      return `${progress.filename}${slides}: checked ${check} – ${elapsed}`;
+    case "complete":
+      return `All files checked – ${elapsed}`;
+    default:
+      return `${progress.filename}${slides}: ${progress.stage} – ${elapsed}`;
+  }
+};
+
+const setResponse = (
+  setSettings: SetSettings,
+  fileResults: FileResult[],
+  resultsEtag?: string
+) => {
   setSettings((previous) => {
-    return { ...previous, fileResults };
+    return { ...previous, fileResults, resultsEtag };
   });
 };
 
+const readStreamedResults = async (
+  response: Response,
+  onFileResult: (fileResult: FileResult) => void
+) => {
+  /**
+   * Reads newline-delimited JSON results as they arrive, one line per file
+   */
+  const reader = (response.body as ReadableStream<Uint8Array>).getReader();
+  const decoder = new TextDecoder();
+  let buffered = "";
+  while (true) {
+    const { done, value } = await reader.read();
+    buffered += decoder.decode(value, { stream: !done });
+    const lines = buffered.split("\n");
+    buffered = lines.pop() as string;
+    lines
+      .filter((line) => line.length > 0)
+      .forEach((line) => onFileResult(JSON.parse(line)));
+    if (done) {
+      return;
+    }
+  }
+};
+
 const showInvalidUploadError = () => {
   message.error("You must upload files below and fill in all inputs!");
 };
@@ -112,14 +213,19 @@ const showInputErrors = (setSettings: SetSettings) => {
   });
 };
 
-const getResponse = (settings: Settings) => {
+const getResponse = (settings: Settings, jobId?: string) => {
   /**
    * Sends POST request with input Excel files
    */
-  const formData = getFormData(settings);
+  const formData = getFormData(settings, jobId);
+  if (isArchiveUpload(settings)) {
+    // Streamed results are not cached, so there is no ETag to revalidate
+    return makePOSTRequest({ formData, backendPath: "/api/archive/" });
+  }
   const response = makePOSTRequest({
     formData,
     backendPath: "/api/upload/",
+    etag: settings.fileResults ? settings.resultsEtag : undefined,
   });
   return response;
 };
@@ -218,8 +324,7 @@ const props = (settings: Settings, setSettings: SetSettings) => {
   return {
     name: "file",
     multiple: true,
-    accept:
-      "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    accept: `${PPTX_TYPE},${ZIP_TYPES}`,
     beforeUpload: (_: File, fileList: RcFile[]) => {
       setSettings((previous) => {
         return { ...previous, files: { value: fileList, error: false } };
@@ -250,7 +355,9 @@ const FileUploadInput = () => {
         <p className="ant-upload-text">
           Click or drag file here to upload Service Slides.
         </p>
-        <p className="ant-upload-hint">File must have a .pptx extension.</p>
+        <p className="ant-upload-hint">
+          Files must have a .pptx extension, or be a single .zip of them.
+        </p>
       </Dragger>
       {settings.files.error ? (
         <Alert message="You must upload a file!" type="error" />
@@ -279,21 +386,74 @@ const UploadButton = () => {
       return;
     }
     setIsLoading(setSettings, true);
-    const response = getResponse(settings);
-    const responseJson = await (await response).json();
+    // Archive uploads stream their results, which is progress enough
+    const jobId = isArchiveUpload(settings)
+      ? undefined
+      : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+    const socket = jobId
+      ? await subscribeToProgress(jobId, setSettings)
+      : undefined;
+    const response = await getResponse(settings, socket ? jobId : undefined).finally(
+      () => socket?.close()
+    );
+    if (response.status === 304) {
+      // Inputs are unchanged, so the results already in context are still valid
+      router.push("/results");
+      setIsLoading(setSettings, false);
+      return;
+    }
+    if (response.status === 429) {
+      // Rate limited or queue full: keep the inputs so that the user can retry
+      const retryAfter = response.headers.get("Retry-After") ?? "a few";
+      message.error(
+        `The checker is busy. Please try again in ${retryAfter} seconds.`
+      );
+      setIsLoading(setSettings, false);
+      return;
+    }
+    if (!response.ok) {
+      // Invalid inputs, uploads over the size limits and server errors
+      message.error(await response.text());
+      setIsLoading(setSettings, false);
+      return;
+    }
+    if (isArchiveUpload(settings)) {
+      // Shows the results page as soon as the first file has been checked
+      const fileResults: FileResult[] = [];
+      router.push("/results");
+      setResponse(setSettings, []);
+      await readStreamedResults(response, (fileResult) => {
+        fileResults.push(fileResult);
+        setResponse(setSettings, [...fileResults]);
+      });
+      setIsLoading(setSettings, false);
+      return;
+    }
+    const responseJson = await response.json();
     router.push("/results");
-    setResponse(setSettings, responseJson);
+    setResponse(
+      setSettings,
+      responseJson,
+      response.headers.get("ETag") ?? undefined
+    );
     setIsLoading(setSettings, false);
   };
   return (
-    <Button
-      type="primary"
-      icon={<UploadOutlined />}
-      onClick={onClickUpload}
-      loading={settings.isLoading}
-    >
-      Upload
-    </Button>
+    <>
+      <Button
+        type="primary"
+        icon={<UploadOutlined />}
+        onClick={onClickUpload}
+        loading={settings.isLoading}
+      >
+        Upload
+      </Button>
+      {settings.isLoading && settings.progress ? (
+        <Typography.Text type="secondary">
+          {formatProgress(settings.progress)}
+        </Typography.Text>
+      ) : null}
+    </>
   );
 };
 
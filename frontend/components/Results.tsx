@@ -1,9 +1,9 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import styles from '../styles/Results.module.css';
-import { Card, Typography } from 'antd';
+import { Button, Card, Checkbox, Input, Space, Typography } from 'antd';
 import { Collapse } from 'antd';
 import { NextPage } from 'next';
-import { Result } from '../types';
+import { FileResult, FindingsPage, Result } from '../types';
 import { Status } from '../enums';
 import { useSettings } from '../contexts/settings';
 import {
@@ -16,6 +16,78 @@ import {
 const { Text } = Typography;
 const { Panel } = Collapse;
 
+/* Constants */
+const DEVELOPMENT_MODE = process.env.NEXT_PUBLIC_DEVELOPMENT_MODE === "True";
+const PAGE_SIZE = 50;
+const SLIDE_RANGE_PATTERN = /^\d+(-\d+)?$/;
+const STATUS_OPTIONS = [
+  { label: "Errors", value: Status.ERROR },
+  { label: "Warnings", value: Status.WARNING },
+  { label: "Timeouts", value: Status.TIMEOUT },
+  { label: "Passes", value: Status.PASS },
+];
+
+interface Filters {
+  statuses: Status[];
+  // Slide number or range of slide numbers, e.g. "10-20"
+  slides: string;
+}
+
+const toResultsId = (etag: string): string =>
+  etag.replace(/^W\//, "").replace(/"/g, "");
+
+const parseSlideRange = (slides: string): [number, number] => {
+  const [first, last] = slides.split("-").map(Number);
+  return [first, last ?? first];
+};
+
+const fetchFindings = async (
+  resultsId: string,
+  filename: string,
+  filters: Filters,
+  cursor: number | null
+): Promise<FindingsPage> => {
+  const params = new URLSearchParams({ filename, limit: String(PAGE_SIZE) });
+  filters.statuses.forEach((status) => params.append("status", Status[status]));
+  if (filters.slides) {
+    params.set("slides", filters.slides);
+  }
+  if (cursor !== null) {
+    params.set("cursor", String(cursor));
+  }
+  let path = `/api/results/${resultsId}/findings?${params}`;
+  if (DEVELOPMENT_MODE) {
+    path = `http://localhost:5000${path}`;
+  }
+  const response = await fetch(path);
+  if (!response.ok) {
+    throw new Error(`Findings could not be fetched: ${response.status}`);
+  }
+  return response.json();
+};
+
+const filterResults = (results: Result[], filters: Filters): Result[] => {
+  /**
+   * Filters results locally, for results that the backend does not keep, such
+   * as streamed or timed out results
+   */
+  return results.filter((result) => {
+    if (
+      filters.statuses.length > 0 &&
+      !filters.statuses.includes(Number(result.status))
+    ) {
+      return false;
+    }
+    if (!filters.slides) {
+      return true;
+    }
+    const [first, last] = parseSlideRange(filters.slides);
+    return (result.slides ?? []).some(
+      (slide) => slide >= first && slide <= last
+    );
+  });
+};
+
 const CardTitle = ({
   result,
   icon,
@@ -90,27 +162,153 @@ const PassCard = ({ result }: { result: Result }) => {
   );
 };
 
+const ResultCard = ({ result }: { result: Result }) => {
+  switch (Number(result.status)) {
+    case Status.TIMEOUT:
+    case Status.WARNING:
+      return <WarningCard result={result} />;
+    case Status.ERROR:
+      return <ErrorCard result={result} />;
+    default:
+      return <PassCard result={result} />;
+  }
+};
+
+const FileFindings = ({
+  fileResult,
+  resultsId,
+  filters,
+}: {
+  fileResult: FileResult;
+  resultsId?: string;
+  filters: Filters;
+}) => {
+  /**
+   * Fetches the findings of a file page by page when its panel is first
+   * opened, so that large decks are not rendered all at once
+   */
+  const [findings, setFindings] = useState<Result[]>([]);
+  const [cursor, setCursor] = useState<number | null>(null);
+  const [isFailed, setIsFailed] = useState(false);
+  const statuses = filters.statuses.join();
+
+  useEffect(() => {
+    setFindings([]);
+    setCursor(null);
+    setIsFailed(false);
+    if (!resultsId) {
+      return;
+    }
+    let isCancelled = false;
+    fetchFindings(resultsId, fileResult.filename, filters, null)
+      .then((page) => {
+        if (!isCancelled) {
+          setFindings(page.findings);
+          setCursor(page.next_cursor);
+        }
+      })
+      .catch(() => !isCancelled && setIsFailed(true));
+    return () => {
+      isCancelled = true;
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [resultsId, fileResult.filename, statuses, filters.slides]);
+
+  const onClickMore = async () => {
+    if (!resultsId || cursor === null) {
+      return;
+    }
+    try {
+      const page = await fetchFindings(
+        resultsId,
+        fileResult.filename,
+        filters,
+        cursor
+      );
+      setFindings((previous) => [...previous, ...page.findings]);
+      setCursor(page.next_cursor);
+    } catch {
+      setIsFailed(true);
+    }
+  };
+
+  // Results that the backend no longer keeps are shown from the upload response
+  const isLocal = !resultsId || isFailed;
+  const results = isLocal
+    ? filterResults(fileResult.results, filters)
+    : findings;
+  return (
+    <>
+      {results.map((result, index) => (
+        <ResultCard result={result} key={index} />
+      ))}
+      {!isLocal && cursor !== null && (
+        <Button onClick={onClickMore}>Show more</Button>
+      )}
+    </>
+  );
+};
+
+const FilterBar = ({
+  filters,
+  setFilters,
+}: {
+  filters: Filters;
+  setFilters: React.Dispatch<React.SetStateAction<Filters>>;
+}) => {
+  const [slides, setSlides] = useState(filters.slides);
+  const isValidSlides = !slides || SLIDE_RANGE_PATTERN.test(slides);
+  return (
+    <Space wrap>
+      <Checkbox.Group
+        options={STATUS_OPTIONS}
+        value={filters.statuses}
+        onChange={(values) =>
+          setFilters((previous) => ({
+            ...previous,
+            statuses: values as Status[],
+          }))
+        }
+      />
+      <Input
+        placeholder="Slides, e.g. 10-20"
+        value={slides}
+        status={isValidSlides ? undefined : "error"}
+        onChange={(event) => {
+          const value = event.target.value.trim();
+          setSlides(value);
+          if (!value || SLIDE_RANGE_PATTERN.test(value)) {
+            setFilters((previous) => ({ ...previous, slides: value }));
+          }
+        }}
+      />
+    </Space>
+  );
+};
+
 const Results: NextPage = () => {
   const { settings } = useSettings();
+  const [filters, setFilters] = useState<Filters>({ statuses: [], slides: "" });
+  const resultsId = settings.resultsEtag
+    ? toResultsId(settings.resultsEtag)
+    : undefined;
   return (
-    <Collapse>
-      {settings.fileResults?.map((fileResult) => {
-        return (
-          <Panel header={fileResult.filename} key={fileResult.filename}>
-            {fileResult.results.map((result, index) => {
-              switch (Number(result.status)) {
-                case Status.WARNING:
-                  return <WarningCard result={result} key={index} />;
-                case Status.ERROR:
-                  return <ErrorCard result={result} key={index} />;
-                case Status.PASS:
-                  return <PassCard result={result} key={index} />;
-              }
-            })}
-          </Panel>
-        );
-      })}
-    </Collapse>
+    <>
+      <FilterBar filters={filters} setFilters={setFilters} />
+      <Collapse>
+        {settings.fileResults?.map((fileResult) => {
+          return (
+            <Panel header={fileResult.filename} key={fileResult.filename}>
+              <FileFindings
+                fileResult={fileResult}
+                resultsId={resultsId}
+                filters={filters}
+              />
+            </Panel>
+          );
+        })}
+      </Collapse>
+    </>
   );
 };
 
@@ -1,4 +1,5 @@
 enum Status {
+  TIMEOUT = 3,
   ERROR = 2,
   WARNING = 1,
   PASS = 0,
@@ -12,6 +12,8 @@ interface Settings {
   selectedDate: IValue<string>;
   sermonDiscussionQns: IValue<string>;
   fileResults?: FileResult[];
+  resultsEtag?: string;
+  progress?: ProgressEvent;
 }
 
 type SetSettings = React.Dispatch<SetStateAction<Settings>>;
@@ -20,6 +22,8 @@ interface Result {
   title: string;
   comments: string;
   status: string;
+  // Slide numbers of results about particular slides
+  slides?: number[];
 }
 
 interface FileResult {
@@ -27,4 +31,31 @@ interface FileResult {
   results: Result[];
 }
 
-export type { Settings, SetSettings, Result, FileResult };
+interface Finding extends Result {
+  filename: string;
+  slides: number[];
+}
+
+interface FindingsPage {
+  findings: Finding[];
+  total: number;
+  next_cursor: number | null;
+}
+
+interface ProgressEvent {
+  filename: string | null;
+  stage: "received" | "parsed" | "extracted" | "checked" | "done" | "complete";
+  check: string | null;
+  slides: number | null;
+  elapsed: number;
+}
+
+export type {
+  Settings,
+  SetSettings,
+  Result,
+  FileResult,
+  Finding,
+  FindingsPage,
+  ProgressEvent,
+};
@@ -1,4 +1,5 @@
 import os
+import sys
 
 import pytest
 
@@ -11,3 +12,12 @@ if os.getenv("_PYTEST_RAISE", "0") != "0":
     @pytest.hookimpl(tryfirst=True)
     def pytest_internalerror(excinfo):
         raise excinfo.value
+
+
+@pytest.fixture(autouse=True)
+def reset_upload_rate_limits():
+    # Uploads of all tests come from the same test client, which would otherwise run out
+    # of its burst of uploads
+    main = sys.modules.get("backend.main")
+    if main is not None:
+        main.upload_scheduler.buckets.clear()
@@ -0,0 +1,173 @@
+import io
+import json
+import struct
+import zipfile
+
+import pytest
+from backend.main import app
+from backend.processing.archive import (
+    InvalidArchive,
+    iter_archive_members,
+    open_archive,
+)
+from backend.processing.result import Status
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+from fastapi.testclient import TestClient
+
+
+def make_archive(members: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def corrupt_member_data(content: bytes, name: str) -> bytes:
+    """
+    Returns the archive with an invalid deflate block type at the start of the
+    compressed data of a member.
+    """
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        offset = archive.getinfo(name).header_offset
+    name_length, extra_length = struct.unpack_from("<HH", content, offset + 26)
+    data_offset = offset + 30 + name_length + extra_length
+    return content[:data_offset] + b"\xff" + content[data_offset + 1 :]
+
+
+def test_iter_archive_members():
+    content = make_archive(
+        {
+            "term/a.pptx": b"a" * 10,
+            "term/notes.txt": b"notes",
+            "__MACOSX/term/._a.pptx": b"metadata",
+            "term/~$a.pptx": b"lock",
+            "term/b.pptx": b"b" * 100,
+            "term/c.pptx": b"c",
+        }
+    )
+    with open_archive(io.BytesIO(content)) as archive:
+        members = list(iter_archive_members(archive, max_file_bytes=50, max_files=2))
+    assert [member.filename for member in members] == [
+        "term/a.pptx",
+        "term/b.pptx",
+        "term/c.pptx",
+    ]
+    assert members[0].content == b"a" * 10 and members[0].rejection is None
+    assert members[1].content is None and "larger" in members[1].rejection
+    assert members[2].content is None and "2 decks" in members[2].rejection
+
+    with pytest.raises(InvalidArchive):
+        open_archive(io.BytesIO(b"not a zip file"))
+
+
+def test_archive_upload_streams_results_per_file():
+    content = make_archive(
+        {
+            "a.pptx": build_sample_presentation(),
+            "invalid.pptx": b"not a presentation",
+            "b.pptx": build_sample_presentation(selected_date="29 May 2022"),
+        }
+    )
+    data = {
+        "selected_date": SAMPLE_DATE,
+        "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+        "sermon_discussion_qns": SAMPLE_SERMON_DISCUSSION_QNS,
+    }
+    client = TestClient(app)
+    response = client.post(
+        "/api/archive/", data=data, files={"archive": ("term.zip", content)}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    file_results = [json.loads(line) for line in response.text.splitlines()]
+    assert [item["filename"] for item in file_results] == [
+        "a.pptx",
+        "invalid.pptx",
+        "b.pptx",
+    ]
+    statuses = [
+        {result["status"] for result in item["results"]} for item in file_results
+    ]
+    assert Status.ERROR.value not in statuses[0]
+    assert statuses[1] == {Status.ERROR.value}
+    assert Status.ERROR.value in statuses[2]
+
+    response = client.post(
+        "/api/archive/", data=data, files={"archive": ("term.zip", b"not a zip")}
+    )
+    assert response.status_code == 400
+
+
+def test_archive_upload_reports_corrupt_members():
+    corrupt = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(build_sample_presentation())) as source:
+        with zipfile.ZipFile(corrupt, "w") as target:
+            for item in source.infolist():
+                content = source.read(item)
+                if item.filename == "ppt/presentation.xml":
+                    # Passes the preflight, which only counts the slide IDs
+                    content = content.replace(b"<p:sldIdLst>", b"<not xml", 1)
+                target.writestr(item, content)
+    content = make_archive(
+        {
+            "a.pptx": build_sample_presentation(),
+            "corrupt.pptx": corrupt.getvalue(),
+            "b.pptx": build_sample_presentation(),
+        }
+    )
+    data = {
+        "selected_date": SAMPLE_DATE,
+        "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+        "sermon_discussion_qns": SAMPLE_SERMON_DISCUSSION_QNS,
+    }
+    client = TestClient(app)
+    response = client.post(
+        "/api/archive/", data=data, files={"archive": ("term.zip", content)}
+    )
+    file_results = [json.loads(line) for line in response.text.splitlines()]
+    assert [item["filename"] for item in file_results] == [
+        "a.pptx",
+        "corrupt.pptx",
+        "b.pptx",
+    ]
+    (result,) = file_results[1]["results"]
+    assert "not a valid .pptx file" in result["comments"]
+
+
+def test_archive_upload_reports_members_that_fail_to_decompress():
+    content = make_archive(
+        {
+            "a.pptx": build_sample_presentation(),
+            "corrupt.pptx": build_sample_presentation(),
+            "b.pptx": build_sample_presentation(),
+        }
+    )
+    content = corrupt_member_data(content, "corrupt.pptx")
+    with open_archive(io.BytesIO(content)) as archive:
+        members = list(iter_archive_members(archive, 10**8, 10))
+    assert [member.rejection is None for member in members] == [True, False, True]
+    assert "could not be extracted" in members[1].rejection
+
+    data = {
+        "selected_date": SAMPLE_DATE,
+        "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+        "sermon_discussion_qns": SAMPLE_SERMON_DISCUSSION_QNS,
+    }
+    client = TestClient(app)
+    response = client.post(
+        "/api/archive/", data=data, files={"archive": ("term.zip", content)}
+    )
+    file_results = [json.loads(line) for line in response.text.splitlines()]
+    assert [item["filename"] for item in file_results] == [
+        "a.pptx",
+        "corrupt.pptx",
+        "b.pptx",
+    ]
+    (result,) = file_results[1]["results"]
+    assert "could not be extracted" in result["comments"]
@@ -0,0 +1,123 @@
+import io
+import json
+import re
+import zipfile
+from pathlib import Path
+
+import pytest
+from backend.cli import check_presentations, find_presentations, main
+from backend.processing.result import Status
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+
+
+@pytest.fixture
+def archive(tmp_path: Path) -> Path:
+    (tmp_path / "2022").mkdir()
+    (tmp_path / "2022" / "22.05.pptx").write_bytes(build_sample_presentation())
+    (tmp_path / "2022" / "29.05.pptx").write_bytes(
+        build_sample_presentation(selected_date="29 May 2022")
+    )
+    (tmp_path / "2022" / "~$22.05.pptx").write_bytes(b"")
+    (tmp_path / "2022" / "notes.txt").write_text("")
+    return tmp_path
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> Path:
+    path = tmp_path / "service.json"
+    path.write_text(
+        json.dumps(
+            {
+                "selected_date": SAMPLE_DATE,
+                "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+                "sermon_discussion_qns": SAMPLE_SERMON_DISCUSSION_QNS,
+            }
+        )
+    )
+    return path
+
+
+def test_find_presentations(archive: Path):
+    expected = [archive / "2022" / "22.05.pptx", archive / "2022" / "29.05.pptx"]
+    assert find_presentations([str(archive)]) == expected
+    assert find_presentations([f"{archive}/**/22*.pptx"]) == expected[:1]
+
+
+def test_check_writes_json_lines_and_summary(
+    archive: Path, config: Path, tmp_path: Path
+):
+    output, summary = tmp_path / "results.jsonl", tmp_path / "summary.json"
+    exit_code = main(
+        [
+            "check",
+            str(archive),
+            "--config",
+            str(config),
+            "--workers",
+            "1",
+            "--output",
+            str(output),
+            "--summary",
+            str(summary),
+        ]
+    )
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert exit_code == 2
+    assert [line["filename"] for line in lines] == [
+        str(archive / "2022" / "22.05.pptx"),
+        str(archive / "2022" / "29.05.pptx"),
+    ]
+    assert json.loads(summary.read_text())["files_with_errors"] == [
+        str(archive / "2022" / "29.05.pptx")
+    ]
+
+
+def test_archive_ingest_stores_each_new_deck_once(
+    archive: Path, tmp_path: Path, capsys
+):
+    copy = archive / "copy of 22.05.pptx"
+    copy.write_bytes((archive / "2022" / "22.05.pptx").read_bytes())
+    store = tmp_path / "store"
+    arguments = ["archive", "--store", str(store), "ingest", str(archive)]
+    assert main(arguments) == 0
+    assert "Ingested 2 new decks; 2 decks in store." in capsys.readouterr().err
+    assert main(arguments) == 0
+    assert "Ingested 0 new decks; 2 decks in store." in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_check_reports_decks_whose_checks_raise(archive: Path, workers: int):
+    # Opens with python-pptx, but the first slide has no layout to extract
+    broken = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(build_sample_presentation())) as source:
+        with zipfile.ZipFile(broken, "w") as target:
+            for item in source.infolist():
+                content = source.read(item)
+                if item.filename == "ppt/slides/_rels/slide1.xml.rels":
+                    content = re.sub(
+                        rb"<Relationship [^>]*slideLayout\"[^>]*/>", b"", content
+                    )
+                target.writestr(item, content)
+    path = archive / "broken.pptx"
+    path.write_bytes(broken.getvalue())
+    config = {
+        "selected_date": SAMPLE_DATE,
+        "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+        "sermon_discussion_qns": SAMPLE_SERMON_DISCUSSION_QNS,
+    }
+
+    results = {
+        item["filename"]: item["results"]
+        for item in check_presentations(
+            find_presentations([str(archive)]), config, workers
+        )
+    }
+    assert len(results) == 3
+    (result,) = results[str(path)]
+    assert result["status"] == Status.ERROR
+    assert "KeyError" in result["comments"]
@@ -0,0 +1,80 @@
+import pytest
+from backend.cache import ResultCache, compute_etag, etag_matches
+from backend.compression import CompressionMiddleware, select_encoding
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+LARGE_BODY = b'{"title":"Check sermon discussion questions are as provided."}' * 100
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    def large() -> Response:
+        return Response(
+            LARGE_BODY, media_type="application/json", headers={"ETag": '"abc"'}
+        )
+
+    @app.get("/small")
+    def small() -> Response:
+        return Response(b"{}")
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(
+            iter([LARGE_BODY, LARGE_BODY]), media_type="application/x-ndjson"
+        )
+
+    return TestClient(app)
+
+
+def test_large_response_is_gzipped(client: TestClient):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert response.content == LARGE_BODY
+
+
+def test_small_response_is_not_compressed(client: TestClient):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.content == b"{}"
+
+
+def test_streaming_response_is_compressed_per_chunk(client: TestClient):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"}, params={})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == LARGE_BODY * 2
+
+
+def test_identity_when_not_accepted(client: TestClient):
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == LARGE_BODY
+
+
+def test_select_encoding_ignores_rejected_codings():
+    assert select_encoding("gzip;q=0, deflate") is None
+    assert select_encoding("deflate, GZIP") == "gzip"
+
+
+def test_etag_depends_on_every_input():
+    etag = compute_etag(["22 May 2022"], [("a.pptx", b"123")])
+    assert etag == compute_etag(["22 May 2022"], [("a.pptx", b"123")])
+    assert etag != compute_etag(["22 May 2022"], [("a.pptx", b"1234")])
+    assert etag != compute_etag(["22 May 202", "2"], [("a.pptx", b"123")])
+    assert etag_matches(f'W/{etag}, "other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(max_size=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+    assert "a" in cache and "c" in cache and "b" not in cache
@@ -0,0 +1,81 @@
+import io
+
+from backend.processing.checker.content import MultiContentChecker
+from backend.processing.result import Status
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_QUESTION_LINES,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+from backend.processing.text_model import TextModel, extract_text_model
+from pptx import Presentation as PresentationConstructor
+
+TITLE_PREFIX = "Check all decks uploaded together"
+
+
+def text_model(**kwargs) -> TextModel:
+    content = build_sample_presentation(**kwargs)
+    return extract_text_model(PresentationConstructor(io.BytesIO(content)))
+
+
+def consistency_results(text_models: dict[str, TextModel]) -> dict[str, list[str]]:
+    mcc = MultiContentChecker(
+        presentations={},
+        text_models=text_models,
+        req_order_of_service=SAMPLE_ORDER_OF_SERVICE,
+        selected_date=SAMPLE_DATE,
+        sermon_discussion_qns=SAMPLE_SERMON_DISCUSSION_QNS,
+    )
+    results = {}
+    for file_results in mcc.run():
+        results[file_results["filename"]] = [
+            result["comments"]
+            for result in file_results["results"]
+            if result["title"].startswith(TITLE_PREFIX)
+        ]
+        assert all(
+            result["status"] == Status.WARNING
+            for result in file_results["results"]
+            if result["title"].startswith(TITLE_PREFIX)
+        )
+    return results
+
+
+def test_consistent_decks_have_no_results():
+    results = consistency_results(
+        {"0830.pptx": text_model(), "1030.pptx": text_model(lyric_slides=2)}
+    )
+    assert results == {"0830.pptx": [], "1030.pptx": []}
+
+
+def test_deviating_deck_is_reported():
+    questions = [*SAMPLE_QUESTION_LINES[:-1], "A different question?"]
+    results = consistency_results(
+        {
+            "0830.pptx": text_model(),
+            "1030.pptx": text_model(),
+            "1700.pptx": text_model(
+                selected_date="29 May 2022", question_lines=questions
+            ),
+        }
+    )
+    assert results["0830.pptx"] == results["1030.pptx"] == []
+    assert results["1700.pptx"] == [
+        "Deviates in its date from 2 of 3 decks (0830.pptx, 1030.pptx). "
+        "Only in this deck: '29 May 2022'. Missing: '22 May 2022'.",
+        "Deviates in its sermon discussion questions from 2 of 3 decks (0830.pptx, 1030.pptx). "
+        f"Only in this deck: 'A different question?'. Missing: '{SAMPLE_QUESTION_LINES[-1]}'.",
+    ]
+
+
+def test_no_majority_reports_every_deck():
+    results = consistency_results(
+        {
+            "0830.pptx": text_model(),
+            "1700.pptx": text_model(selected_date="29 May 2022"),
+        }
+    )
+    assert [len(comments) for comments in results.values()] == [1, 1]
+    assert "Compare with 1700.pptx" in results["0830.pptx"][0]
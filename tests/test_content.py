@@ -4,7 +4,12 @@ we change the input to the tests rather than changing the slides.
 """
 
 import pytest
-from backend.processing.checker.content import ContentChecker
+from backend.processing.checker.content import (
+    ContentChecker,
+    DeckProfile,
+    MultiContentChecker,
+    parse_req_order_of_service,
+)
 from backend.processing.result import Status
 from pptx import Presentation as PresentationConstructor
 
@@ -162,11 +167,13 @@ class TestSermonDiscussionQnsAreAsProvided:
                 "title": "Check sermon discussion questions are as provided: Is there a typo?",
                 "status": Status.WARNING,
                 "comments": "On Slide 43, Expected: 'How have you been confrontedd with your own arrogance before God today? How have you been challenged to repent?'. Provided: 'How have you been confronted with your own arrogance before God today? How have you been challenged to repent?'. Similarity score = 99 of 100",
+                "slides": [43],
             },
             {
                 "title": "Check sermon discussion questions are as provided: Is there a typo?",
                 "status": Status.WARNING,
                 "comments": "On Slide 43, Expected: 'How has our passage been comforting if we are seeking to live for God in this anti-God world?'. Provided: 'How has our passage been a comfort if we are seeking to live for God in this anti-God world?'. Similarity score = 97 of 100",
+                "slides": [43],
             },
         ]
         assert expected == actual
@@ -185,12 +192,51 @@ class TestSermonDiscussionQnsAreAsProvided:
             {
                 "title": "Check sermon discussion questions are as provided.",
                 "status": Status.ERROR,
-                'comments': "On Slide 43, Expected: 'What was your view of God before hearing Daniel 2? How has God changed or expanded your view of him today?'. Could not find this required question."
+                'comments': "On Slide 43, Expected: 'What was your view of God before hearing Daniel 2? How has God changed or expanded your view of him today?'. Could not find this required question.",
+                "slides": [43],
             },
             {
                 "title": "Check sermon discussion questions are as provided.",
                 "status": Status.ERROR,
-                'comments': "On Slide 43, Expected: 'How has today's passage helped you to be more confident about God's coming kingdom? What would that confidence look like in practice for you personally?'. Could not find this required question."
+                'comments': "On Slide 43, Expected: 'How has today's passage helped you to be more confident about God's coming kingdom? What would that confidence look like in practice for you personally?'. Could not find this required question.",
+                "slides": [43],
             },
         ]
         assert expected == actual
+
+
+def test_parsed_inputs_are_shared_across_checkers(
+    order_of_service_without_declaration: str, sermon_discussion_qns: str
+):
+    parsed = parse_req_order_of_service(order_of_service_without_declaration)
+    assert parsed is parse_req_order_of_service(order_of_service_without_declaration)
+    assert parsed[0] == ("Opening Song", "Behold Our God")
+
+    mcc = MultiContentChecker(
+        presentations={"a.pptx": None, "b.pptx": None},  # type: ignore
+        req_order_of_service=order_of_service_without_declaration,
+        selected_date="22 May 2022",
+        sermon_discussion_qns=sermon_discussion_qns,
+    )
+    a, b = mcc.checkers.values()
+    assert a.filtered_req_order_of_service is b.filtered_req_order_of_service is parsed
+    assert a.cleaned_sermon_discussion_qns is b.cleaned_sermon_discussion_qns
+    assert len(a.cleaned_sermon_discussion_qns) == 2
+
+
+def test_other_decks_get_a_single_result(
+    order_of_service_without_declaration: str, sermon_discussion_qns: str
+):
+    cc = ContentChecker(
+        file_path="kids.pptx",
+        presentation=None,
+        req_order_of_service=order_of_service_without_declaration,
+        selected_date="22 May 2022",
+        sermon_discussion_qns=sermon_discussion_qns,
+        text_model={1: ["Kids' Church", "22 May 2022"], 2: ["Memory verse"]},
+    )
+    assert cc.profile == DeckProfile(order_of_service_slides=0, dates=1)
+    (result,) = cc.run()
+    assert result["title"] == "Check file is a service deck."
+    assert result["status"] == Status.ERROR
+    assert "Provided: 0 slide(s) and 1 date(s) found." in result["comments"]
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+from backend.processing.encoder import encode_file_results
+from backend.processing.result import FileResults, Status
+from fastapi.encoders import jsonable_encoder
+
+
+@pytest.fixture
+def file_results() -> list[FileResults]:
+    return [
+        {
+            "filename": "22.05 (10.30am) service slides.pptx",
+            "results": [
+                {
+                    "title": "Check section headers are in the correct order: Is there a typo?",
+                    "status": Status.WARNING,
+                    "comments": "On Slide 3, Expected: 'Hearing God’s Word Read – Daniel 5'. Provided: 'Hearing God‘s Word Read – Daniel 5'.",
+                    "slides": [3],
+                },
+                {
+                    "title": "Check sermon discussion questions are as provided.",
+                    "status": Status.PASS,
+                    "comments": 'All "sermon discussion questions" are present.\n',
+                },
+            ],
+        },
+        {"filename": "empty.pptx", "results": []},
+    ]
+
+
+def test_encode_file_results_matches_generic_encoder(file_results):
+    actual = json.loads(encode_file_results(file_results))
+    expected = jsonable_encoder(file_results)
+    assert expected == actual
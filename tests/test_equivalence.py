@@ -0,0 +1,50 @@
+import sys
+
+from backend.bench.equivalence import (
+    Case,
+    check_presentations,
+    compare,
+    diff_file_results,
+    main,
+    make_cases,
+)
+from backend.processing.result import FileResults, Status
+
+
+def drop_last_result(case: Case) -> list[FileResults]:
+    return [
+        {"filename": item["filename"], "results": item["results"][:-1]}
+        for item in check_presentations(case)
+    ]
+
+
+def test_diff_file_results_reports_the_first_difference_of_each_file():
+    result = {"title": "Date", "comments": "Fine", "status": Status.PASS}
+    error = {"title": "Date", "comments": "On slide 1", "status": Status.ERROR}
+    expected: list[FileResults] = [
+        {"filename": "a.pptx", "results": [result, result]},
+        {"filename": "b.pptx", "results": [result]},
+    ]
+    assert diff_file_results("case", expected, expected) == []
+
+    actual: list[FileResults] = [
+        {"filename": "a.pptx", "results": [result, error]},
+        {"filename": "c.pptx", "results": [result]},
+    ]
+    first, second = diff_file_results("case", expected, actual)
+    assert (first.filename, first.index) == ("a.pptx", 1)
+    assert first.expected == result and first.actual == error
+    assert (second.filename, second.index) == ("b.pptx", -1)
+
+
+def test_broken_engine_is_reported(monkeypatch, capsys):
+    report = compare(make_cases(2, seed=0), {"broken": drop_last_result})
+    assert report["cases"] == 2
+    assert report["engines"]["broken"]["mismatched_files"] == report["decks"]
+
+    engine = f"{__name__}:drop_last_result"
+    monkeypatch.setattr(
+        sys, "argv", ["equivalence", "--cases", "2", "--engine", engine]
+    )
+    assert main() == 1
+    assert "mismatched files" in capsys.readouterr().out
@@ -0,0 +1,119 @@
+import io
+
+import backend.main
+from backend.processing.checker.content import MultiContentChecker
+from backend.processing.findings import FindingsIndex
+from backend.processing.result import Status
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    SAMPLE_SLIDE_ORDER_OF_SERVICE,
+    build_sample_presentation,
+)
+from backend.processing.text_model import extract_text_model
+from fastapi.testclient import TestClient
+from pptx import Presentation as PresentationConstructor
+
+
+def test_findings_are_indexed_by_the_slide_numbers_of_the_checks():
+    order_of_service = [
+        "Family Confession (Slide 17 & 18)" if item == "Family Confession" else item
+        for item in SAMPLE_SLIDE_ORDER_OF_SERVICE
+    ]
+    content = build_sample_presentation(
+        selected_date="29 May 2022", order_of_service=order_of_service
+    )
+    text_model = extract_text_model(PresentationConstructor(io.BytesIO(content)))
+    (file_results,) = MultiContentChecker(
+        presentations={},
+        text_models={"sample.pptx": text_model},
+        selected_date=SAMPLE_DATE,
+        req_order_of_service=SAMPLE_ORDER_OF_SERVICE,
+        sermon_discussion_qns=SAMPLE_SERMON_DISCUSSION_QNS,
+    ).run()
+    index = FindingsIndex([file_results])
+
+    # The date check writes "On slide 1"
+    (date,) = index.query(slides=range(1, 2)).findings
+    assert date.comments.startswith("On slide 1,") and date.slides == (1,)
+    # Slide numbers quoted from the service plan are not slides of the deck
+    order = index.query(statuses=[Status.ERROR], slides=range(2, 10)).findings
+    assert order and all("(Slide 17 & 18)" in finding.comments for finding in order)
+    assert index.query(slides=range(17, 19)).total == 0
+
+
+def test_findings_index_filters_and_pages():
+    index = FindingsIndex(
+        [
+            {
+                "filename": "a.pptx",
+                "results": [
+                    {
+                        "title": "Q",
+                        "comments": f"On Slide {i}",
+                        "status": Status.ERROR,
+                        "slides": [i],
+                    }
+                    for i in range(1, 31)
+                ]
+                + [{"title": "Date", "comments": "Fine", "status": Status.PASS}],
+            },
+            {
+                "filename": "b.pptx",
+                "results": [
+                    {
+                        "title": "Q",
+                        "comments": "On Slide 15",
+                        "status": Status.WARNING,
+                        "slides": [15],
+                    }
+                ],
+            },
+        ]
+    )
+    page = index.query(statuses=[Status.ERROR], slides=range(10, 21), limit=4)
+    assert page.total == 11
+    assert [finding.slides for finding in page.findings] == [(10,), (11,), (12,), (13,)]
+
+    slides = []
+    cursor = None
+    while True:
+        page = index.query(slides=range(10, 21), cursor=cursor, limit=4)
+        slides.extend(finding.slides[0] for finding in page.findings)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert slides == [*range(10, 21), 15]
+
+    (finding,) = index.query(filenames=["b.pptx"]).findings
+    assert finding.status == Status.WARNING
+    assert index.query(titles=["Date"], slides=range(1, 100)).total == 0
+    assert index.query(titles=["Date", "Q"]).total == 32
+
+
+def test_findings_of_cached_results_are_served():
+    client = TestClient(backend.main.app)
+    data = {
+        "selected_date": SAMPLE_DATE,
+        "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+        "sermon_discussion_qns": SAMPLE_SERMON_DISCUSSION_QNS,
+    }
+    files = [("files", ("sample.pptx", build_sample_presentation()))]
+    response = client.post("/api/upload/", data=data, files=files)
+    results_id = response.headers["etag"].removeprefix("W/").strip('"')
+    (file_results,) = response.json()
+
+    url = f"/api/results/{results_id}/findings"
+    findings = client.get(url, params={"limit": 2}).json()
+    assert findings["total"] == len(file_results["results"])
+    assert [finding["title"] for finding in findings["findings"]] == [
+        result["title"] for result in file_results["results"][:2]
+    ]
+    params = {"status": "pass", "cursor": findings["next_cursor"]}
+    passes = client.get(url, params=params).json()["findings"]
+    assert passes and all(finding["status"] == 0 for finding in passes)
+
+    assert client.get(url, params={"status": "bad"}).status_code == 400
+    assert client.get(url, params={"slides": "x-2"}).status_code == 400
+    assert client.get("/api/results/unknown/findings").status_code == 404
@@ -0,0 +1,100 @@
+import asyncio
+import hashlib
+import io
+import time
+
+import anyio
+import backend.main
+from backend.ingest import receive_uploads
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+
+
+def test_receive_uploads_hashes_files_in_upload_order():
+    contents = [b"x" * 3_000_000, b"small", b"y" * 12]
+    files = [
+        UploadFile(io.BytesIO(content), filename=f"{i}.pptx")
+        for i, content in enumerate(contents)
+    ]
+    finished = []
+    received = asyncio.run(
+        receive_uploads(files, 10, lambda file: finished.append(file.filename))
+    )
+    assert sorted(finished) == ["0.pptx", "1.pptx", "2.pptx"]
+    assert [file.filename for file in received] == ["0.pptx", "1.pptx", "2.pptx"]
+    assert received[0].content is None and "larger" in received[0].rejection
+    assert received[1].content == b"small"
+    assert received[1].content_hash == hashlib.sha256(b"small").hexdigest()
+    assert received[2].rejection is not None
+
+
+def test_identical_files_are_parsed_once(monkeypatch):
+    parsed = []
+
+    def parse_content(content: bytes) -> backend.main.ParsedFile:
+        parsed.append(content)
+        return original_parse_content(content)
+
+    original_parse_content = backend.main.parse_content
+    monkeypatch.setattr(backend.main, "parse_content", parse_content)
+    content = build_sample_presentation()
+    data = {
+        "selected_date": SAMPLE_DATE,
+        "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+        # Distinct from the other tests, so that it is not served from the result cache
+        "sermon_discussion_qns": f"{SAMPLE_SERMON_DISCUSSION_QNS}\n9.",
+    }
+    files = [
+        ("files", ("a.pptx", content)),
+        ("files", ("invalid.pptx", b"not a presentation")),
+        ("files", ("b.pptx", content)),
+    ]
+    client = TestClient(backend.main.app)
+    response = client.post("/api/upload/", data=data, files=files)
+
+    assert response.is_success
+    assert sorted(parsed) == sorted([content, b"not a presentation"])
+    a, invalid, b = response.json()
+    assert [a["filename"], invalid["filename"], b["filename"]] == [
+        "a.pptx",
+        "invalid.pptx",
+        "b.pptx",
+    ]
+    assert a["results"] == b["results"]
+    assert "not a valid .pptx" in invalid["results"][0]["comments"]
+
+
+def test_parses_are_cancelled_when_served_from_the_cache(monkeypatch):
+    parsed = []
+
+    def parse_content(content: bytes) -> backend.main.ParsedFile:
+        parsed.append(content)
+        time.sleep(0.2)
+        return original_parse_content(content)
+
+    original_parse_content = backend.main.parse_content
+    data = {
+        "selected_date": SAMPLE_DATE,
+        "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+        "sermon_discussion_qns": f"{SAMPLE_SERMON_DISCUSSION_QNS}\n10.",
+    }
+    files = [
+        ("files", (f"{i}.pptx", build_sample_presentation(lyric_slides=i)))
+        for i in range(3)
+    ]
+    # The event loop of the client outlives the requests, as that of the server does
+    with TestClient(backend.main.app) as client:
+        assert client.post("/api/upload/", data=data, files=files).is_success
+
+        monkeypatch.setattr(backend.main, "parse_content", parse_content)
+        monkeypatch.setattr(backend.main, "parse_limiter", anyio.CapacityLimiter(1))
+        assert client.post("/api/upload/", data=data, files=files).is_success
+        time.sleep(1)
+    # Only a parse that had started before the cache hit may have run
+    assert len(parsed) <= 1
@@ -0,0 +1,132 @@
+import io
+import struct
+import zipfile
+
+import pytest
+import backend.main
+from backend.limits import LimitExceeded, RequestSizeLimitMiddleware, read_with_limit
+from backend.processing.checker.content import MultiContentChecker
+from backend.processing.preflight import (
+    InvalidPresentation,
+    check_presentation_limits,
+    inspect_presentation,
+)
+from backend.processing.result import Status
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi.testclient import TestClient
+from pptx import Presentation as PresentationConstructor
+
+
+def test_inspect_presentation_counts_slides():
+    content = build_sample_presentation(lyric_slides=1)
+    info = inspect_presentation(io.BytesIO(content))
+    slides = PresentationConstructor(io.BytesIO(content)).slides
+    assert info.slide_count == len(slides) == 12
+    assert info.compressed_size < info.uncompressed_size
+    assert check_presentation_limits(info, 12, info.uncompressed_size) is None
+    assert "11" in check_presentation_limits(info, 11, info.uncompressed_size)
+
+
+def test_inspect_presentation_rejects_other_files():
+    with pytest.raises(InvalidPresentation):
+        inspect_presentation(io.BytesIO(b"not a zip file"))
+
+
+def test_corrupt_presentation_part_is_rejected():
+    content = build_sample_presentation()
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        offset = archive.getinfo("ppt/presentation.xml").header_offset
+    name_length, extra_length = struct.unpack_from("<HH", content, offset + 26)
+    data_offset = offset + 30 + name_length + extra_length
+    # An invalid deflate block type at the start of the compressed part
+    content = content[:data_offset] + b"\xff" + content[data_offset + 1 :]
+    with pytest.raises(InvalidPresentation):
+        inspect_presentation(io.BytesIO(content))
+
+    data = {
+        "selected_date": SAMPLE_DATE,
+        "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+        "sermon_discussion_qns": SAMPLE_SERMON_DISCUSSION_QNS,
+    }
+    client = TestClient(backend.main.app)
+    response = client.post(
+        "/api/upload/", data=data, files=[("files", ("corrupt.pptx", content))]
+    )
+    assert response.status_code == 200
+    ((result,),) = [item["results"] for item in response.json()]
+    assert "not a valid .pptx file" in result["comments"]
+
+
+def test_read_with_limit():
+    assert read_with_limit(io.BytesIO(b"12345"), 5) == b"12345"
+    with pytest.raises(LimitExceeded):
+        read_with_limit(io.BytesIO(b"123456"), 5)
+
+
+def test_request_size_limit_middleware():
+    app = FastAPI()
+    app.add_middleware(RequestSizeLimitMiddleware, paths=("/upload",), max_bytes=10)
+
+    @app.post("/upload")
+    async def upload(request: Request) -> int:
+        return len(await request.body())
+
+    client = TestClient(app)
+    assert client.post("/upload", content=b"x" * 10).json() == 10
+    assert client.post("/upload", content=b"x" * 11).status_code == 413
+
+    def chunked_body():
+        # Streamed without a Content-Length header
+        yield b"x" * 8
+        yield b"x" * 8
+
+    assert client.post("/upload", content=chunked_body()).status_code == 413
+
+
+def test_request_size_limit_middleware_on_form_endpoint():
+    app = FastAPI()
+    app.add_middleware(RequestSizeLimitMiddleware, paths=("/upload",), max_bytes=2000)
+
+    @app.post("/upload")
+    async def upload(name: str = Form(...), file: UploadFile = File(...)) -> int:
+        return len(await file.read())
+
+    def multipart_body(size: int):
+        # Streamed without a Content-Length header, so the form parser sees the overflow
+        yield (
+            b"--boundary\r\n"
+            b'Content-Disposition: form-data; name="name"\r\n\r\ndeck\r\n'
+            b"--boundary\r\n"
+            b'Content-Disposition: form-data; name="file"; filename="a.pptx"\r\n'
+            b"Content-Type: application/octet-stream\r\n\r\n"
+        )
+        for _ in range(size // 500):
+            yield b"x" * 500
+        yield b"\r\n--boundary--\r\n"
+
+    client = TestClient(app)
+    headers = {"content-type": "multipart/form-data; boundary=boundary"}
+    response = client.post("/upload", content=multipart_body(1000), headers=headers)
+    assert response.json() == 1000
+    response = client.post("/upload", content=multipart_body(5000), headers=headers)
+    assert response.status_code == 413
+
+
+def test_time_budget_returns_partial_results():
+    presentation = PresentationConstructor(io.BytesIO(build_sample_presentation()))
+    mcc = MultiContentChecker(
+        presentations={"sample.pptx": presentation},
+        req_order_of_service=SAMPLE_ORDER_OF_SERVICE,
+        selected_date=SAMPLE_DATE,
+        sermon_discussion_qns=SAMPLE_SERMON_DISCUSSION_QNS,
+        time_budget=-1,
+    )
+    (results,) = mcc.run()[0]["results"]
+    assert results["status"] == Status.TIMEOUT
+    assert "check_existence_of_section_headers" in results["comments"]
@@ -0,0 +1,61 @@
+import io
+
+import pytest
+from backend.processing.checker.content import ContentChecker
+from backend.processing.normalize import normalize_text
+from backend.processing.result import Status
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    SAMPLE_SLIDE_ORDER_OF_SERVICE,
+    build_sample_presentation,
+)
+from pptx import Presentation as PresentationConstructor
+
+
+def cc_factory(closing_song: str, selected_date: str = SAMPLE_DATE) -> ContentChecker:
+    order_of_service = [
+        closing_song if item.startswith("Closing Song") else item
+        for item in SAMPLE_SLIDE_ORDER_OF_SERVICE
+    ]
+    content = build_sample_presentation(
+        selected_date=selected_date, order_of_service=order_of_service
+    )
+    return ContentChecker(
+        file_path="sample.pptx",
+        presentation=PresentationConstructor(io.BytesIO(content)),
+        req_order_of_service=SAMPLE_ORDER_OF_SERVICE,
+        selected_date=SAMPLE_DATE,
+        sermon_discussion_qns=SAMPLE_SERMON_DISCUSSION_QNS,
+    )
+
+
+def test_repeated_findings_are_reported_once():
+    cc = cc_factory("Closing Song – Only a Holy Gd")
+    (result,) = cc.check_section_headers_have_correct_order()
+    assert result["status"] == Status.WARNING
+    assert result["comments"].startswith(
+        "On Slides 2, 3, 4, 5, 6, 7, 8 and 9, Expected: 'Closing Song – Only a Holy God'."
+    )
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("  Hearing God\u2018s  Word_Read ", "Hearing God\u2019s Word Read"),
+        ("Closing Song - Only a Holy God", "Closing Song \u2013 Only a Holy God"),
+        ("Closing Song \u2014 Only a Holy God", "Closing Song \u2013 Only a Holy God"),
+        ("Cafe\u0301", "Caf\u00e9"),
+    ],
+)
+def test_normalize_text(text: str, expected: str):
+    assert normalize_text(text) == expected
+
+
+def test_checks_compare_normalized_text():
+    cc = cc_factory("Closing Song - Only a  Holy God", selected_date="22 May\u00a02022")
+    assert [r["status"] for r in cc.check_section_headers_have_correct_order()] == [
+        Status.PASS
+    ]
+    assert [r["status"] for r in cc.check_all_dates_are_as_provided()] == [Status.PASS]
@@ -0,0 +1,55 @@
+import backend.main
+from backend.processing.template import TemplatePool
+from backend.profiling import MemoryProfiler
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+from fastapi.testclient import TestClient
+
+
+def test_memory_profile_is_only_served_when_enabled():
+    client = TestClient(backend.main.app)
+    assert client.get("/api/debug/memory").status_code == 404
+
+
+def upload(client: TestClient, i: int) -> None:
+    data = {
+        "selected_date": SAMPLE_DATE,
+        "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+        # Distinct requests, so that none is served from the result cache
+        "sermon_discussion_qns": f"{SAMPLE_SERMON_DISCUSSION_QNS}\n{i + 3}.",
+    }
+    content = build_sample_presentation(lyric_slides=i)
+    files = [("files", (f"deck-{i}.pptx", content))]
+    assert client.post("/api/upload/", data=data, files=files).is_success
+
+
+def test_memory_is_released_after_uploads(monkeypatch):
+    profiler = MemoryProfiler()
+    monkeypatch.setattr(backend.main, "memory_profiler", profiler)
+    # The parts of each distinct deck would otherwise be held on to by the pool
+    monkeypatch.setattr(backend.main, "template_pool", TemplatePool(max_size=0))
+    client = TestClient(backend.main.app)
+    # Initializes modules and caches, which are expected to be held on to
+    upload(client, 0)
+    profiler.start()
+    try:
+        for i in range(1, 4):
+            upload(client, i)
+        report = client.get("/api/debug/memory").json()
+    finally:
+        profiler.stop()
+
+    uploads = report["uploads"]
+    assert [profile["label"] for profile in uploads] == [
+        f"deck-{i}.pptx" for i in range(1, 4)
+    ]
+    # Presentations, text models and checkers are not held on to after uploads
+    for profile in uploads:
+        assert list(profile["stages"]) == ["parse", "check"]
+        parse = profile["stages"]["parse"]
+        assert parse["peak_bytes"] > 100_000
+        assert profile["retained"]["size_diff"] < parse["peak_bytes"] / 10
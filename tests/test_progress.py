@@ -0,0 +1,58 @@
+import asyncio
+
+from backend.main import app
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+from backend.progress import ProgressBroker
+from fastapi.testclient import TestClient
+
+
+def test_progress_broker_only_reports_to_subscribed_jobs():
+    broker = ProgressBroker(max_queued_events=2)
+
+    async def main() -> list[dict]:
+        assert broker.reporter("job") is None
+        async with broker.subscribe("job") as events:
+            reporter = broker.reporter("job")
+            for stage in ("received", "parsed", "extracted"):
+                reporter.report("a.pptx", stage)
+            await asyncio.sleep(0)
+            received = [events.get_nowait() for _ in range(events.qsize())]
+        assert broker.subscribers == {}
+        return received
+
+    received = asyncio.run(main())
+    # Events beyond the queue size are dropped instead of piling up
+    assert [event["stage"] for event in received] == ["received", "parsed"]
+    assert received[0]["filename"] == "a.pptx"
+
+
+def test_upload_reports_progress_to_channel():
+    data = {
+        "selected_date": SAMPLE_DATE,
+        "req_order_of_service": SAMPLE_ORDER_OF_SERVICE,
+        "sermon_discussion_qns": SAMPLE_SERMON_DISCUSSION_QNS,
+        "job_id": "test-job",
+    }
+    files = [("files", ("a.pptx", build_sample_presentation(lyric_slides=1)))]
+    with TestClient(app) as client:
+        with client.websocket_connect("/api/progress/test-job") as websocket:
+            response = client.post("/api/upload/", data=data, files=files)
+            assert response.status_code == 200
+            events = []
+            while not events or events[-1]["stage"] != "complete":
+                events.append(websocket.receive_json())
+
+    stages = [event["stage"] for event in events]
+    assert stages[:3] == ["received", "parsed", "extracted"]
+    assert stages[-2:] == ["done", "complete"]
+    checks = [event["check"] for event in events if event["stage"] == "checked"]
+    assert checks[0] == "check_existence_of_section_headers"
+    assert len(checks) == 5
+    assert {event["slides"] for event in events[1:-1]} == {12}
+    elapsed = [event["elapsed"] for event in events]
+    assert elapsed == sorted(elapsed)
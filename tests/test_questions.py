@@ -0,0 +1,88 @@
+import io
+
+import pytest
+from backend.processing.checker.content import ContentChecker, LineIndex
+from backend.processing.normalize import NormalizedText
+from backend.processing.result import Status
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_QUESTION_LINES,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+from pptx import Presentation as PresentationConstructor
+
+
+def cc_factory(content: bytes, sermon_discussion_qns: str) -> ContentChecker:
+    return ContentChecker(
+        file_path="sample.pptx",
+        presentation=PresentationConstructor(io.BytesIO(content)),
+        req_order_of_service=SAMPLE_ORDER_OF_SERVICE,
+        selected_date=SAMPLE_DATE,
+        sermon_discussion_qns=sermon_discussion_qns,
+    )
+
+
+@pytest.fixture
+def split_questions_content() -> bytes:
+    # The second question continues on another sermon discussion slide
+    return build_sample_presentation(
+        question_lines=SAMPLE_QUESTION_LINES[:1],
+        extra_slides=[["Sermon discussion questions", SAMPLE_QUESTION_LINES[1]]],
+    )
+
+
+def test_questions_spread_across_slides(split_questions_content: bytes):
+    cc = cc_factory(split_questions_content, SAMPLE_SERMON_DISCUSSION_QNS)
+    actual = cc.check_sermon_discussion_qns_are_as_provided()
+    assert [result["status"] for result in actual] == [Status.PASS]
+
+
+def test_typo_reports_slide_of_matching_line(split_questions_content: bytes):
+    sermon_discussion_qns = SAMPLE_SERMON_DISCUSSION_QNS.replace(
+        "a comfort", "comforting"
+    )
+    cc = cc_factory(split_questions_content, sermon_discussion_qns)
+    (actual,) = cc.check_sermon_discussion_qns_are_as_provided()
+    assert actual["status"] == Status.WARNING
+    assert actual["comments"].startswith("On Slide 11, Expected")
+
+
+def test_whitespace_variants_of_questions_are_exact_matches():
+    # Lines are compared in normalized form, so spacing differences are not typos
+    question_lines = [
+        SAMPLE_QUESTION_LINES[0].replace(" ", "  ", 1),
+        SAMPLE_QUESTION_LINES[1] + " ",
+    ]
+    content = build_sample_presentation(question_lines=question_lines)
+    cc = cc_factory(content, SAMPLE_SERMON_DISCUSSION_QNS)
+    actual = cc.check_sermon_discussion_qns_are_as_provided()
+    assert [result["status"] for result in actual] == [Status.PASS]
+
+
+def test_missing_question_lists_all_discussion_slides(split_questions_content: bytes):
+    cc = cc_factory(split_questions_content, "1. What is the gospel?")
+    (actual,) = cc.check_sermon_discussion_qns_are_as_provided()
+    assert actual["status"] == Status.ERROR
+    assert actual["comments"].startswith("On Slides 10 and 11, Expected")
+
+
+def test_no_discussion_slide():
+    content = build_sample_presentation(question_lines=[])
+    cc = cc_factory(content, SAMPLE_SERMON_DISCUSSION_QNS)
+    cc.sermon_discussion_slides.clear()
+    actual = cc.check_sermon_discussion_qns_are_as_provided()
+    assert [result["status"] for result in actual] == [Status.ERROR, Status.ERROR]
+
+
+def test_line_index():
+    index = LineIndex(
+        [
+            (1, NormalizedText("Welcome  to church ")),
+            (2, NormalizedText("How are you today?")),
+        ]
+    )
+    assert NormalizedText("Welcome to church") in index
+    assert index.candidates("how are you today") == [(2, "How are you today?")]
+    assert index.candidates("goodbye") == []
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from backend.ratelimit import (
+    FairScheduler,
+    RateLimited,
+    RateLimitMiddleware,
+    TokenBucket,
+    get_client,
+)
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=0.5, capacity=2, now=0)
+    assert bucket.take(now=0) is None
+    assert bucket.take(now=0) is None
+    assert bucket.take(now=0) == pytest.approx(2)
+    assert bucket.take(now=2) is None
+    assert bucket.is_full(now=6)
+
+
+def test_free_slots_are_shared_between_clients():
+    scheduler = FairScheduler(
+        rate=100,
+        burst=10,
+        max_concurrency=1,
+        max_queue_depth=10,
+        max_queue_depth_per_client=2,
+    )
+    order = []
+
+    async def main() -> None:
+        gate = asyncio.Event()
+
+        async def request(client: str, name: str) -> None:
+            async with scheduler.slot(client):
+                order.append(name)
+                await gate.wait()
+
+        tasks = [asyncio.create_task(request("a", f"a{i}")) for i in range(3)]
+        tasks.append(asyncio.create_task(request("b", "b0")))
+        await asyncio.sleep(0)
+        with pytest.raises(RateLimited):
+            async with scheduler.slot("a"):
+                pass
+        gate.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert order == ["a0", "a1", "b0", "a2"]
+    metrics = scheduler.metrics()
+    assert (metrics["running"], metrics["queued"], metrics["admitted"]) == (0, 0, 4)
+    assert metrics["rejected"] == 1
+
+
+def test_rate_limit_middleware():
+    app = FastAPI()
+    scheduler = FairScheduler(
+        rate=0.01,
+        burst=1,
+        max_concurrency=1,
+        max_queue_depth=1,
+        max_queue_depth_per_client=1,
+    )
+    app.add_middleware(RateLimitMiddleware, paths=("/upload",), scheduler=scheduler)
+
+    @app.post("/upload")
+    async def upload() -> str:
+        return "checked"
+
+    client = TestClient(app)
+    assert client.post("/upload").json() == "checked"
+    response = client.post("/upload")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "100"
+
+
+def test_spoofed_forwarded_addresses_are_ignored():
+    app = FastAPI()
+    scheduler = FairScheduler(
+        rate=0.01,
+        burst=1,
+        max_concurrency=1,
+        max_queue_depth=1,
+        max_queue_depth_per_client=1,
+    )
+    app.add_middleware(
+        RateLimitMiddleware,
+        paths=("/upload",),
+        scheduler=scheduler,
+        client_header="X-Forwarded-For",
+    )
+
+    @app.post("/upload")
+    async def upload() -> str:
+        return "checked"
+
+    client = TestClient(app)
+    # The proxy appends the address of the client to whatever the client sent
+    headers = {"X-Forwarded-For": "10.0.0.1, 203.0.113.7"}
+    assert client.post("/upload", headers=headers).json() == "checked"
+    headers = {"X-Forwarded-For": "10.0.0.2, 203.0.113.7"}
+    assert client.post("/upload", headers=headers).status_code == 429
+    headers = {"X-Forwarded-For": "10.0.0.2, 198.51.100.1"}
+    assert client.post("/upload", headers=headers).json() == "checked"
+    assert (
+        get_client(
+            {
+                "type": "http",
+                "headers": [(b"x-forwarded-for", b"1.1.1.1, 2.2.2.2, 3.3.3.3")],
+            },
+            "X-Forwarded-For",
+            trusted_proxies=2,
+        )
+        == "2.2.2.2"
+    )
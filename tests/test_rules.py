@@ -0,0 +1,60 @@
+import pytest
+from backend.processing.checker.content import (
+    ContentChecker,
+    parse_req_order_of_service,
+)
+from backend.processing.rules import CompiledRules, InvalidRules, get_rules
+from backend.processing.sample import (
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+)
+
+
+def test_default_rules():
+    rules = get_rules()
+    assert rules.section_title("Bible Reading") == "Hearing God’s Word Read"
+    # Aliases are looked up in normalized form
+    assert rules.section_title("Bible\u00a0Reading") == "Hearing God’s Word Read"
+    assert rules.section_title("Family Prayer") == "Family Prayer"
+    assert rules.is_excluded("Closing Words")
+    assert not rules.is_excluded("Closing Song")
+    assert rules.commented_item.match("Hearing God's Word Read – Daniel 5")
+    assert rules.commented_item.match("Opening Song – Behold Our God")
+    assert not rules.commented_item.match("Family Prayer")
+    assert rules.date.match("22 May 2022") and rules.date.match("01-Jan-2022")
+
+
+def test_rules_of_other_services():
+    rules = CompiledRules(
+        {
+            "sections": [
+                {"title": "Call to Worship", "aliases": ["Welcome"]},
+                {"title": "Hymn", "has_comments": True},
+                {"title": "Announcements", "excluded": True},
+            ],
+            "date_formats": ["\\d+ [A-Za-z]+ \\d+", "\\d{4}-\\d{2}-\\d{2}"],
+        }
+    )
+    parsed = parse_req_order_of_service(
+        "Welcome\t1\t\nHymn\t4\tAmazing Grace\nAnnouncements\t2\t", rules
+    )
+    assert parsed == (("Call to Worship", ""), ("Hymn", "Amazing Grace"))
+    assert rules.commented_item.match("Hymn – Amazing Grace")
+
+    cc = ContentChecker(
+        file_path="a.pptx",
+        presentation=None,
+        req_order_of_service=SAMPLE_ORDER_OF_SERVICE,
+        selected_date="2022-05-22",
+        sermon_discussion_qns=SAMPLE_SERMON_DISCUSSION_QNS,
+        text_model={1: ["2022-05-22", "Welcome"], 2: ["22 May 2022"]},
+        rules=rules,
+    )
+    assert cc.dates == [(1, "2022-05-22"), (2, "22 May 2022")]
+
+
+def test_invalid_rules():
+    with pytest.raises(InvalidRules):
+        CompiledRules({"sections": [{"aliases": ["Sermon"]}], "date_formats": ["x"]})
+    with pytest.raises(InvalidRules):
+        CompiledRules({"sections": [], "date_formats": ["(unclosed"]})
@@ -0,0 +1,96 @@
+import asyncio
+import gzip
+import threading
+from pathlib import Path
+
+import backend.static
+import pytest
+from backend.static import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    StaticAssets,
+    precompress_directory,
+)
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+SCRIPT = b"console.log('tcc slides checker');\n" * 100
+
+
+def respond(assets: StaticAssets, path: str, headers: Headers) -> Response:
+    return asyncio.run(assets.response(path, headers))
+
+
+@pytest.fixture
+def static_assets(tmp_path: Path) -> StaticAssets:
+    (tmp_path / "_next" / "static" / "chunks").mkdir(parents=True)
+    (tmp_path / "_next" / "static" / "chunks" / "main-0a1b2c.js").write_bytes(SCRIPT)
+    (tmp_path / "index.html").write_bytes(b"<html></html>")
+    (tmp_path / "favicon.ico").write_bytes(bytes(range(256)) * 8)
+    assets = StaticAssets(tmp_path, minimum_size=1024)
+    assets.load()
+    return assets
+
+
+def test_hashed_asset_is_served_precompressed(static_assets: StaticAssets):
+    response = respond(
+        static_assets,
+        "_next/static/chunks/main-0a1b2c.js",
+        Headers({"accept-encoding": "gzip"}),
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert gzip.decompress(response.body) == SCRIPT
+
+
+def test_conditional_request_returns_not_modified(static_assets: StaticAssets):
+    response = respond(static_assets, "index.html", Headers())
+    assert response.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert response.body == b"<html></html>"
+    etag = response.headers["etag"]
+    response = respond(static_assets, "index.html", Headers({"if-none-match": etag}))
+    assert response.status_code == 304
+
+
+def test_binary_assets_are_not_compressed(static_assets: StaticAssets):
+    response = respond(
+        static_assets, "favicon.ico", Headers({"accept-encoding": "gzip, br"})
+    )
+    assert "content-encoding" not in response.headers
+
+
+def test_missing_asset(static_assets: StaticAssets):
+    assert respond(static_assets, "../main.py", Headers()).status_code == 404
+
+
+def test_assets_are_compressed_on_first_request(
+    static_assets: StaticAssets, monkeypatch
+):
+    threads = []
+
+    def compress_static_content(content: bytes) -> dict[str, bytes]:
+        threads.append(threading.current_thread())
+        return original_compress_static_content(content)
+
+    original_compress_static_content = backend.static.compress_static_content
+    monkeypatch.setattr(
+        backend.static, "compress_static_content", compress_static_content
+    )
+    path = "_next/static/chunks/main-0a1b2c.js"
+    assert path in static_assets.uncompressed and not static_assets.get(path).encoded
+    respond(static_assets, path, Headers())
+    assert static_assets.uncompressed == set() and static_assets.get(path).encoded
+    # Compressed off the event loop
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_precompressed_variants_are_served(tmp_path: Path):
+    (tmp_path / "main.js").write_bytes(SCRIPT)
+    assert precompress_directory(tmp_path) == 1
+    assets = StaticAssets(tmp_path)
+    assets.load()
+    assert assets.get("main.js.gz") is None and assets.uncompressed == set()
+
+    response = respond(assets, "main.js", Headers({"accept-encoding": "gzip"}))
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.body == (tmp_path / "main.js.gz").read_bytes()
@@ -0,0 +1,73 @@
+import io
+import sqlite3
+from pathlib import Path
+
+import pytest
+from backend.processing.checker.content import MultiContentChecker
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+from backend.processing.store import (
+    SchemaVersionMismatch,
+    TextModelStore,
+    compute_content_hash,
+    rebuild_store,
+)
+from backend.processing.text_model import extract_text_model
+from pptx import Presentation as PresentationConstructor
+
+
+@pytest.fixture
+def content() -> bytes:
+    return build_sample_presentation(selected_date="29 May 2022")
+
+
+def test_put_and_get_round_trip(tmp_path: Path, content: bytes):
+    store = TextModelStore(tmp_path)
+    text_model = extract_text_model(PresentationConstructor(io.BytesIO(content)))
+    content_hash = store.put(content, "29.05.pptx", text_model)
+
+    assert content_hash == compute_content_hash(content)
+    assert content_hash in store and len(store) == 1
+    assert store.get(content_hash) == (content_hash, "29.05.pptx", text_model)
+    assert store.deck_path(content_hash).read_bytes() == content
+
+
+def test_stored_text_models_give_the_same_results(tmp_path: Path, content: bytes):
+    store = TextModelStore(tmp_path)
+    presentation = PresentationConstructor(io.BytesIO(content))
+    store.put(content, "29.05.pptx", extract_text_model(presentation))
+    inputs = dict(
+        req_order_of_service=SAMPLE_ORDER_OF_SERVICE,
+        selected_date=SAMPLE_DATE,
+        sermon_discussion_qns=SAMPLE_SERMON_DISCUSSION_QNS,
+    )
+
+    from_presentation = MultiContentChecker(
+        presentations={"29.05.pptx": presentation}, **inputs
+    ).run()
+    from_store = MultiContentChecker(
+        presentations={},
+        text_models={deck.filename: deck.text_model for deck in store},
+        **inputs,
+    ).run()
+    assert from_store == from_presentation
+
+
+def test_rebuild_after_schema_change(tmp_path: Path, content: bytes):
+    store = TextModelStore(tmp_path)
+    content_hash = store.put(content, "29.05.pptx", {1: ["stale"]})
+    with sqlite3.connect(store.path) as connection:
+        connection.execute("PRAGMA user_version = 0")
+    with pytest.raises(SchemaVersionMismatch):
+        TextModelStore(tmp_path)
+
+    assert rebuild_store(tmp_path) == (1, [])
+    deck = TextModelStore(tmp_path).get(content_hash)
+    assert deck is not None
+    assert deck.text_model == extract_text_model(
+        PresentationConstructor(io.BytesIO(content))
+    )
@@ -0,0 +1,46 @@
+import io
+
+from backend.processing.sample import build_sample_presentation
+from backend.processing.template import TemplatePool, extract_package_text_model
+from backend.processing.text_model import extract_text_model
+from pptx import Presentation as PresentationConstructor
+
+
+def test_package_text_model_equals_presentation_text_model():
+    pool = TemplatePool()
+    for content in (
+        build_sample_presentation(lyric_slides=2),
+        build_sample_presentation(extra_slides=[["Welcome", "Dismissal"], [""]]),
+    ):
+        presentation = PresentationConstructor(io.BytesIO(content))
+        text_model = extract_package_text_model(content, pool)
+        assert text_model == extract_text_model(presentation)
+
+
+def test_parts_of_recurring_templates_are_extracted_once():
+    pool = TemplatePool()
+    last_week = build_sample_presentation(selected_date="22 May 2022")
+    this_week = build_sample_presentation(selected_date="29 May 2022")
+    extract_package_text_model(last_week, pool)
+    misses = pool.misses
+    text_model = extract_package_text_model(this_week, pool)
+    # Only the welcome slide with the date differs from last week
+    assert pool.misses == misses + 1
+    assert "29 May 2022" in text_model[1]
+
+    # Extracted parts are not mutated through the text models they are shared by
+    text_model[2].append("edited")
+    assert "edited" not in extract_package_text_model(this_week, pool)[2]
+
+
+def test_template_pool_is_bounded():
+    pool = TemplatePool(max_size=2)
+    for i in range(3):
+        pool.get_or_extract("slide", str(i).encode(), len)
+    assert len(pool) == 2
+    assert pool.get_or_extract("slide", b"2", lambda content: -1) == 1
+    assert pool.get_or_extract("slide", b"0", lambda content: -1) == -1
+
+    disabled = TemplatePool(max_size=0)
+    disabled.get_or_extract("slide", b"0", len)
+    assert len(disabled) == 0
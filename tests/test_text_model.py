@@ -0,0 +1,44 @@
+import io
+import pickle
+
+from backend.processing.checker.content import ContentChecker
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+from backend.processing.text_model import ShapeText, extract_text_model
+from pptx import Presentation as PresentationConstructor
+
+
+def test_checks_give_the_same_results_on_pickled_text_models():
+    content = build_sample_presentation(selected_date="29 May 2022", lyric_slides=2)
+    text_model = extract_text_model(PresentationConstructor(io.BytesIO(content)))
+
+    def run(text_model) -> list:
+        return ContentChecker(
+            file_path="29.05.pptx",
+            presentation=None,
+            req_order_of_service=SAMPLE_ORDER_OF_SERVICE,
+            selected_date=SAMPLE_DATE,
+            sermon_discussion_qns=SAMPLE_SERMON_DISCUSSION_QNS,
+            text_model=text_model,
+        ).run()
+
+    assert run(pickle.loads(pickle.dumps(text_model))) == run(text_model)
+
+
+def test_texts_are_normalized_at_extraction():
+    content = build_sample_presentation(selected_date="29_May_2022")
+    text_model = extract_text_model(PresentationConstructor(io.BytesIO(content)))
+    texts = [text for slide_texts in text_model.values() for text in slide_texts]
+    assert all(isinstance(text, ShapeText) for text in texts)
+    (date,) = [text for text in texts if text == "29_May_2022"]
+    assert date.normalized == "29 May 2022"
+
+    text = ShapeText("Opening Song -  Behold Our God\nSermon ")
+    assert text.normalized_lines == ("Opening Song – Behold Our God", "Sermon")
+    assert [line.normalized for line in text.lines] == list(text.normalized_lines)
+    unpickled = pickle.loads(pickle.dumps(text))
+    assert unpickled == text and unpickled.normalized_lines == text.normalized_lines
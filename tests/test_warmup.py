@@ -0,0 +1,30 @@
+import io
+
+from backend.processing.checker.content import ContentChecker
+from backend.processing.result import Status
+from backend.processing.sample import (
+    SAMPLE_DATE,
+    SAMPLE_ORDER_OF_SERVICE,
+    SAMPLE_SERMON_DISCUSSION_QNS,
+    build_sample_presentation,
+)
+from backend.warmup import warm_up
+from pptx import Presentation as PresentationConstructor
+
+
+def test_sample_presentation_passes_all_checks():
+    presentation = PresentationConstructor(
+        io.BytesIO(build_sample_presentation(lyric_slides=2))
+    )
+    cc = ContentChecker(
+        file_path="sample.pptx",
+        presentation=presentation,
+        req_order_of_service=SAMPLE_ORDER_OF_SERVICE,
+        selected_date=SAMPLE_DATE,
+        sermon_discussion_qns=SAMPLE_SERMON_DISCUSSION_QNS,
+    )
+    assert all(result["status"] == Status.PASS for result in cc.run())
+
+
+def test_warm_up():
+    assert warm_up() > 0